@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Compare accuracy and speed of the CPU backends against the torch provider
+
+Each backend transcribes the same files in its own process, so thread
+settings and peak RSS don't leak between them. Transcripts are scored against
+the references in the manifest when it has them, and always against the
+torch (fp32) provider's output.
+
+Usage:
+    python benchmarks/bench_cpu_backends.py --manifest eval.jsonl --threads 4
+    python benchmarks/bench_cpu_backends.py --backends torch,int8 --output cpu.json
+    python benchmarks/bench_cpu_backends.py --fake
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.common import error_rate, percentiles
+from config import config
+
+BASELINE = "torch"
+
+
+def load_manifest(path: str) -> List[Dict[str, Optional[str]]]:
+    """Items of a JSONL manifest ({"path", "text"}) or a list of paths"""
+    base = os.path.dirname(os.path.abspath(path))
+    items = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            record = json.loads(line) if line.startswith("{") else {"path": line}
+            items.append(
+                {
+                    "path": os.path.join(base, record["path"]),
+                    "text": record.get("text"),
+                }
+            )
+    return items
+
+
+def synthetic_items(directory: str) -> List[Dict[str, Optional[str]]]:
+    """Synthetic clips of several lengths, without references"""
+    from benchmarks.common import encode_audio, synthetic_audio
+
+    items = []
+    for duration in (5.0, 10.0, 30.0):
+        path = os.path.join(directory, f"synthetic_{duration:.0f}s.wav")
+        with open(path, "wb") as f:
+            f.write(encode_audio(synthetic_audio(duration, 16000), 16000, "wav"))
+        items.append({"path": path, "text": None})
+    return items
+
+
+def child(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Load one backend and transcribe every file (runs in a fresh process)"""
+    import asyncio
+    from benchmarks.common import FakePipeline, peak_rss_mb
+    from ole_asr.models import ASRRequest
+    from ole_asr.providers.cpu_inference import CPUInferenceProvider
+    from ole_asr.providers.qwen3_asr import Qwen3ASRProvider
+
+    backend = options["backend"]
+    threads = options["threads"]
+    settings = {"model_path": options["model_path"], "max_batch_size": 1}
+    if backend == BASELINE:
+        if threads:
+            import torch
+
+            torch.set_num_threads(threads)
+        provider_cls, extra = Qwen3ASRProvider, {}
+    else:
+        provider_cls = CPUInferenceProvider
+        extra = {
+            "backend": backend,
+            "intra_op_threads": threads,
+            "inter_op_threads": options["inter_op_threads"],
+        }
+    if options["fake"]:
+        provider_cls = type(
+            "Fake" + provider_cls.__name__,
+            (provider_cls,),
+            {"_load_model": lambda self: setattr(self, "pipeline", FakePipeline())},
+        )
+
+    async def run():
+        provider = provider_cls(**settings, **extra)
+        started = time.perf_counter()
+        await provider.initialize()
+        load_seconds = time.perf_counter() - started
+
+        texts, latencies, durations = [], [], []
+        for path in options["paths"]:
+            with open(path, "rb") as f:
+                request = ASRRequest.from_bytes(f.read())
+            started = time.perf_counter()
+            response = await provider.transcribe(request)
+            latencies.append(time.perf_counter() - started)
+            texts.append(response.text)
+            durations.append(response.duration)
+        await provider.close()
+        return {
+            "load_seconds": load_seconds,
+            "texts": texts,
+            "latencies": latencies,
+            "durations": durations,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    return asyncio.run(run())
+
+
+def spawn(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one backend in a new interpreter"""
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", json.dumps(options)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode:
+        sys.exit(completed.stderr)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def score(
+    run: Dict[str, Any],
+    items: List[Dict[str, Optional[str]]],
+    baseline: Optional[Dict[str, Any]],
+    unit: str,
+) -> Dict[str, Any]:
+    """Speed and accuracy figures of one backend's run"""
+    audio_seconds = sum(run["durations"])
+    inference_seconds = sum(run["latencies"])
+    result = {
+        "load_seconds": run["load_seconds"],
+        "peak_rss_mb": run["peak_rss_mb"],
+        "latency_ms": percentiles(run["latencies"]),
+        "real_time_factor": inference_seconds / audio_seconds if audio_seconds else 0,
+    }
+
+    pairs = [
+        (item["text"], text) for item, text in zip(items, run["texts"]) if item["text"]
+    ]
+    if pairs:
+        result["error_rate"] = sum(error_rate(r, h, unit) for r, h in pairs) / len(
+            pairs
+        )
+    if baseline is not None:
+        result["disagreement_with_torch"] = sum(
+            error_rate(r, h, unit) for r, h in zip(baseline["texts"], run["texts"])
+        ) / len(items)
+    return result
+
+
+def main():
+    """Run every backend on the same audio and print a comparison"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--manifest",
+        help="JSONL of {path, text} (or one path per line); synthetic audio if unset",
+    )
+    parser.add_argument("--backends", default="torch,int8,onnx")
+    parser.add_argument("--model-path", default=config.DEFAULT_MODEL_PATH)
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads")
+    parser.add_argument("--inter-op-threads", type=int, default=0)
+    parser.add_argument(
+        "--unit", choices=("char", "word"), default="char", help="Error rate unit"
+    )
+    parser.add_argument(
+        "--fake", action="store_true", help="Use fake models (tests the harness)"
+    )
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(json.loads(args.child))))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        items = load_manifest(args.manifest) if args.manifest else synthetic_items(tmp)
+        backends = args.backends.split(",")
+        runs = {
+            backend: spawn(
+                {
+                    "backend": backend,
+                    "paths": [item["path"] for item in items],
+                    "model_path": args.model_path,
+                    "threads": args.threads or None,
+                    "inter_op_threads": args.inter_op_threads or None,
+                    "fake": args.fake,
+                }
+            )
+            for backend in backends
+        }
+
+    baseline = runs.get(BASELINE)
+    results = {
+        backend: score(run, items, baseline if backend != BASELINE else None, args.unit)
+        for backend, run in runs.items()
+    }
+
+    print(
+        f"{'backend':>8} {'load s':>8} {'RTF':>8} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'RSS MiB':>9} {'CER' if args.unit == 'char' else 'WER':>7} {'vs torch':>9}"
+    )
+    for backend, result in results.items():
+        accuracy = result.get("error_rate")
+        disagreement = result.get("disagreement_with_torch")
+        print(
+            f"{backend:>8} {result['load_seconds']:>8.2f} "
+            f"{result['real_time_factor']:>8.3f} "
+            f"{result['latency_ms']['p50']:>9.1f} {result['latency_ms']['p95']:>9.1f} "
+            f"{result['peak_rss_mb']:>9.0f} "
+            f"{'-' if accuracy is None else f'{accuracy:.2%}':>7} "
+            f"{'-' if disagreement is None else f'{disagreement:.2%}':>9}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"items": items, "backends": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
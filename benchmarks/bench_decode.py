@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Compare the format-sniffing decoder against the soundfile/librosa path
+
+For each case the previous decoder (sf.read, channel mean, float32 cast) and
+`decode_audio_bytes` are timed, and their peak allocations are measured with
+tracemalloc.
+
+Usage:
+    python benchmarks/bench_decode.py --duration 60 --repeats 20
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+from benchmarks.common import percentiles, synthetic_audio
+from ole_asr.utils import decode_audio_bytes
+
+# (label, container, subtype, sample rate, channels)
+CASES = [
+    ("wav_pcm16_16k_mono", "WAV", "PCM_16", 16000, 1),
+    ("wav_pcm16_44k_stereo", "WAV", "PCM_16", 44100, 2),
+    ("wav_float_16k_mono", "WAV", "FLOAT", 16000, 1),
+    ("wav_pcm24_48k_mono", "WAV", "PCM_24", 48000, 1),
+    ("flac_16k_mono", "FLAC", "PCM_16", 16000, 1),
+    ("ogg_16k_mono", "OGG", "VORBIS", 16000, 1),
+]
+
+
+def legacy_decode(audio_bytes: bytes) -> Tuple[np.ndarray, int]:
+    """The decoder before format sniffing, kept here as the baseline"""
+    audio_buffer = io.BytesIO(audio_bytes)
+    try:
+        audio_data, sample_rate = sf.read(audio_buffer)
+    except Exception:
+        audio_buffer.seek(0)
+        audio_data, sample_rate = librosa.load(audio_buffer, sr=None)
+    if len(audio_data.shape) > 1:
+        audio_data = audio_data.mean(axis=1)
+    return audio_data.astype(np.float32), int(sample_rate)
+
+
+def measure(decoder, audio_bytes: bytes, repeats: int) -> Dict[str, Any]:
+    """Latency percentiles and peak traced allocation of one decoder"""
+    decoder(audio_bytes)  # warm up
+
+    latencies: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        decoder(audio_bytes)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    decoder(audio_bytes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"latency_ms": percentiles(latencies), "peak_alloc_mb": peak / 2**20}
+
+
+def main():
+    """Run every case and print a comparison"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for label, container, subtype, sample_rate, channels in CASES:
+        audio = synthetic_audio(args.duration, sample_rate)
+        if channels > 1:
+            audio = np.stack([audio] * channels, axis=1)
+        buffer = io.BytesIO()
+        sf.write(buffer, audio, sample_rate, format=container, subtype=subtype)
+        audio_bytes = buffer.getvalue()
+
+        legacy = measure(legacy_decode, audio_bytes, args.repeats)
+        fast = measure(decode_audio_bytes, audio_bytes, args.repeats)
+        results.append(
+            {"case": label, "bytes": len(audio_bytes), "legacy": legacy, "new": fast}
+        )
+        speedup = legacy["latency_ms"]["p50"] / max(fast["latency_ms"]["p50"], 1e-9)
+        print(
+            f"{label:>22}  legacy p50={legacy['latency_ms']['p50']:7.2f}ms "
+            f"peak={legacy['peak_alloc_mb']:6.1f}MiB  "
+            f"new p50={fast['latency_ms']['p50']:7.2f}ms "
+            f"peak={fast['peak_alloc_mb']:6.1f}MiB  x{speedup:.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Benchmark harness and load generator for the transcription pipeline
+
+Runs fully offline against a fake model that can stand in for
+Qwen3ASRProvider, or against a running server with --url.
+
+Usage:
+    python benchmarks/bench_pipeline.py --output results.json
+    python benchmarks/bench_pipeline.py --baseline results.json --tolerance 0.2
+    python benchmarks/bench_pipeline.py --url http://localhost:8000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import platform
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from benchmarks.common import (
+    FakePipeline,
+    FakeQwen3ASRProvider,
+    encode_audio,
+    peak_rss_mb,
+    percentiles,
+    synthetic_audio,
+)
+from ole_asr.models import ASRRequest, ASRResponse, ASRSegment, AudioFormat
+from ole_asr.services import ASRService
+from ole_asr.utils import decode_audio_bytes, resample_audio
+
+STAGES = ["b64_decode", "container_decode", "resample", "inference", "serialization"]
+
+
+def stage_benchmark(
+    fmt: str,
+    duration: float,
+    sample_rate: int,
+    target_sample_rate: int,
+    repeats: int,
+    real_time_factor: float,
+) -> Optional[Dict[str, Any]]:
+    """
+    Time each pipeline stage for one format/length/sample-rate combination
+
+    Returns:
+        Per-stage latency percentiles, or None if the format can't be encoded
+    """
+    audio_bytes = encode_audio(synthetic_audio(duration, sample_rate), sample_rate, fmt)
+    if audio_bytes is None:
+        return None
+    audio_base64 = base64.b64encode(audio_bytes).decode("ascii")
+    pipeline = FakePipeline(target_sample_rate, real_time_factor)
+
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    for _ in range(repeats):
+        start = time.perf_counter()
+        raw = base64.b64decode(audio_base64)
+        decoded_at = time.perf_counter()
+        audio, original_sr = decode_audio_bytes(raw)
+        container_at = time.perf_counter()
+        audio = resample_audio(audio, original_sr, target_sample_rate)
+        resampled_at = time.perf_counter()
+        result = pipeline(audio)
+        inferred_at = time.perf_counter()
+        length = len(audio) / target_sample_rate
+        ASRResponse(
+            text=result["text"],
+            segments=[ASRSegment(start_time=0.0, end_time=length, text=result["text"])],
+            duration=length,
+            model="fake",
+        ).model_dump_json()
+        serialized_at = time.perf_counter()
+
+        timings["b64_decode"].append(decoded_at - start)
+        timings["container_decode"].append(container_at - decoded_at)
+        timings["resample"].append(resampled_at - container_at)
+        timings["inference"].append(inferred_at - resampled_at)
+        timings["serialization"].append(serialized_at - inferred_at)
+
+    return {
+        "format": fmt,
+        "duration_s": duration,
+        "sample_rate": sample_rate,
+        "payload_bytes": len(audio_bytes),
+        "stages_ms": {stage: percentiles(values) for stage, values in timings.items()},
+    }
+
+
+async def _drive_service(
+    requests: List[ASRRequest], concurrency: int, real_time_factor: float
+) -> List[float]:
+    """Send requests through an in-process ASRService with a fake model"""
+    service = ASRService()
+    service.register_provider(
+        "fake", FakeQwen3ASRProvider(real_time_factor=real_time_factor)
+    )
+    latencies: List[float] = []
+    pending = iter(requests)
+
+    async def worker():
+        for request in pending:
+            start = time.perf_counter()
+            await service.transcribe(request)
+            latencies.append(time.perf_counter() - start)
+
+    # Warm up once so provider initialization isn't counted
+    await service.transcribe(requests[0])
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    await service.close()
+    return latencies
+
+
+def _drive_http(url: str, bodies: List[bytes], concurrency: int) -> List[float]:
+    """Send requests to a running server"""
+
+    def send(body: bytes) -> float:
+        start = time.perf_counter()
+        request = urllib.request.Request(
+            f"{url.rstrip('/')}/transcribe",
+            data=body,
+            headers={"content-type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(send, bodies))
+
+
+def load_benchmark(
+    concurrency: int,
+    total_requests: int,
+    duration: float,
+    fmt: str,
+    real_time_factor: float,
+    url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Measure latency percentiles and throughput at a fixed concurrency
+
+    Returns:
+        Latency percentiles, requests per second and audio seconds per second
+    """
+    audio = synthetic_audio(duration)
+    requests = []
+    for index in range(total_requests):
+        # Vary the audio slightly so result caches can't short-circuit requests
+        clip = audio.copy()
+        clip[0] = index * 1e-6
+        requests.append(
+            ASRRequest(
+                audio=base64.b64encode(encode_audio(clip, 16000, fmt)).decode("ascii"),
+                format=AudioFormat(fmt),
+            )
+        )
+
+    start = time.perf_counter()
+    if url:
+        bodies = [request.model_dump_json().encode() for request in requests]
+        start = time.perf_counter()
+        latencies = _drive_http(url, bodies, concurrency)
+    else:
+        latencies = asyncio.run(_drive_service(requests, concurrency, real_time_factor))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "target": url or "in-process",
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "audio_duration_s": duration,
+        "format": fmt,
+        "latency_ms": percentiles(latencies),
+        "rps": len(latencies) / elapsed,
+        "audio_seconds_per_second": len(latencies) * duration / elapsed,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Compare results against a baseline run
+
+    Returns:
+        Descriptions of metrics that regressed by more than the tolerance
+    """
+    regressions = []
+    previous = {
+        (r["format"], r["duration_s"], r["sample_rate"]): r
+        for r in baseline.get("stages", [])
+    }
+    for record in results["stages"]:
+        old = previous.get(
+            (record["format"], record["duration_s"], record["sample_rate"])
+        )
+        if old is None:
+            continue
+        for stage, values in record["stages_ms"].items():
+            before = old["stages_ms"].get(stage, {}).get("p50", 0.0)
+            # Ignore sub-millisecond noise
+            if before > 1.0 and values["p50"] > before * (1 + tolerance):
+                regressions.append(
+                    f"{record['format']} {record['duration_s']}s "
+                    f"@{record['sample_rate']}Hz {stage}: "
+                    f"p50 {before:.2f}ms -> {values['p50']:.2f}ms"
+                )
+
+    load, old_load = results.get("load"), baseline.get("load")
+    if load and old_load:
+        if load["rps"] < old_load["rps"] * (1 - tolerance):
+            regressions.append(f"rps {old_load['rps']:.1f} -> {load['rps']:.1f}")
+        before = old_load["latency_ms"]["p95"]
+        if load["latency_ms"]["p95"] > before * (1 + tolerance):
+            regressions.append(
+                f"load p95 {before:.1f}ms -> {load['latency_ms']['p95']:.1f}ms"
+            )
+    return regressions
+
+
+def main():
+    """Run the benchmark suite and write machine-readable results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--formats", nargs="+", default=[f.value for f in AudioFormat])
+    parser.add_argument("--durations", nargs="+", type=float, default=[5, 30, 120])
+    parser.add_argument(
+        "--sample-rates", nargs="+", type=int, default=[8000, 16000, 44100, 48000]
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--real-time-factor",
+        type=float,
+        default=0.0,
+        help="Simulated model cost as a fraction of audio duration",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--load-duration", type=float, default=10.0)
+    parser.add_argument("--url", help="Load-test a running server instead")
+    parser.add_argument("--skip-stages", action="store_true")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a previous results file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "stages": [],
+        "skipped_formats": [],
+    }
+
+    if not args.skip_stages:
+        for fmt in args.formats:
+            for sample_rate in args.sample_rates:
+                for duration in args.durations:
+                    record = stage_benchmark(
+                        fmt,
+                        duration,
+                        sample_rate,
+                        16000,
+                        args.repeats,
+                        args.real_time_factor,
+                    )
+                    if record is None:
+                        results["skipped_formats"].append(fmt)
+                        break
+                    results["stages"].append(record)
+                    stages = record["stages_ms"]
+                    print(
+                        f"{fmt:>5} {sample_rate:>6}Hz {duration:>6.0f}s  "
+                        + "  ".join(f"{s}={stages[s]['p50']:.2f}ms" for s in STAGES)
+                    )
+                if fmt in results["skipped_formats"]:
+                    print(f"{fmt:>5} skipped: encoder not available")
+                    break
+
+    results["load"] = load_benchmark(
+        args.concurrency,
+        args.requests,
+        args.load_duration,
+        "wav",
+        args.real_time_factor,
+        url=args.url,
+    )
+    results["peak_rss_mb"] = peak_rss_mb()
+    load = results["load"]
+    print(
+        f"load: concurrency={load['concurrency']} rps={load['rps']:.1f} "
+        f"p50={load['latency_ms']['p50']:.1f}ms p95={load['latency_ms']['p95']:.1f}ms "
+        f"p99={load['latency_ms']['p99']:.1f}ms peak_rss={results['peak_rss_mb']:.0f}MiB"
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
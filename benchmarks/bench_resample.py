@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Compare the resampling engine against per-request librosa.resample
+
+Reports, for each source rate:
+- Single-clip latency at several durations
+- A batch of clips through librosa vs through one shared converter
+- Streaming: resampling every sliding window (the old WebSocket path) vs
+  converting each chunk once on arrival
+- Accuracy: SNR against an analytically generated tone, rejection of a tone
+  above the target Nyquist, and max difference from librosa
+
+Usage:
+    python benchmarks/bench_resample.py --rates 8000 44100 48000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import librosa
+import numpy as np
+
+from benchmarks.common import percentiles, synthetic_audio
+from ole_asr.resampling import StreamingResampler, get_resampler
+
+TARGET_SR = 16000
+
+
+def latency(fn: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    """Latency percentiles of `fn` after one warm-up call"""
+    fn()
+    samples: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def tone(frequency: float, duration: float, sample_rate: int) -> np.ndarray:
+    """Sine tone sampled at `sample_rate`"""
+    return np.sin(
+        2 * np.pi * frequency * np.arange(int(duration * sample_rate)) / sample_rate
+    )
+
+
+def db(signal: np.ndarray, noise: np.ndarray) -> float:
+    """Power ratio in decibels"""
+    return float(10 * np.log10(np.mean(signal**2) / max(np.mean(noise**2), 1e-30)))
+
+
+def accuracy(orig_sr: int) -> Dict[str, float]:
+    """Passband SNR, alias rejection and agreement with librosa"""
+    resampler = get_resampler(orig_sr, TARGET_SR)
+    edge = TARGET_SR // 10
+
+    source = tone(440.0, 5.0, orig_sr).astype(np.float32)
+    truth = tone(440.0, 5.0, TARGET_SR)[edge:-edge]
+    ours = resampler.resample(source)
+    theirs = librosa.resample(source, orig_sr=orig_sr, target_sr=TARGET_SR)
+    results = {
+        "snr_db": db(truth, ours[edge:-edge] - truth),
+        "librosa_snr_db": db(truth, theirs[edge:-edge] - truth),
+        "max_abs_diff_vs_librosa": float(np.max(np.abs(ours - theirs))),
+    }
+
+    # A tone above the new Nyquist must be filtered out, not folded back
+    if orig_sr > TARGET_SR:
+        alias = tone(0.6 * orig_sr / 2 + 0.4 * TARGET_SR / 2, 5.0, orig_sr)
+        alias = alias.astype(np.float32)
+        residue = resampler.resample(alias)[edge:-edge]
+        results["alias_rejection_db"] = db(alias, residue)
+    return results
+
+
+def streaming(orig_sr: int, duration: float, repeats: int) -> Dict[str, Any]:
+    """Per-window re-resampling vs converting each 100 ms chunk once"""
+    audio = synthetic_audio(duration, orig_sr)
+    chunk = orig_sr // 10
+    window, step = 8 * orig_sr, orig_sr // 2
+
+    def per_window():
+        # What the WebSocket path did: resample the whole window at every step
+        for end in range(step, len(audio) + 1, step):
+            librosa.resample(
+                audio[max(0, end - window) : end], orig_sr=orig_sr, target_sr=TARGET_SR
+            )
+
+    def on_arrival():
+        resampler = StreamingResampler(orig_sr, TARGET_SR)
+        for start in range(0, len(audio), chunk):
+            resampler.process(audio[start : start + chunk])
+        resampler.flush()
+
+    resampler = StreamingResampler(orig_sr, TARGET_SR)
+    pieces = [
+        resampler.process(audio[i : i + chunk]) for i in range(0, len(audio), chunk)
+    ]
+    streamed = np.concatenate(pieces + [resampler.flush()])
+    whole = get_resampler(orig_sr, TARGET_SR).resample(audio)
+    length = min(len(streamed), len(whole))
+
+    return {
+        "per_window_ms": latency(per_window, repeats),
+        "on_arrival_ms": latency(on_arrival, repeats),
+        "max_abs_diff_vs_whole_clip": float(
+            np.max(np.abs(streamed[:length] - whole[:length]))
+        ),
+    }
+
+
+def main():
+    """Run the comparison and print a summary"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rates", nargs="+", type=int, default=[8000, 22050, 44100, 48000]
+    )
+    parser.add_argument("--durations", nargs="+", type=float, default=[0.5, 5, 60])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for orig_sr in args.rates:
+        resampler = get_resampler(orig_sr, TARGET_SR)
+        record: Dict[str, Any] = {"orig_sr": orig_sr, "single": []}
+
+        for duration in args.durations:
+            audio = synthetic_audio(duration, orig_sr)
+            old = latency(
+                lambda: librosa.resample(audio, orig_sr=orig_sr, target_sr=TARGET_SR),
+                args.repeats,
+            )
+            new = latency(lambda: resampler.resample(audio), args.repeats)
+            record["single"].append(
+                {"duration_s": duration, "librosa_ms": old, "engine_ms": new}
+            )
+            print(
+                f"{orig_sr:>6}Hz {duration:>5.1f}s  librosa p50={old['p50']:7.3f}ms  "
+                f"engine p50={new['p50']:7.3f}ms"
+            )
+
+        clips = [
+            synthetic_audio(5.0 + 0.1 * i, orig_sr) for i in range(args.batch_size)
+        ]
+        old = latency(
+            lambda: [
+                librosa.resample(c, orig_sr=orig_sr, target_sr=TARGET_SR) for c in clips
+            ],
+            max(args.repeats // 4, 1),
+        )
+        new = latency(
+            lambda: resampler.resample_batch(clips), max(args.repeats // 4, 1)
+        )
+        record["batch"] = {"clips": len(clips), "librosa_ms": old, "engine_ms": new}
+        print(
+            f"{orig_sr:>6}Hz batch of {len(clips)}  librosa p50={old['p50']:7.2f}ms  "
+            f"engine p50={new['p50']:7.2f}ms"
+        )
+
+        record["streaming"] = streaming(orig_sr, 30.0, max(args.repeats // 4, 1))
+        stream = record["streaming"]
+        print(
+            f"{orig_sr:>6}Hz 30s stream  per-window p50="
+            f"{stream['per_window_ms']['p50']:7.2f}ms  on-arrival p50="
+            f"{stream['on_arrival_ms']['p50']:7.2f}ms  "
+            f"max diff={stream['max_abs_diff_vs_whole_clip']:.1e}"
+        )
+
+        record["accuracy"] = accuracy(orig_sr)
+        print(
+            f"{orig_sr:>6}Hz accuracy  "
+            + "  ".join(f"{k}={v:.3g}" for k, v in record["accuracy"].items())
+        )
+        results.append(record)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Break down cold-start time: imports, model load, warmup and first request
+
+Every run happens in a fresh interpreter so import and first-use costs are
+real. Runs are repeated with warmup off and on to show what warmup moves out
+of the first request.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 3
+    python benchmarks/bench_startup.py --model --warmup-seconds 2
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+HEAVY_MODULES = ("torch", "librosa", "soundfile", "soxr", "modelscope")
+
+
+def child(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Measure each startup phase in this (fresh) process"""
+    timings: Dict[str, float] = {}
+
+    started = time.perf_counter()
+    import ole_asr.api  # noqa: F401
+
+    timings["import_api"] = time.perf_counter() - started
+    loaded_by_api = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    import asyncio
+
+    started = time.perf_counter()
+    if options["model"]:
+        from ole_asr.providers.qwen3_asr import Qwen3ASRProvider as provider_cls
+    else:
+        from benchmarks.common import FakeQwen3ASRProvider as provider_cls
+    timings["import_provider"] = time.perf_counter() - started
+
+    from benchmarks.common import encode_audio, synthetic_audio
+    from ole_asr.models import ASRRequest
+    from ole_asr.services import ASRService
+
+    # A FLAC at a rate the model doesn't use exercises decoding and resampling
+    audio = encode_audio(synthetic_audio(5.0, 44100), 44100, "flac")
+
+    async def run():
+        provider = provider_cls(
+            max_batch_size=options["batch_size"],
+            warmup_seconds=options["warmup_seconds"],
+        )
+        await provider.initialize()
+        timings["load"] = provider.startup_seconds["load"]
+        timings["warmup"] = provider.startup_seconds.get("warmup", 0.0)
+
+        service = ASRService()
+        service.register_provider(provider.name, provider)
+        for label in ("first_request", "second_request"):
+            started = time.perf_counter()
+            await service.transcribe(ASRRequest.from_bytes(audio))
+            timings[label] = time.perf_counter() - started
+        await service.close()
+
+    asyncio.run(run())
+    return {"timings": timings, "heavy_modules_after_api_import": loaded_by_api}
+
+
+def spawn(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one measurement in a new interpreter"""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", json.dumps(options)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode:
+        sys.exit(completed.stderr)
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["timings"]["process_total"] = time.perf_counter() - started
+    return result
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Median of each phase across runs, in milliseconds"""
+    return {
+        phase: median(run["timings"][phase] for run in runs) * 1000
+        for phase in runs[0]["timings"]
+    }
+
+
+def main():
+    """Run the startup breakdown and print a summary"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--warmup-seconds", type=float, default=2.0)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument(
+        "--model", action="store_true", help="Load the real model instead of a fake"
+    )
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(json.loads(args.child))))
+        return
+
+    results = {}
+    for label, warmup_seconds in (("no_warmup", 0.0), ("warmup", args.warmup_seconds)):
+        options = {
+            "model": args.model,
+            "warmup_seconds": warmup_seconds,
+            "batch_size": args.batch_size,
+        }
+        runs = [spawn(options) for _ in range(args.runs)]
+        results[label] = {
+            "median_ms": summarize(runs),
+            "heavy_modules_after_api_import": runs[0]["heavy_modules_after_api_import"],
+        }
+        phases = "  ".join(
+            f"{phase}={ms:.1f}" for phase, ms in results[label]["median_ms"].items()
+        )
+        print(f"{label:>10}  {phases}")
+
+    print(
+        "Heavy modules loaded by importing the API: "
+        f"{results['no_warmup']['heavy_modules_after_api_import'] or 'none'}"
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Compare the JSON/base64 upload path against raw and multipart uploads
+
+Each mode runs in its own subprocess so peak RSS is measured independently.
+
+Usage:
+    python benchmarks/bench_upload.py --duration 300 --iterations 10
+"""
+
+import argparse
+import base64
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.common import (
+    FakeQwen3ASRProvider,
+    encode_audio,
+    peak_rss_mb,
+    percentiles,
+    synthetic_audio,
+)
+
+MODES = ["json", "raw", "multipart"]
+
+
+def run_mode(mode: str, duration: float, iterations: int) -> dict:
+    """Run one upload mode in this process and return its measurements"""
+    from fastapi.testclient import TestClient
+    from ole_asr import api
+
+    # Serve a fake provider instead of loading the real model
+    api.app.router.on_startup.clear()
+    api.asr_service.register_provider("fake", FakeQwen3ASRProvider())
+
+    audio_bytes = encode_audio(synthetic_audio(duration), 16000, "wav")
+    if mode == "json":
+        body = json.dumps(
+            {"audio": base64.b64encode(audio_bytes).decode("ascii")}
+        ).encode()
+
+    latencies = []
+    with TestClient(api.app) as client:
+        # Payloads are built up front so the RSS baseline includes them
+        baseline_rss = peak_rss_mb()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            if mode == "json":
+                response = client.post(
+                    "/transcribe",
+                    content=body,
+                    headers={"content-type": "application/json"},
+                )
+            elif mode == "raw":
+                response = client.post(
+                    "/transcribe/raw",
+                    content=audio_bytes,
+                    headers={"content-type": "application/octet-stream"},
+                )
+            else:
+                response = client.post(
+                    "/transcribe/raw",
+                    files={"file": ("audio.wav", audio_bytes, "audio/wav")},
+                )
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    return {
+        "mode": mode,
+        "duration_s": duration,
+        "payload_bytes": len(body) if mode == "json" else len(audio_bytes),
+        "latency_ms": percentiles(latencies),
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_rss_delta_mb": peak_rss_mb() - baseline_rss,
+    }
+
+
+def main():
+    """Run every upload mode in a subprocess and print a comparison"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=300.0)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.duration, args.iterations)))
+        return
+
+    results = []
+    for mode in MODES:
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--mode",
+                mode,
+                "--duration",
+                str(args.duration),
+                "--iterations",
+                str(args.iterations),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'mode':<10} {'payload MB':>11} {'p50 ms':>9} {'p95 ms':>9} {'RSS +MB':>9}")
+    for result in results:
+        print(
+            f"{result['mode']:<10} {result['payload_bytes'] / 1e6:>11.1f} "
+            f"{result['latency_ms']['p50']:>9.1f} {result['latency_ms']['p95']:>9.1f} "
+            f"{result['peak_rss_delta_mb']:>9.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Shared helpers for ASR service benchmarks"""
+
+import io
+import json
+import os
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import soundfile as sf
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ole_asr.models import ASRRequest
+from ole_asr.providers.qwen3_asr import Qwen3ASRProvider
+from ole_asr.routing import estimate_audio_seconds
+from ole_asr.utils import synthetic_speech
+
+
+class FakePipeline:
+    """Stand-in for the ModelScope pipeline that returns canned text
+
+    A non-zero real-time factor makes each call sleep for that fraction of the
+    audio duration, approximating model cost without a model.
+    """
+
+    def __init__(self, sample_rate: int = 16000, real_time_factor: float = 0.0):
+        self.sample_rate = sample_rate
+        self.real_time_factor = real_time_factor
+
+    def __call__(self, audio):
+        clips = audio if isinstance(audio, list) else [audio]
+        if self.real_time_factor:
+            samples = sum(len(clip) for clip in clips)
+            time.sleep(samples / self.sample_rate * self.real_time_factor)
+        results = [{"text": f"{len(clip)} samples"} for clip in clips]
+        return results if isinstance(audio, list) else results[0]
+
+
+class FakeQwen3ASRProvider(Qwen3ASRProvider):
+    """Qwen3 provider with the model replaced by a fake pipeline"""
+
+    def __init__(self, real_time_factor: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.real_time_factor = real_time_factor
+
+    def _load_model(self):
+        self.pipeline = FakePipeline(self.sample_rate, self.real_time_factor)
+
+
+class FakeHTTPBackend:
+    """Local HTTP server answering like another node of this service
+
+    Serves /transcribe, /transcribe/raw and /ready on 127.0.0.1 without a
+    model: each request sleeps for `real_time_factor` of its audio length and
+    returns the backend's name as the text. Set `status` to make it answer
+    every request with that error (e.g. 429 or 500), or call stop() to take
+    it off the network.
+    """
+
+    def __init__(self, name: str = "fake", real_time_factor: float = 0.0):
+        self.name = name
+        self.real_time_factor = real_time_factor
+        self.status = 200
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._sockets = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        """Request handler class bound to this backend"""
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with backend._lock:
+                    backend._sockets.append(self.connection)
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, payload: dict, headers: dict = None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path != "/ready":
+                    self._reply(404, {"detail": "Not Found"})
+                elif backend.status == 200:
+                    self._reply(200, {"status": "ready"})
+                else:
+                    self._reply(503, {"status": "not ready"})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not self.path.startswith("/transcribe"):
+                    self._reply(404, {"detail": "Not Found"})
+                    return
+                if backend.status != 200:
+                    self._reply(
+                        backend.status, {"detail": "fake error"}, {"Retry-After": "1"}
+                    )
+                    return
+                if self.path.startswith("/transcribe/raw"):
+                    request = ASRRequest.from_bytes(body)
+                else:
+                    request = ASRRequest.model_validate_json(body)
+                duration = estimate_audio_seconds(request)
+
+                with backend._lock:
+                    backend.requests += 1
+                    backend.active += 1
+                    backend.max_active = max(backend.max_active, backend.active)
+                try:
+                    time.sleep(duration * backend.real_time_factor)
+                finally:
+                    with backend._lock:
+                        backend.active -= 1
+                self._reply(
+                    200,
+                    {
+                        "text": backend.name,
+                        "segments": [],
+                        "duration": duration,
+                        "model": backend.name,
+                    },
+                )
+
+        return Handler
+
+    def stop(self):
+        """Shut the server down and drop kept-alive connections"""
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            sockets, self._sockets = self._sockets, []
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def synthetic_audio(duration: float, sample_rate: int = 16000) -> np.ndarray:
+    """Generate a deterministic speech-like test signal"""
+    return synthetic_speech(duration, sample_rate)
+
+
+# Formats libsndfile cannot write; encoded with ffmpeg when it is installed
+FFMPEG_FORMATS = {
+    "m4a": ["-c:a", "aac", "-f", "ipod"],
+    "aac": ["-c:a", "aac", "-f", "adts"],
+}
+
+
+def encode_audio(
+    audio: np.ndarray, sample_rate: int, fmt: str = "wav"
+) -> Optional[bytes]:
+    """
+    Encode audio into an in-memory audio file
+
+    Returns:
+        Encoded bytes, or None if the format cannot be produced here
+    """
+    if fmt in FFMPEG_FORMATS:
+        return _encode_with_ffmpeg(audio, sample_rate, fmt)
+
+    buffer = io.BytesIO()
+    subtype = {"wav": "PCM_16", "ogg": "VORBIS", "mp3": "MPEG_LAYER_III"}.get(fmt)
+    sf.write(buffer, audio, sample_rate, format=fmt.upper(), subtype=subtype)
+    return buffer.getvalue()
+
+
+def _encode_with_ffmpeg(
+    audio: np.ndarray, sample_rate: int, fmt: str
+) -> Optional[bytes]:
+    """Encode through a temporary WAV file with ffmpeg, if available"""
+    if shutil.which("ffmpeg") is None:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "input.wav")
+        target = os.path.join(tmp, f"output.{fmt}")
+        sf.write(source, audio, sample_rate, subtype="PCM_16")
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-i", source]
+            + FFMPEG_FORMATS[fmt]
+            + [target],
+            check=True,
+        )
+        with open(target, "rb") as f:
+            return f.read()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 of latency samples in milliseconds"""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    values = np.asarray(samples) * 1000.0
+    return {
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "p99": float(np.percentile(values, 99)),
+    }
+
+
+def timed(fn, *args, **kwargs):
+    """Run a function and return (result, seconds)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def error_rate(reference: str, hypothesis: str, unit: str = "char") -> float:
+    """
+    Edit distance between two transcripts relative to the reference length
+
+    Args:
+        reference: Expected transcript
+        hypothesis: Transcript to score
+        unit: "char" (whitespace ignored, for CJK) or "word"
+
+    Returns:
+        Character or word error rate
+    """
+    if unit == "char":
+        ref, hyp = list("".join(reference.split())), list("".join(hypothesis.split()))
+    else:
+        ref, hyp = reference.split(), hypothesis.split()
+    if not ref:
+        return float(bool(hyp))
+
+    # Levenshtein distance, one row at a time
+    previous = list(range(len(hyp) + 1))
+    for i, ref_token in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_token in enumerate(hyp, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_token != hyp_token),
+                )
+            )
+        previous = current
+    return previous[-1] / len(ref)
@@ -1,5 +1,6 @@
 """Configuration for the ASR service"""
 
+import json
 import os
 from typing import Optional
 
@@ -19,6 +20,19 @@ class ASRConfig:
         "damo/speech_paraformer-large_asr_nat-zh-cn-16k-common-vocab8404-pytorch",
     )
 
+    # Models served from this node: JSON object mapping provider names to
+    # {"model_path": ..., "memory_mb": ..., "pinned": ..., "backend": ...}
+    # ("torch", or "int8"/"onnx" for CPU inference); by default only
+    # DEFAULT_MODEL_PATH, pinned so it is loaded at startup
+    ASR_MODELS: dict = json.loads(os.getenv("ASR_MODELS", "{}")) or {
+        "qwen3-asr": {"model_path": DEFAULT_MODEL_PATH, "pinned": True}
+    }
+    # Synthetic audio run through each model after loading (0 = no warmup)
+    WARMUP_SECONDS: float = float(os.getenv("WARMUP_SECONDS", "2"))
+    # Memory loaded models may take; least recently used ones are unloaded
+    # beyond it (0 = unlimited)
+    MODEL_MEMORY_BUDGET_MB: float = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))
+
     # Audio processing configuration
     DEFAULT_SAMPLE_RATE: int = int(os.getenv("DEFAULT_SAMPLE_RATE", "16000"))
     SUPPORTED_FORMATS: list = ["wav", "mp3", "flac", "m4a", "aac", "ogg"]
@@ -28,14 +42,106 @@ class ASRConfig:
         "CUDA_DEVICE", "cuda:0" if os.path.exists("/usr/local/cuda") else "cpu"
     )
 
-    # Model caching configuration
+    # Model caching configuration: local model snapshots (and transcripts)
     MODEL_CACHE_DIR: str = os.getenv("MODEL_CACHE_DIR", "/tmp/asr_models")
 
+    # Transcription result cache configuration
+    RESULT_CACHE_ENABLED: bool = (
+        os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    )
+    RESULT_CACHE_MAX_BYTES: int = int(
+        os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+    )
+    RESULT_CACHE_DISK: bool = os.getenv("RESULT_CACHE_DISK", "false").lower() == "true"
+    RESULT_CACHE_DISK_MAX_BYTES: int = int(
+        os.getenv("RESULT_CACHE_DISK_MAX_BYTES", str(1024 * 1024 * 1024))
+    )
+
     # Performance configuration
     MAX_AUDIO_DURATION: float = float(
         os.getenv("MAX_AUDIO_DURATION", "300")
-    )  # 5 minutes max
-    THREAD_POOL_SIZE: int = int(os.getenv("THREAD_POOL_SIZE", "4"))
+    )  # 5 minutes max per chunk sent to the model
+    # Longest audio accepted per request; longer audio is chunked, so by
+    # default (unset) any length is transcribed
+    MAX_REQUEST_AUDIO_SECONDS: Optional[float] = (
+        float(os.getenv("MAX_REQUEST_AUDIO_SECONDS"))
+        if os.getenv("MAX_REQUEST_AUDIO_SECONDS")
+        else None
+    )
+    # Largest request body accepted by /transcribe/raw, checked before it's read
+    MAX_UPLOAD_BYTES: int = int(os.getenv("MAX_UPLOAD_BYTES", str(512 * 1024 * 1024)))
+    VAD_MAX_CHUNK_SECONDS: float = float(os.getenv("VAD_MAX_CHUNK_SECONDS", "30"))
+    THREAD_POOL_SIZE: int = int(os.getenv("THREAD_POOL_SIZE", "4"))  # preprocessing
+    # Inference lanes: pipeline calls running at once, each with its own torch
+    # thread budget (0 = available CPUs divided between lanes), optionally
+    # pinned to separate CPUs
+    INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "1"))
+    INFERENCE_THREADS_PER_LANE: int = int(os.getenv("INFERENCE_THREADS_PER_LANE", "0"))
+    INFERENCE_PIN_LANES: bool = (
+        os.getenv("INFERENCE_PIN_LANES", "false").lower() == "true"
+    )
+    # Threads of the CPU backends (ASR_MODELS "backend": "int8" or "onnx");
+    # 0 leaves the library default
+    CPU_INTRA_OP_THREADS: int = int(os.getenv("CPU_INTRA_OP_THREADS", "0"))
+    CPU_INTER_OP_THREADS: int = int(os.getenv("CPU_INTER_OP_THREADS", "0"))
+
+    # Admission control: audio-seconds processed at once and queued per priority
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_ACTIVE_SECONDS: float = float(
+        os.getenv("ADMISSION_MAX_ACTIVE_SECONDS", "240")
+    )
+    ADMISSION_MAX_QUEUED_INTERACTIVE_SECONDS: float = float(
+        os.getenv("ADMISSION_MAX_QUEUED_INTERACTIVE_SECONDS", "120")
+    )
+    ADMISSION_MAX_QUEUED_BATCH_SECONDS: float = float(
+        os.getenv("ADMISSION_MAX_QUEUED_BATCH_SECONDS", "1800")
+    )
+
+    # Bulk jobs: SQLite queue, items transcribed at once, allowed input directory
+    JOBS_ENABLED: bool = os.getenv("JOBS_ENABLED", "true").lower() == "true"
+    JOBS_DB_PATH: str = os.getenv("JOBS_DB_PATH", "/tmp/asr_jobs/jobs.sqlite3")
+    JOBS_CONCURRENCY: int = int(os.getenv("JOBS_CONCURRENCY", "8"))
+    JOBS_MAX_ATTEMPTS: int = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+    JOBS_INPUT_ROOT: Optional[str] = os.getenv("JOBS_INPUT_ROOT") or None
+
+    # Directory transcription requests may reference by `path` (unset: path
+    # requests are rejected), e.g. a shared recordings volume
+    AUDIO_INPUT_ROOT: Optional[str] = os.getenv("AUDIO_INPUT_ROOT") or None
+
+    # Streaming (WebSocket) configuration
+    STREAM_WINDOW_SECONDS: float = float(os.getenv("STREAM_WINDOW_SECONDS", "8"))
+    STREAM_STEP_SECONDS: float = float(os.getenv("STREAM_STEP_SECONDS", "0.5"))
+    STREAM_OVERLAP_SECONDS: float = float(os.getenv("STREAM_OVERLAP_SECONDS", "1"))
+
+    # Shared-model serving: Unix sockets of model-owning inference processes
+    INFERENCE_SOCKETS: list = [
+        path for path in os.getenv("INFERENCE_SOCKETS", "").split(",") if path
+    ]
+
+    # Routing: other nodes running this service, as a JSON object mapping
+    # provider names to {"url": ..., "provider": ..., "timeout": ...}
+    ASR_BACKENDS: dict = json.loads(os.getenv("ASR_BACKENDS", "{}"))
+    # JSON object mapping route names to lists of replica providers (local
+    # models and ASR_BACKENDS entries); the first route becomes the default
+    ASR_ROUTES: dict = json.loads(os.getenv("ASR_ROUTES", "{}"))
+    # How long a failed replica is only tried after the healthy ones
+    ROUTE_RETRY_SECONDS: float = float(os.getenv("ROUTE_RETRY_SECONDS", "10"))
+
+    # Health checks: per-provider timeout and how long results are reused
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = float(
+        os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "2")
+    )
+    HEALTH_CHECK_TTL_SECONDS: float = float(os.getenv("HEALTH_CHECK_TTL_SECONDS", "5"))
+    # Background canary transcription of every loaded model (0 = disabled)
+    HEALTH_CANARY_INTERVAL_SECONDS: float = float(
+        os.getenv("HEALTH_CANARY_INTERVAL_SECONDS", "0")
+    )
+    HEALTH_CANARY_SECONDS: float = float(os.getenv("HEALTH_CANARY_SECONDS", "1"))
+
+    # Dynamic batching configuration
+    BATCH_MAX_SIZE: int = int(os.getenv("BATCH_MAX_SIZE", "8"))
+    BATCH_MAX_WAIT_MS: float = float(os.getenv("BATCH_MAX_WAIT_MS", "10"))
+    BATCH_MAX_AUDIO_SECONDS: float = float(os.getenv("BATCH_MAX_AUDIO_SECONDS", "120"))
 
 
 # Global config instance
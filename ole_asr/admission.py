@@ -0,0 +1,348 @@
+"""Admission control for transcription requests
+
+Work is measured in audio-seconds. Requests start while the audio in progress
+fits a budget; the rest wait in bounded per-priority queues, so bursts are
+turned away quickly instead of piling up in the executors.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional, Tuple
+from .metrics import registry
+from .models import Priority
+
+# Queues are served strictly in this order
+PRIORITY_ORDER = (Priority.INTERACTIVE, Priority.BATCH)
+
+# Window over which completed audio-seconds estimate throughput
+THROUGHPUT_WINDOW_SECONDS = 30.0
+
+ADMISSION_ACTIVE_SECONDS = registry.gauge(
+    "ole_asr_admission_active_audio_seconds", "Audio-seconds currently admitted"
+)
+ADMISSION_QUEUED_SECONDS = registry.gauge(
+    "ole_asr_admission_queued_audio_seconds",
+    "Audio-seconds waiting for admission",
+    ("priority",),
+)
+ADMISSION_REJECTED = registry.counter(
+    "ole_asr_admission_rejected_total",
+    "Requests turned away by admission control",
+    ("priority", "reason"),
+)
+
+
+class AdmissionError(Exception):
+    """Base class for requests turned away by admission control"""
+
+    reason = "rejected"
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QueueFullError(AdmissionError):
+    """The priority class's queue has no room for the request"""
+
+    reason = "queue_full"
+
+
+class OverloadedError(AdmissionError):
+    """The request is not expected to start before its deadline"""
+
+    reason = "overloaded"
+
+
+class DeadlineExceededError(AdmissionError):
+    """The client's deadline passed before the request reached the model"""
+
+    reason = "deadline"
+
+
+class AudioTooLongError(AdmissionError):
+    """The audio exceeds the maximum duration the service accepts"""
+
+    reason = "too_long"
+
+
+class _Waiter:
+    """A request waiting in an admission queue"""
+
+    __slots__ = ("cost", "deadline", "future")
+
+    def __init__(self, cost: float, deadline: Optional[float], future: asyncio.Future):
+        self.cost = cost
+        self.deadline = deadline
+        self.future = future
+
+
+class AdmissionController:
+    """Bounds in-progress and queued audio-seconds per priority class"""
+
+    def __init__(
+        self,
+        max_active_seconds: float = 240.0,
+        max_queued_seconds: Optional[Dict[Priority, float]] = None,
+        default_cost: float = 30.0,
+    ):
+        """
+        Initialize the admission controller
+
+        Args:
+            max_active_seconds: Audio-seconds allowed to be processed at once
+            max_queued_seconds: Queue limit in audio-seconds per priority class
+            default_cost: Cost of requests whose duration is unknown up front
+        """
+        self.max_active_seconds = max_active_seconds
+        self.max_queued_seconds = {Priority.INTERACTIVE: 120.0, Priority.BATCH: 1800.0}
+        self.max_queued_seconds.update(max_queued_seconds or {})
+        self.default_cost = default_cost
+
+        self.active_seconds = 0.0
+        self._queues: Dict[Priority, Deque[_Waiter]] = {
+            priority: deque() for priority in PRIORITY_ORDER
+        }
+        self._queued_seconds = {priority: 0.0 for priority in PRIORITY_ORDER}
+        self._completed: Deque[Tuple[float, float]] = deque()
+
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {}
+
+        ADMISSION_ACTIVE_SECONDS.labels().set_function(lambda: self.active_seconds)
+        for priority in PRIORITY_ORDER:
+            ADMISSION_QUEUED_SECONDS.labels(priority=priority.value).set_function(
+                lambda priority=priority: self._queued_seconds[priority]
+            )
+
+    def _reject(self, error: AdmissionError, priority: Priority) -> AdmissionError:
+        """Count a rejection and return the error to raise"""
+        self.rejected[error.reason] = self.rejected.get(error.reason, 0) + 1
+        ADMISSION_REJECTED.labels(priority=priority.value, reason=error.reason).inc()
+        return error
+
+    def _throughput(self) -> Optional[float]:
+        """Audio-seconds completed per second recently, if known"""
+        now = time.monotonic()
+        while (
+            self._completed and now - self._completed[0][0] > THROUGHPUT_WINDOW_SECONDS
+        ):
+            self._completed.popleft()
+        if len(self._completed) < 2:
+            return None
+        span = max(now - self._completed[0][0], 1e-3)
+        return sum(cost for _, cost in self._completed) / span
+
+    def _seconds_until(self, audio_seconds: float) -> Optional[float]:
+        """Estimated time for `audio_seconds` of admitted work to complete"""
+        throughput = self._throughput()
+        if throughput is None:
+            return None
+        return max(audio_seconds, 0.0) / throughput
+
+    def _ahead_of(self, priority: Priority) -> float:
+        """Queued audio-seconds served before a new request of `priority`"""
+        ahead = 0.0
+        for queued_priority in PRIORITY_ORDER:
+            ahead += self._queued_seconds[queued_priority]
+            if queued_priority == priority:
+                break
+        return ahead
+
+    def _fits(self, cost: float) -> bool:
+        """Whether a request can start now; one always can when nothing runs"""
+        return (
+            self.active_seconds == 0
+            or self.active_seconds + cost <= self.max_active_seconds
+        )
+
+    def _retry_after(self, priority: Priority, cost: float) -> float:
+        """Suggested client back-off for a full queue, in seconds"""
+        excess = (
+            self._queued_seconds[priority] + cost - self.max_queued_seconds[priority]
+        )
+        estimate = self._seconds_until(excess)
+        return min(max(estimate if estimate is not None else 1.0, 1.0), 60.0)
+
+    def check(self, priority: Priority = Priority.INTERACTIVE):
+        """
+        Reject early if the priority class's queue is already full
+
+        Used before decoding, when the request's cost is not known yet.
+
+        Raises:
+            QueueFullError: If the queue is at its limit
+        """
+        if self._queued_seconds[priority] >= self.max_queued_seconds[priority]:
+            raise self._reject(
+                QueueFullError(
+                    f"{priority.value} queue is full",
+                    retry_after=self._retry_after(priority, 0.0),
+                ),
+                priority,
+            )
+
+    async def acquire(
+        self,
+        cost: float,
+        priority: Priority = Priority.INTERACTIVE,
+        deadline: Optional[float] = None,
+    ):
+        """
+        Wait until the request may run
+
+        Args:
+            cost: Audio-seconds of the request
+            priority: Priority class
+            deadline: time.monotonic() value after which the client has given up
+
+        Raises:
+            DeadlineExceededError: If the deadline passes before admission
+            QueueFullError: If the priority class's queue has no room
+            OverloadedError: If the expected wait exceeds the deadline
+        """
+        now = time.monotonic()
+        if deadline is not None and now >= deadline:
+            raise self._reject(
+                DeadlineExceededError("Deadline passed before admission"), priority
+            )
+
+        if self._ahead_of(priority) == 0 and self._fits(cost):
+            self._start(cost)
+            return
+
+        # A single request larger than the whole queue limit may still wait alone
+        queued = self._queued_seconds[priority]
+        if queued > 0 and queued + cost > self.max_queued_seconds[priority]:
+            raise self._reject(
+                QueueFullError(
+                    f"{priority.value} queue is full",
+                    retry_after=self._retry_after(priority, cost),
+                ),
+                priority,
+            )
+
+        if deadline is not None:
+            wait = self._seconds_until(
+                self.active_seconds
+                + self._ahead_of(priority)
+                + cost
+                - self.max_active_seconds
+            )
+            if wait is not None and now + wait > deadline:
+                raise self._reject(
+                    OverloadedError(
+                        f"Expected wait of {wait:.1f}s exceeds the request deadline",
+                        retry_after=min(max(wait, 1.0), 60.0),
+                    ),
+                    priority,
+                )
+
+        waiter = _Waiter(cost, deadline, asyncio.get_running_loop().create_future())
+        self._queues[priority].append(waiter)
+        self._queued_seconds[priority] += cost
+
+        try:
+            timeout = None if deadline is None else max(deadline - now, 0.0)
+            done, _ = await asyncio.wait({waiter.future}, timeout=timeout)
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(cost)
+            else:
+                self._remove(waiter, priority)
+            raise
+
+        # Waiters found expired by _dispatch are cancelled rather than admitted
+        if not done or waiter.future.cancelled():
+            self._remove(waiter, priority)
+            raise self._reject(
+                DeadlineExceededError("Deadline passed while queued"), priority
+            )
+
+    def _remove(self, waiter: _Waiter, priority: Priority):
+        """Take a waiter out of its queue without admitting it"""
+        waiter.future.cancel()
+        try:
+            self._queues[priority].remove(waiter)
+        except ValueError:
+            return
+        self._queued_seconds[priority] -= waiter.cost
+        # The head may have been blocking smaller requests behind it
+        self._dispatch()
+
+    def _start(self, cost: float):
+        """Account for an admitted request"""
+        self.active_seconds += cost
+        self.admitted += 1
+
+    def release(self, cost: float):
+        """
+        Mark an admitted request as finished and admit waiting ones
+
+        Args:
+            cost: The cost the request was admitted with
+        """
+        self.active_seconds = max(self.active_seconds - cost, 0.0)
+        self._completed.append((time.monotonic(), cost))
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit waiters in priority order while they fit"""
+        now = time.monotonic()
+        for priority in PRIORITY_ORDER:
+            queue = self._queues[priority]
+            while queue:
+                waiter = queue[0]
+                expired = waiter.deadline is not None and now >= waiter.deadline
+                if waiter.future.done() or expired:
+                    # Expired waiters are failed by their own timeout
+                    queue.popleft()
+                    self._queued_seconds[priority] -= waiter.cost
+                    waiter.future.cancel()
+                    continue
+                if not self._fits(waiter.cost):
+                    # Strict priority: nothing behind the head may overtake it
+                    return
+                queue.popleft()
+                self._queued_seconds[priority] -= waiter.cost
+                self._start(waiter.cost)
+                waiter.future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        cost: float,
+        priority: Priority = Priority.INTERACTIVE,
+        deadline: Optional[float] = None,
+    ):
+        """Hold admission for `cost` audio-seconds for the enclosed block"""
+        await self.acquire(cost, priority, deadline)
+        try:
+            yield
+        finally:
+            self.release(cost)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report admission state and counters"""
+        throughput = self._throughput()
+        return {
+            "active_seconds": self.active_seconds,
+            "max_active_seconds": self.max_active_seconds,
+            "queued_seconds": {
+                priority.value: self._queued_seconds[priority]
+                for priority in PRIORITY_ORDER
+            },
+            "max_queued_seconds": {
+                priority.value: self.max_queued_seconds[priority]
+                for priority in PRIORITY_ORDER
+            },
+            "queued_requests": {
+                priority.value: len(self._queues[priority])
+                for priority in PRIORITY_ORDER
+            },
+            "throughput_audio_seconds_per_second": throughput,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+        }
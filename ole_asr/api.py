@@ -1,12 +1,52 @@
 """ASR Service API Layer"""
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Optional
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.datastructures import UploadFile
+from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+import json
 import logging
-from .models import ASRRequest, ASRResponse
+import math
+import numpy as np
+import os
+import time
+from .admission import (
+    AdmissionController,
+    AdmissionError,
+    AudioTooLongError,
+    DeadlineExceededError,
+    QueueFullError,
+)
+from .cache import TranscriptionCache
+from .health import HealthMonitor
+from .metrics import LATENCY_BUCKETS, registry
+from .jobs import JobManager
+from .model_manager import ModelManager
+from .models import (
+    ASRRequest,
+    ASRResponse,
+    AudioFormat,
+    JobInfo,
+    JobItemResult,
+    JobRequest,
+    Priority,
+    StreamFormat,
+)
 from .services import ASRService
-
+from .settings import provider_settings
+from .streaming import StreamingSession
+from config import config
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -27,52 +67,300 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "ole_asr_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = registry.gauge(
+    "ole_asr_http_requests_in_flight", "HTTP requests currently being served"
+).labels()
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record latency of every HTTP request, labelled by route template"""
+    started = time.perf_counter()
+    HTTP_IN_FLIGHT.inc()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # Use the route template so path parameters don't explode cardinality
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.labels(
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status_code,
+        ).observe(time.perf_counter() - started)
+
+
 # Global ASR service instance
-asr_service: ASRService = ASRService()
+result_cache = None
+if config.RESULT_CACHE_ENABLED:
+    result_cache = TranscriptionCache(
+        max_bytes=config.RESULT_CACHE_MAX_BYTES,
+        disk_dir=(
+            os.path.join(config.MODEL_CACHE_DIR, "transcripts")
+            if config.RESULT_CACHE_DISK
+            else None
+        ),
+        disk_max_bytes=config.RESULT_CACHE_DISK_MAX_BYTES,
+    )
+admission = None
+if config.ADMISSION_ENABLED:
+    admission = AdmissionController(
+        max_active_seconds=config.ADMISSION_MAX_ACTIVE_SECONDS,
+        max_queued_seconds={
+            Priority.INTERACTIVE: config.ADMISSION_MAX_QUEUED_INTERACTIVE_SECONDS,
+            Priority.BATCH: config.ADMISSION_MAX_QUEUED_BATCH_SECONDS,
+        },
+    )
+model_manager = ModelManager(
+    memory_budget_bytes=(
+        int(config.MODEL_MEMORY_BUDGET_MB * 2**20)
+        if config.MODEL_MEMORY_BUDGET_MB > 0
+        else None
+    )
+)
+asr_service: ASRService = ASRService(
+    cache=result_cache,
+    admission=admission,
+    max_audio_seconds=config.MAX_REQUEST_AUDIO_SECONDS,
+    models=model_manager,
+    input_root=config.AUDIO_INPUT_ROOT,
+    health=HealthMonitor(
+        timeout=config.HEALTH_CHECK_TIMEOUT_SECONDS,
+        ttl=config.HEALTH_CHECK_TTL_SECONDS,
+        canary_interval=config.HEALTH_CANARY_INTERVAL_SECONDS,
+        canary_seconds=config.HEALTH_CANARY_SECONDS,
+    ),
+)
+job_manager: Optional[JobManager] = None
+if config.JOBS_ENABLED:
+    job_manager = JobManager(
+        asr_service,
+        config.JOBS_DB_PATH,
+        concurrency=config.JOBS_CONCURRENCY,
+        max_attempts=config.JOBS_MAX_ATTEMPTS,
+        input_root=config.JOBS_INPUT_ROOT,
+    )
+
+
+def create_model_provider(name: str, spec: dict):
+    """Build an uninitialized provider for an ASR_MODELS entry"""
+    settings = provider_settings()
+    settings.update(
+        {
+            key: value
+            for key, value in spec.items()
+            if key not in ("memory_mb", "pinned", "backend")
+        }
+    )
+    backend = spec.get("backend", "torch")
+    if backend == "torch":
+        from .providers.qwen3_asr import Qwen3ASRProvider
+
+        return Qwen3ASRProvider(name=name, **settings)
+
+    from .providers.cpu_inference import CPUInferenceProvider
+
+    settings.setdefault("intra_op_threads", config.CPU_INTRA_OP_THREADS or None)
+    settings.setdefault("inter_op_threads", config.CPU_INTER_OP_THREADS or None)
+    return CPUInferenceProvider(backend=backend, name=name, **settings)
+
+
+# Startup model loading runs in the background so the server accepts
+# connections (and answers liveness probes) while models load and warm up
+startup_state: Dict[str, Any] = {"task": None, "seconds": None}
+
+
+async def load_startup_models(started: float):
+    """Preload pinned models, then record how long startup took"""
+    await model_manager.preload()
+    startup_state["seconds"] = time.perf_counter() - started
+    logger.info(f"Startup models ready in {startup_state['seconds']:.2f}s")
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the ASR service on startup"""
     logger.info("Initializing ASR service...")
+    started = time.perf_counter()
 
-    # Dynamically load and initialize Qwen3 ASR provider to handle import issues
+    if config.INFERENCE_SOCKETS:
+        # The model lives in shared inference processes (run_server.py
+        # --shared-model); this worker only decodes and forwards PCM
+        try:
+            from .providers.shared_model import SharedModelProvider
+
+            qwen3_provider = SharedModelProvider(
+                config.INFERENCE_SOCKETS, **provider_settings()
+            )
+            await qwen3_provider.initialize()
+            asr_service.register_provider("qwen3-asr", qwen3_provider)
+            startup_state["seconds"] = time.perf_counter() - started
+        except ImportError as e:
+            logger.warning(
+                f"Could not load Qwen3 ASR provider: {e}. This may be due to missing dependencies."
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize Qwen3 ASR provider: {e}")
+    else:
+        # Models load on first use; pinned ones are loaded (and warmed up) in
+        # the background, and GET /ready reports when that is done
+        for name, spec in config.ASR_MODELS.items():
+            memory_mb = spec.get("memory_mb")
+            asr_service.register_model(
+                name,
+                functools.partial(create_model_provider, name, spec),
+                memory_bytes=int(memory_mb * 2**20) if memory_mb else None,
+                pinned=spec.get("pinned", False),
+            )
+        startup_state["task"] = asyncio.create_task(load_startup_models(started))
+
+    # Other nodes, and routes balancing requests over them and local models
+    if config.ASR_BACKENDS:
+        from .providers.http_backend import HTTPBackendProvider
+
+        for name, spec in config.ASR_BACKENDS.items():
+            asr_service.register_provider(
+                name,
+                HTTPBackendProvider(
+                    spec["url"],
+                    provider=spec.get("provider"),
+                    timeout=spec.get("timeout", 300.0),
+                ),
+            )
+    for name, replicas in config.ASR_ROUTES.items():
+        asr_service.register_route(
+            name, replicas, retry_seconds=config.ROUTE_RETRY_SECONDS
+        )
+    if config.ASR_ROUTES:
+        asr_service.default_provider = next(iter(config.ASR_ROUTES))
+    logger.info(f"Registered ASR providers: {asr_service.list_providers()}")
+    asr_service.start_health_canary()
+
+    # Resume bulk jobs interrupted by the last shutdown
+    if job_manager is not None:
+        await job_manager.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release provider resources on shutdown"""
+    task = startup_state["task"]
+    if task is not None and not task.done():
+        task.cancel()
+    if job_manager is not None:
+        await job_manager.stop()
+    await asr_service.close()
+
+
+def _admission_http_error(error: AdmissionError) -> HTTPException:
+    """Map an admission rejection to an HTTP error with Retry-After"""
+    if isinstance(error, QueueFullError):
+        status_code = 429
+    elif isinstance(error, DeadlineExceededError):
+        status_code = 504
+    elif isinstance(error, AudioTooLongError):
+        status_code = 413
+    else:
+        status_code = 503
+
+    headers = None
+    if error.retry_after is not None:
+        headers = {"Retry-After": str(math.ceil(error.retry_after))}
+    return HTTPException(status_code=status_code, detail=str(error), headers=headers)
+
+
+def _encode_segment_event(event: str, data: str, stream: StreamFormat) -> str:
+    """One streamed message as an NDJSON line or a server-sent event"""
+    if stream == StreamFormat.SSE:
+        return f"event: {event}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+async def _stream_segments(
+    request: ASRRequest, provider: Optional[str], stream: StreamFormat
+) -> StreamingResponse:
+    """
+    Start a transcription and stream its segments as they are decoded
+
+    The first segment is awaited before responding, so admission, decoding
+    and provider errors still map to an HTTP status. Errors after that end
+    the stream with an "error" message.
+    """
+    segments = asr_service.transcribe_stream(request, provider)
     try:
-        from .providers.qwen3_asr import Qwen3ASRProvider
+        first = await segments.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except BaseException:
+        await segments.aclose()
+        raise
+
+    async def body():
+        try:
+            if first is not None:
+                yield _encode_segment_event("segment", first.model_dump_json(), stream)
+                async for segment in segments:
+                    yield _encode_segment_event(
+                        "segment", segment.model_dump_json(), stream
+                    )
+            if stream == StreamFormat.SSE:
+                yield _encode_segment_event("done", "{}", stream)
+        except Exception as e:
+            logger.error(f"Streamed transcription failed: {str(e)}")
+            yield _encode_segment_event("error", json.dumps({"error": str(e)}), stream)
+        finally:
+            await segments.aclose()
 
-        qwen3_provider = Qwen3ASRProvider()
-        await qwen3_provider.initialize()
-        asr_service.register_provider("qwen3-asr", qwen3_provider)
-        logger.info(f"Registered ASR providers: {asr_service.list_providers()}")
-    except ImportError as e:
-        logger.warning(
-            f"Could not load Qwen3 ASR provider: {e}. This may be due to missing dependencies."
+    if stream == StreamFormat.SSE:
+        return StreamingResponse(
+            body(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
         )
-    except Exception as e:
-        logger.error(f"Failed to initialize Qwen3 ASR provider: {e}")
+    return StreamingResponse(body(), media_type="application/x-ndjson")
 
 
 @app.post("/transcribe", response_model=ASRResponse, status_code=status.HTTP_200_OK)
-async def transcribe_audio(request: ASRRequest, provider: Optional[str] = None):
+async def transcribe_audio(
+    request: ASRRequest,
+    provider: Optional[str] = None,
+    stream: Optional[StreamFormat] = None,
+):
     """
     Transcribe audio to text using specified or default ASR provider
 
     Args:
         request: ASR request containing audio data
         provider: Optional provider name (uses default if not specified)
+        stream: Send each segment as soon as it is decoded, as NDJSON lines or
+            server-sent events, instead of one response at the end
 
     Returns:
-        ASRResponse with transcription results
+        ASRResponse with transcription results, or a stream of ASRSegments
     """
     try:
         logger.info(
             f"Received transcription request for provider: {provider or 'default'}"
         )
+        if stream is not None:
+            return await _stream_segments(request, provider, stream)
         result = await asr_service.transcribe(request, provider)
         logger.info(
             f"Successfully processed transcription, result length: {len(result.text)}"
         )
         return result
+    except AdmissionError as e:
+        logger.warning(f"Transcription request not admitted: {str(e)}")
+        raise _admission_http_error(e)
     except ValueError as e:
         logger.error(f"Value error in transcription: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -81,11 +369,455 @@ async def transcribe_audio(request: ASRRequest, provider: Optional[str] = None):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@app.post("/health", response_model=Dict[str, bool])
+def _upload_too_large() -> HTTPException:
+    """413 for an upload over MAX_UPLOAD_BYTES"""
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload exceeds the {config.MAX_UPLOAD_BYTES}-byte limit",
+    )
+
+
+def _declared_length(request: Request) -> Optional[int]:
+    """
+    Body size from the Content-Length header, checked before reading the body
+
+    Raises:
+        HTTPException: 400 if the header is not a non-negative integer, 413 if
+            it exceeds MAX_UPLOAD_BYTES
+    """
+    header = request.headers.get("content-length")
+    if header is None:
+        return None
+    if not (header.isascii() and header.isdigit()):
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    length = int(header)
+    if length > config.MAX_UPLOAD_BYTES:
+        raise _upload_too_large()
+    return length
+
+
+async def _read_upload(upload: UploadFile, limit: int) -> bytes:
+    """
+    Read a multipart file part, checking its size before reading it
+
+    Args:
+        upload: File part of a parsed form
+        limit: Most bytes the part may hold
+
+    Raises:
+        HTTPException: 413 if the part is larger than `limit`
+    """
+    # Parts are spooled to disk, so a chunked upload is checked before reading
+    if upload.size is not None and upload.size > limit:
+        raise _upload_too_large()
+    contents = await upload.read()
+    if len(contents) > limit:
+        raise _upload_too_large()
+    return contents
+
+
+async def _read_audio_body(request: Request) -> memoryview:
+    """
+    Read a raw or multipart audio upload into a single buffer
+
+    Args:
+        request: Incoming HTTP request
+
+    Returns:
+        Memoryview over the uploaded audio bytes
+
+    Raises:
+        HTTPException: If the body is, or claims to be, over MAX_UPLOAD_BYTES,
+            or its Content-Length header is invalid
+    """
+    content_length = _declared_length(request)
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise ValueError("Multipart upload must include a 'file' field")
+        return memoryview(await _read_upload(upload, config.MAX_UPLOAD_BYTES))
+
+    # Stream the body into one preallocated buffer when the size is known,
+    # instead of collecting chunks and joining them into a second copy
+    if content_length is not None:
+        buffer = bytearray(content_length)
+        offset = 0
+        async for chunk in request.stream():
+            end = offset + len(chunk)
+            if end > len(buffer):
+                raise ValueError("Request body exceeds declared Content-Length")
+            buffer[offset:end] = chunk
+            offset = end
+        return memoryview(buffer)[:offset]
+
+    # Chunked bodies are capped as they arrive
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > config.MAX_UPLOAD_BYTES:
+            raise _upload_too_large()
+        chunks.append(chunk)
+    return memoryview(b"".join(chunks))
+
+
+@app.post("/transcribe/raw", response_model=ASRResponse, status_code=status.HTTP_200_OK)
+async def transcribe_raw_audio(
+    request: Request,
+    provider: Optional[str] = None,
+    sample_rate: int = 16000,
+    language: str = "auto",
+    format: AudioFormat = AudioFormat.WAV,
+    priority: Priority = Priority.INTERACTIVE,
+    timeout: Optional[float] = None,
+    start_time: Optional[float] = Query(default=None, ge=0),
+    end_time: Optional[float] = Query(default=None, gt=0),
+    split_channels: bool = False,
+    stream: Optional[StreamFormat] = None,
+):
+    """
+    Transcribe raw audio bytes sent as application/octet-stream or multipart
+
+    Args:
+        request: HTTP request whose body (or 'file' form field) is the audio file
+        provider: Optional provider name (uses default if not specified)
+        sample_rate: Target sample rate in Hz
+        language: Language code
+        format: Audio format
+        priority: Admission priority class
+        timeout: Seconds the client will wait before giving up
+        start_time: Transcribe from this many seconds into the audio
+        end_time: Transcribe up to this many seconds into the audio
+        split_channels: Transcribe each channel separately, tagging segments
+            with their channel
+        stream: Stream segments as NDJSON or server-sent events
+
+    Returns:
+        ASRResponse with transcription results, or a stream of ASRSegments
+    """
+    try:
+        audio_bytes = await _read_audio_body(request)
+    except ValueError as e:
+        logger.error(f"Invalid audio upload: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not audio_bytes:
+        raise HTTPException(status_code=400, detail="Empty audio upload")
+
+    asr_request = ASRRequest.from_bytes(
+        audio_bytes,
+        sample_rate=sample_rate,
+        language=language,
+        format=format,
+        priority=priority,
+        timeout=timeout,
+        start_time=start_time,
+        end_time=end_time,
+        model_params={"split_channels": True} if split_channels else None,
+    )
+    return await transcribe_audio(asr_request, provider, stream)
+
+
+def _job_manager() -> JobManager:
+    """The running job manager, or a 503 if bulk jobs are disabled"""
+    if job_manager is None or job_manager.store is None:
+        raise HTTPException(status_code=503, detail="Bulk jobs are disabled")
+    return job_manager
+
+
+@app.post("/jobs", response_model=JobInfo, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(job: JobRequest):
+    """
+    Queue a bulk transcription job
+
+    Args:
+        job: Inline requests and/or paths under the server's job input root
+
+    Returns:
+        JobInfo of the queued job; poll GET /jobs/{id} for progress
+    """
+    try:
+        return await _job_manager().submit(job)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/jobs/upload", response_model=JobInfo, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job_upload(
+    request: Request,
+    provider: Optional[str] = None,
+    sample_rate: int = 16000,
+    language: str = "auto",
+):
+    """
+    Queue a bulk transcription job from a multipart upload of many files
+
+    Args:
+        request: Multipart request with one or more 'files' fields
+        provider: Optional provider name (uses default if not specified)
+        sample_rate: Target sample rate in Hz
+        language: Language code
+
+    Returns:
+        JobInfo of the queued job
+    """
+    manager = _job_manager()
+    _declared_length(request)
+    form = await request.form()
+    uploads = []
+    # The files together are held to MAX_UPLOAD_BYTES, like a single upload
+    remaining = config.MAX_UPLOAD_BYTES
+    for upload in form.getlist("files"):
+        if isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="'files' must be file fields")
+        contents = await _read_upload(upload, remaining)
+        remaining -= len(contents)
+        uploads.append((upload.filename or f"file[{len(uploads)}]", contents))
+
+    job = JobRequest(provider=provider, sample_rate=sample_rate, language=language)
+    try:
+        return await manager.submit(job, uploads)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/jobs", response_model=List[JobInfo])
+async def list_jobs(limit: int = 50):
+    """Most recently submitted jobs"""
+    return await _job_manager().list(limit)
+
+
+@app.get("/jobs/{job_id}", response_model=JobInfo)
+async def get_job(job_id: str):
+    """Progress and throughput of a job"""
+    info = await _job_manager().get(job_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return info
+
+
+@app.get("/jobs/{job_id}/results", response_model=List[JobItemResult])
+async def get_job_results(job_id: str, offset: int = 0, limit: int = 100):
+    """
+    Items of a job in submission order, with results for finished ones
+
+    Args:
+        job_id: Job ID
+        offset: Index of the first item to return
+        limit: Maximum number of items to return
+    """
+    manager = _job_manager()
+    if await manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return await manager.results(job_id, offset, limit)
+
+
+@app.get("/jobs/{job_id}/stream")
+async def stream_job_results(job_id: str):
+    """Stream items as newline-delimited JSON as they finish, until the job ends"""
+    manager = _job_manager()
+    if await manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+
+    async def lines():
+        async for item in manager.stream(job_id):
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.delete("/jobs/{job_id}", response_model=JobInfo)
+async def cancel_job(job_id: str):
+    """Cancel a job's pending items; items already running still finish"""
+    manager = _job_manager()
+    if not await manager.cancel(job_id):
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return await manager.get(job_id)
+
+
+PCM_DTYPES = {"pcm_s16le": np.dtype("<i2"), "pcm_f32le": np.dtype("<f4")}
+
+
+def _pcm_to_float32(payload: bytes, dtype: np.dtype) -> np.ndarray:
+    """Convert little-endian PCM bytes to float32 samples in [-1, 1]"""
+    samples = np.frombuffer(payload, dtype=dtype)
+    if dtype.kind == "i":
+        return samples.astype(np.float32) / 32768.0
+    return samples.astype(np.float32, copy=False)
+
+
+@app.websocket("/ws/transcribe")
+async def transcribe_stream(websocket: WebSocket, provider: Optional[str] = None):
+    """
+    Stream PCM audio and receive incremental transcription results
+
+    Protocol:
+        1. Optional JSON text frame with session settings:
+           {"sample_rate": 16000, "encoding": "pcm_s16le" | "pcm_f32le"}
+        2. Binary frames of mono PCM audio
+        3. JSON text frame {"type": "end"} (or closing the socket) to flush
+
+    The server sends {"type": "partial" | "final", "segment": {...}} events and
+    a closing {"type": "end", "stats": {...}} with time-to-first-token.
+    """
+    from .resampling import StreamingResampler
+
+    await websocket.accept()
+
+    provider_name = provider or asr_service.default_provider
+    try:
+        # Held for the whole session so the model isn't unloaded mid-stream
+        asr_provider = await asr_service.acquire_provider(provider_name)
+    except Exception as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close()
+        return
+
+    if not hasattr(asr_provider, "transcribe_pcm"):
+        asr_service.release_provider(provider_name)
+        await websocket.send_json(
+            {"type": "error", "detail": "Provider does not support streaming"}
+        )
+        await websocket.close()
+        return
+
+    sample_rate = config.DEFAULT_SAMPLE_RATE
+    dtype = PCM_DTYPES["pcm_s16le"]
+    session: Optional[StreamingSession] = None
+    resampler: Optional[StreamingResampler] = None
+    audio_ready = asyncio.Event()
+    finished = False
+
+    def start_session(session_rate: int):
+        return StreamingSession(
+            asr_provider.transcribe_pcm,
+            sample_rate=session_rate,
+            window_seconds=config.STREAM_WINDOW_SECONDS,
+            step_seconds=config.STREAM_STEP_SECONDS,
+            overlap_seconds=config.STREAM_OVERLAP_SECONDS,
+        )
+
+    async def send_events(events):
+        for event in events:
+            await websocket.send_json(
+                {"type": event["type"], "segment": event["segment"].model_dump()}
+            )
+
+    async def infer_loop():
+        # Inference runs beside the receiver so audio keeps arriving meanwhile
+        while True:
+            await audio_ready.wait()
+            audio_ready.clear()
+            if finished:
+                return
+            while not finished and session.due():
+                await send_events(await session.poll())
+
+    inference_task = None
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("text") is not None:
+                settings = json.loads(message["text"])
+                if settings.get("type") == "end":
+                    break
+                if session is None:
+                    sample_rate = int(settings.get("sample_rate", sample_rate))
+                    encoding = settings.get("encoding", "pcm_s16le")
+                    if encoding not in PCM_DTYPES:
+                        raise ValueError(f"Unsupported encoding: {encoding}")
+                    dtype = PCM_DTYPES[encoding]
+                continue
+
+            if session is None:
+                # Convert to the model rate once on arrival rather than
+                # resampling every overlapping window again
+                model_rate = getattr(asr_provider, "sample_rate", sample_rate)
+                if model_rate != sample_rate:
+                    resampler = StreamingResampler(sample_rate, model_rate)
+                session = start_session(model_rate)
+                inference_task = asyncio.create_task(infer_loop())
+            samples = _pcm_to_float32(message["bytes"], dtype)
+            session.feed(resampler.process(samples) if resampler else samples)
+            audio_ready.set()
+
+        finished = True
+        if session is not None:
+            if resampler is not None:
+                session.feed(resampler.flush())
+            # Let any in-flight partial complete, then flush the rest as final
+            audio_ready.set()
+            await inference_task
+            await send_events(await session.finish())
+            await websocket.send_json({"type": "end", "stats": session.stats()})
+            logger.info(f"Streaming session finished: {session.stats()}")
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("Streaming client disconnected")
+    except Exception as e:
+        logger.error(f"Error in streaming transcription: {str(e)}")
+        try:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            await websocket.close()
+        except Exception:
+            pass
+    finally:
+        if inference_task is not None and not inference_task.done():
+            inference_task.cancel()
+        asr_service.release_provider(provider_name)
+
+
+@app.get("/live")
+async def liveness():
+    """Liveness probe: 200 whenever the server can answer; checks no providers"""
+    return {"status": "alive"}
+
+
+@app.get("/ready")
+async def readiness():
+    """
+    Readiness probe: 200 once startup models are loaded and warmed up and some
+    provider is healthy, else 503
+
+    Uses the last health check results without waiting for new ones.
+
+    Returns:
+        Readiness, startup duration, per-model state and provider health
+    """
+    health = asr_service.health_snapshot()
+    ready = (
+        startup_state["seconds"] is not None
+        and bool(asr_service.list_providers())
+        and model_manager.ready()
+        and (not health or any(healthy is not False for healthy in health.values()))
+    )
+    return JSONResponse(
+        {
+            "ready": ready,
+            "startup_seconds": startup_state["seconds"],
+            "models": {
+                name: model["state"]
+                for name, model in model_manager.stats()["models"].items()
+            },
+            "providers": health,
+        },
+        status_code=200 if ready else 503,
+    )
+
+
+@app.api_route("/health", methods=["GET", "POST"], response_model=Dict[str, bool])
 async def health_check():
     """
     Health check endpoint to verify all providers are working
 
+    Loaded providers are checked concurrently with a timeout each, and results
+    are reused for a few seconds; models that aren't loaded are not loaded.
+
     Returns:
         Dictionary with provider health status
     """
@@ -117,6 +849,36 @@ async def list_providers():
         )
 
 
+@app.get("/stats")
+async def get_stats():
+    """
+    Runtime statistics such as batch-size and queue-wait histograms
+
+    Returns:
+        Dictionary with per-provider statistics
+    """
+    return asr_service.stats()
+
+
+@app.get("/models")
+async def get_models():
+    """
+    Loaded and registered models with load/unload timings
+
+    Returns:
+        Residency, memory budget and per-model statistics
+    """
+    return model_manager.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics in the text exposition format"""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint for basic service information"""
@@ -0,0 +1,251 @@
+"""Dynamic micro-batching for ASR inference"""
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Set
+import numpy as np
+from .metrics import STAGE_SECONDS, Histogram, registry
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+QUEUE_WAIT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+BATCH_SIZE = registry.histogram(
+    "ole_asr_batch_size", "Clips per inference batch", ("provider",), BATCH_SIZE_BUCKETS
+)
+BATCH_QUEUE_WAIT = registry.histogram(
+    "ole_asr_batch_queue_wait_seconds",
+    "Time clips wait in the batch queue before dispatch",
+    ("provider",),
+    QUEUE_WAIT_BUCKETS,
+)
+BATCH_QUEUE_DEPTH = registry.gauge(
+    "ole_asr_batch_queue_depth", "Clips waiting to be batched", ("provider",)
+)
+
+
+class _PendingItem:
+    """A single inference call waiting to be batched"""
+
+    __slots__ = ("audio", "audio_seconds", "future", "enqueued_at")
+
+    def __init__(self, audio: np.ndarray, audio_seconds: float, future: asyncio.Future):
+        self.audio = audio
+        self.audio_seconds = audio_seconds
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchScheduler:
+    """Gathers concurrent inference calls into batches for a batch function"""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[np.ndarray]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        max_batch_audio_seconds: float = 120.0,
+        sample_rate: int = 16000,
+        executor: Optional[Executor] = None,
+        name: str = "",
+        max_concurrent_batches: int = 1,
+    ):
+        """
+        Initialize the batch scheduler
+
+        Args:
+            batch_fn: Blocking function mapping a list of clips to a list of
+                results; an exception in place of a result fails only that clip
+            max_batch_size: Maximum number of clips per batch
+            max_wait_ms: Maximum time to hold the first clip while gathering a batch
+            max_batch_audio_seconds: Total audio budget per batch in seconds
+            sample_rate: Sample rate of submitted clips, used for the audio budget
+            executor: Executor the batch function runs in (default executor if None)
+            name: Provider label for exported metrics
+            max_concurrent_batches: Batches running at once, e.g. one per
+                inference lane of the executor
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_audio_seconds = max_batch_audio_seconds
+        self.sample_rate = sample_rate
+        self.executor = executor
+        self.name = name
+        self.max_concurrent_batches = max_concurrent_batches
+
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_histogram = Histogram(QUEUE_WAIT_BUCKETS)
+        self.batches_processed = 0
+        self._inference_seconds = STAGE_SECONDS.labels(provider=name, stage="inference")
+        BATCH_SIZE.attach(self.batch_size_histogram, provider=name)
+        BATCH_QUEUE_WAIT.attach(self.queue_wait_histogram, provider=name)
+        BATCH_QUEUE_DEPTH.labels(provider=name).set_function(self.queue_depth)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._carry: Optional[_PendingItem] = None
+
+    def _ensure_worker(self):
+        """Start the gathering task on the running loop if needed"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            if self._loop is not loop:
+                self._queue = asyncio.Queue()
+                self._carry = None
+            self._loop = loop
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, audio_data: np.ndarray) -> Any:
+        """
+        Submit a clip for inference and wait for its own result
+
+        Args:
+            audio_data: Audio data as numpy array at the scheduler sample rate
+
+        Returns:
+            The batch function's result for this clip
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        audio_seconds = len(audio_data) / self.sample_rate
+        await self._queue.put(_PendingItem(audio_data, audio_seconds, future))
+        return await future
+
+    async def _next_item(self) -> _PendingItem:
+        """Return the held-over item if any, otherwise wait for a new one"""
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+            return item
+        return await self._queue.get()
+
+    async def _gather_batch(self) -> List[_PendingItem]:
+        """Collect items until the size, wait or audio budget is reached"""
+        first = await self._next_item()
+        batch = [first]
+        total_seconds = first.audio_seconds
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            try:
+                if timeout <= 0:
+                    item = self._queue.get_nowait()
+                else:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+
+            if total_seconds + item.audio_seconds > self.max_batch_audio_seconds:
+                # Keep the item for the next batch rather than overshooting
+                self._carry = item
+                break
+
+            batch.append(item)
+            total_seconds += item.audio_seconds
+
+        return batch
+
+    async def _run(self):
+        """Gather and dispatch batches until cancelled"""
+        slots = asyncio.Semaphore(self.max_concurrent_batches)
+        dispatching: Set[asyncio.Task] = set()
+
+        def finished(task: asyncio.Task):
+            dispatching.discard(task)
+            slots.release()
+
+        try:
+            while True:
+                # Gather only once a batch can run, so clips arriving while
+                # every slot is busy join the next batch
+                await slots.acquire()
+                batch = await self._gather_batch()
+                task = self._loop.create_task(self._dispatch(batch))
+                dispatching.add(task)
+                task.add_done_callback(finished)
+        finally:
+            for task in dispatching:
+                task.cancel()
+
+    async def _dispatch(self, batch: List[_PendingItem]):
+        """Run one batch through the batch function and resolve its futures"""
+        dispatched_at = time.perf_counter()
+        for item in batch:
+            self.queue_wait_histogram.observe(dispatched_at - item.enqueued_at)
+        self.batch_size_histogram.observe(len(batch))
+        self.batches_processed += 1
+
+        live = [item for item in batch if not item.future.done()]
+        if not live:
+            return
+
+        try:
+            started = time.perf_counter()
+            results = await self._loop.run_in_executor(
+                self.executor, self.batch_fn, [item.audio for item in live]
+            )
+            self._inference_seconds.observe(time.perf_counter() - started)
+            if len(results) != len(live):
+                raise RuntimeError(
+                    f"Batch function returned {len(results)} results for {len(live)} inputs"
+                )
+        except Exception as e:
+            for item in live:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        for item, result in zip(live, results):
+            if item.future.done():
+                continue
+            if isinstance(result, Exception):
+                item.future.set_exception(result)
+            else:
+                item.future.set_result(result)
+
+    def queue_depth(self) -> int:
+        """Number of clips waiting to be batched"""
+        waiting = self._queue.qsize() if self._queue is not None else 0
+        return waiting + (1 if self._carry is not None else 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report batching statistics
+
+        Returns:
+            Dictionary with configuration and batch-size/queue-wait histograms
+        """
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "max_batch_audio_seconds": self.max_batch_audio_seconds,
+            "max_concurrent_batches": self.max_concurrent_batches,
+            "batches_processed": self.batches_processed,
+            "queue_depth": self.queue_depth(),
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "queue_wait_seconds": self.queue_wait_histogram.snapshot(),
+        }
+
+    async def close(self):
+        """Stop the gathering task"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+        # Fail anything still waiting so callers don't hang
+        pending = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for item in pending:
+            if not item.future.done():
+                item.future.set_exception(RuntimeError("Batch scheduler closed"))
@@ -0,0 +1,272 @@
+"""Content-addressed transcription result cache"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+import numpy as np
+from .models import ASRResponse
+
+
+class TranscriptionCache:
+    """Two-tier (memory LRU + optional disk) cache of transcription results"""
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = 1024 * 1024 * 1024,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Size limit of the in-memory tier
+            disk_dir: Directory of the on-disk tier (disabled if None)
+            disk_max_bytes: Size limit of the on-disk tier
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        self._disk_size = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_size = sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, files in os.walk(disk_dir)
+                for name in files
+            )
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(
+        audio_data: np.ndarray,
+        provider: str,
+        language: str,
+        sample_rate: int,
+        model_params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Build a cache key from decoded PCM and everything that affects the result
+
+        Args:
+            audio_data: Decoded (and resampled) audio samples
+            provider: Provider name
+            language: Requested language
+            sample_rate: Sample rate of the audio
+            model_params: Model-specific parameters
+
+        Returns:
+            Hex digest identifying the transcription
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(
+            json.dumps(
+                [provider, language, sample_rate, model_params or {}],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        )
+        digest.update(np.ascontiguousarray(audio_data).view(np.uint8))
+        return digest.hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        """Location of an entry in the disk tier"""
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        """Read an entry from the memory tier, marking it recently used"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def _put_memory(self, key: str, payload: bytes):
+        """Store an entry in the memory tier, evicting least recently used ones"""
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = payload
+            self._size += len(payload)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def _get_disk(self, key: str) -> Optional[bytes]:
+        """Read an entry from the disk tier (runs in thread pool)"""
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _put_disk(self, key: str, payload: bytes):
+        """Write an entry to the disk tier (runs in thread pool)"""
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._disk_size += len(payload)
+            over_budget = self._disk_size > self.disk_max_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Remove the oldest disk entries until under 90% of the budget"""
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, file_path))
+
+        size = sum(entry[1] for entry in files)
+        for _, file_size, file_path in sorted(files):
+            if size <= self.disk_max_bytes * 0.9:
+                break
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                continue
+            size -= file_size
+            self.disk_evictions += 1
+
+        with self._lock:
+            self._disk_size = size
+
+    async def get(self, key: str) -> Optional[ASRResponse]:
+        """
+        Look up a result in memory, then on disk
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        payload = self._get_memory(key)
+        if payload is not None:
+            self.hits += 1
+            return ASRResponse.model_validate_json(payload)
+
+        if self.disk_dir:
+            loop = asyncio.get_running_loop()
+            payload = await loop.run_in_executor(None, self._get_disk, key)
+            if payload is not None:
+                self.disk_hits += 1
+                self._put_memory(key, payload)
+                return ASRResponse.model_validate_json(payload)
+
+        return None
+
+    async def put(self, key: str, response: ASRResponse):
+        """Store a result in both tiers"""
+        payload = response.model_dump_json().encode()
+        self._put_memory(key, payload)
+        if self.disk_dir:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._put_disk, key, payload)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[ASRResponse]],
+        shared_errors: Tuple[Type[BaseException], ...] = (ValueError,),
+    ) -> ASRResponse:
+        """
+        Return a cached result, or compute it once for all concurrent callers
+
+        Args:
+            key: Cache key from make_key
+            compute: Coroutine factory producing the response on a miss
+            shared_errors: Failures that follow from the audio itself, so
+                every caller gets them; after any other failure (e.g. the
+                leading caller's deadline or admission rejection) a waiting
+                caller computes the result itself
+
+        Returns:
+            Transcription response
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            try:
+                response = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The leading caller was cancelled or failed for reasons of its
+                # own; take over the computation
+                return await self.get_or_compute(key, compute, shared_errors)
+            return response.model_copy(deep=True)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            response = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except shared_errors as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; mark the exception as retrieved
+            future.exception()
+            raise
+        except Exception:
+            future.cancel()
+            raise
+        else:
+            future.set_result(response)
+            await self.put(key, response)
+            return response
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report cache counters and sizes"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "disk_bytes": self._disk_size if self.disk_dir else None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "disk_evictions": self.disk_evictions,
+        }
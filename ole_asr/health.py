@@ -0,0 +1,259 @@
+"""Provider health checks that stay cheap under frequent probing
+
+Checks of all providers run concurrently, each bounded by a timeout, and a
+result is reused for `ttl` seconds, so probes hitting the service every few
+seconds cost at most one check per provider per TTL. Concurrent probes share
+a check in progress. An optional canary periodically runs a short synthetic
+clip through each loaded model in the background, catching providers that
+report healthy but can no longer transcribe, without putting inference on
+the probe path.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncContextManager, Callable, Dict, Optional
+from .metrics import registry
+from .utils import synthetic_speech
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_HEALTHY = registry.gauge(
+    "ole_asr_provider_healthy",
+    "Result of the last health check of each provider",
+    ("provider",),
+)
+CANARY_SECONDS = registry.gauge(
+    "ole_asr_health_canary_duration_seconds",
+    "Duration of the last canary transcription of each provider",
+    ("provider",),
+)
+
+
+class _CachedCheck:
+    """Last result of one provider's check and the check in progress"""
+
+    __slots__ = ("healthy", "checked_at", "task")
+
+    def __init__(self):
+        self.healthy: Optional[bool] = None
+        self.checked_at = float("-inf")
+        self.task: Optional[asyncio.Task] = None
+
+
+class HealthMonitor:
+    """Concurrent, time-bounded and cached provider health checks"""
+
+    def __init__(
+        self,
+        timeout: float = 2.0,
+        ttl: float = 5.0,
+        canary_interval: float = 0.0,
+        canary_seconds: float = 1.0,
+        canary_timeout: float = 30.0,
+    ):
+        """
+        Initialize the monitor
+
+        Args:
+            timeout: Seconds a provider's health_check may take before it
+                counts as failed
+            ttl: Seconds a check result is reused
+            canary_interval: Seconds between canary transcriptions (0 disables
+                the canary)
+            canary_seconds: Length of the synthetic canary clip
+            canary_timeout: Seconds a canary transcription may take
+        """
+        self.timeout = timeout
+        self.ttl = ttl
+        self.canary_interval = canary_interval
+        self.canary_seconds = canary_seconds
+        self.canary_timeout = canary_timeout
+        self._checks: Dict[str, _CachedCheck] = {}
+        self._canary: Dict[str, Dict[str, Any]] = {}
+        self._canary_task: Optional[asyncio.Task] = None
+
+    async def _run_check(self, name: str, provider: Any, entry: _CachedCheck):
+        """Run one provider's health check and cache the result"""
+        try:
+            healthy = bool(
+                await asyncio.wait_for(provider.health_check(), self.timeout)
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Health check of '{name}' timed out after {self.timeout}s")
+            healthy = False
+        except Exception as e:
+            logger.warning(f"Health check of '{name}' failed: {str(e)}")
+            healthy = False
+        entry.healthy = healthy
+        entry.checked_at = time.monotonic()
+        PROVIDER_HEALTHY.labels(provider=name).set(float(healthy))
+        return healthy
+
+    def _refresh(self, name: str, provider: Any) -> _CachedCheck:
+        """Start a check of a provider unless its result is fresh or one is running"""
+        entry = self._checks.setdefault(name, _CachedCheck())
+        fresh = time.monotonic() - entry.checked_at < self.ttl
+        if not fresh and (entry.task is None or entry.task.done()):
+            entry.task = asyncio.ensure_future(self._run_check(name, provider, entry))
+        return entry
+
+    def _healthy(self, name: str, entry: _CachedCheck) -> Optional[bool]:
+        """A provider's cached check result combined with its last canary"""
+        canary = self._canary.get(name)
+        if entry.healthy and canary is not None and not canary["ok"]:
+            return False
+        return entry.healthy
+
+    async def check(self, providers: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        Health of providers, checking those without a fresh result
+
+        Args:
+            providers: Providers to report by name
+
+        Returns:
+            Whether each provider is healthy
+        """
+        entries = {name: self._refresh(name, p) for name, p in providers.items()}
+        pending = [
+            entry.task
+            for entry in entries.values()
+            if entry.task is not None and not entry.task.done()
+        ]
+        if pending:
+            # Shielded so a disconnecting prober doesn't cancel a shared check
+            await asyncio.shield(asyncio.gather(*pending, return_exceptions=True))
+        return {name: bool(self._healthy(name, e)) for name, e in entries.items()}
+
+    def snapshot(self, providers: Dict[str, Any]) -> Dict[str, Optional[bool]]:
+        """
+        Last known health without waiting, refreshing stale results behind
+
+        Args:
+            providers: Providers to report by name
+
+        Returns:
+            Whether each provider was healthy when last checked (None if it
+            hasn't been checked yet)
+        """
+        entries = {name: self._refresh(name, p) for name, p in providers.items()}
+        return {name: self._healthy(name, e) for name, e in entries.items()}
+
+    def start_canary(
+        self,
+        providers: Callable[[], Dict[str, Any]],
+        hold: Optional[Callable[[str], AsyncContextManager[Any]]] = None,
+    ):
+        """
+        Start periodic canary transcriptions, if enabled
+
+        Args:
+            providers: Returns the providers to exercise (only loaded ones, so
+                the canary never loads a model)
+            hold: Keeps a provider loaded while its canary runs; yields None
+                if it was unloaded in the meantime
+        """
+        if self.canary_interval > 0 and self._canary_task is None:
+            self._canary_task = asyncio.create_task(self._canary_loop(providers, hold))
+
+    async def _canary_loop(
+        self,
+        providers: Callable[[], Dict[str, Any]],
+        hold: Optional[Callable[[str], AsyncContextManager[Any]]],
+    ):
+        """Run the canary every canary_interval seconds until stopped"""
+        while True:
+            await asyncio.sleep(self.canary_interval)
+            await self.run_canary(providers(), hold)
+
+    async def run_canary(
+        self,
+        providers: Dict[str, Any],
+        hold: Optional[Callable[[str], AsyncContextManager[Any]]] = None,
+    ):
+        """Transcribe a short synthetic clip with each provider that takes PCM"""
+        # Forget providers that were unloaded since the last round
+        for name in list(self._canary):
+            if name not in providers:
+                del self._canary[name]
+        targets = {
+            name: provider
+            for name, provider in providers.items()
+            if callable(getattr(provider, "transcribe_pcm", None))
+        }
+        await asyncio.gather(
+            *(
+                self._canary_held(name, provider, hold)
+                for name, provider in targets.items()
+            )
+        )
+
+    async def _canary_held(
+        self,
+        name: str,
+        provider: Any,
+        hold: Optional[Callable[[str], AsyncContextManager[Any]]],
+    ):
+        """Run the canary while holding the provider, so it can't be evicted"""
+        if hold is None:
+            await self._canary_one(name, provider)
+            return
+        async with hold(name) as held:
+            if held is None:
+                # Unloaded since the round started; don't count it as a failure
+                self._canary.pop(name, None)
+                return
+            await self._canary_one(name, held)
+
+    async def _canary_one(self, name: str, provider: Any):
+        """Run the canary through one provider and record the outcome"""
+        sample_rate = getattr(provider, "sample_rate", 16000)
+        clip = synthetic_speech(self.canary_seconds, sample_rate)
+        started = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(
+                provider.transcribe_pcm(clip, sample_rate), self.canary_timeout
+            )
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.canary_timeout}s"
+        except Exception as e:
+            error = str(e)
+        seconds = time.perf_counter() - started
+        if error is not None:
+            logger.warning(f"Canary transcription with '{name}' failed: {error}")
+        else:
+            CANARY_SECONDS.labels(provider=name).set(seconds)
+        self._canary[name] = {
+            "ok": error is None,
+            "seconds": seconds,
+            "error": error,
+            "checked_at": time.time(),
+        }
+
+    async def stop(self):
+        """Stop the canary and any checks in progress"""
+        tasks = [entry.task for entry in self._checks.values() if entry.task]
+        if self._canary_task is not None:
+            tasks.append(self._canary_task)
+            self._canary_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report cached results and canary outcomes"""
+        now = time.monotonic()
+        return {
+            "checks": {
+                name: {
+                    "healthy": entry.healthy,
+                    "age_seconds": (
+                        now - entry.checked_at if entry.healthy is not None else None
+                    ),
+                }
+                for name, entry in self._checks.items()
+            },
+            "canary": dict(self._canary),
+        }
@@ -0,0 +1,286 @@
+"""Model-owning inference process shared by many HTTP workers
+
+HTTP workers decode audio themselves and hand the PCM to this process through
+shared memory. Only small JSON headers travel over the local socket, so model
+memory is paid once no matter how many workers serve HTTP.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("!I")
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Convert numpy values in pipeline results to plain JSON types"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    """Frame a message as a length-prefixed JSON document"""
+    payload = json.dumps(message, default=_to_jsonable).encode()
+    return _HEADER.pack(len(payload)) + payload
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a client's segment without taking ownership of it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers attached segments with the resource tracker,
+        # which would unlink them when this process exits
+        from multiprocessing import resource_tracker
+
+        segment = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+
+class InferenceServer:
+    """Serves a provider's batch scheduler over a Unix domain socket"""
+
+    def __init__(self, provider, socket_path: str):
+        """
+        Initialize the inference server
+
+        Args:
+            provider: Provider owning the model (e.g. Qwen3ASRProvider)
+            socket_path: Filesystem path of the Unix socket to listen on
+        """
+        self.provider = provider
+        self.socket_path = socket_path
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """Load the model, then start accepting connections"""
+        await self.provider.initialize()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=self.socket_path
+        )
+        logger.info(f"Inference server listening on {self.socket_path}")
+
+    async def serve_forever(self):
+        """Start the server and run until cancelled"""
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.provider.close()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Answer requests from one client connection in order"""
+        segments: Dict[str, shared_memory.SharedMemory] = {}
+        try:
+            while True:
+                try:
+                    (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                    message = json.loads(await reader.readexactly(length))
+                except asyncio.IncompleteReadError:
+                    break
+
+                try:
+                    response = await self._process(message, segments)
+                except Exception as e:
+                    logger.error(f"Inference request failed: {str(e)}")
+                    response = {"error": str(e)}
+                writer.write(_encode(response))
+                await writer.drain()
+        finally:
+            writer.close()
+            for segment in segments.values():
+                try:
+                    segment.close()
+                except BufferError:
+                    pass
+
+    async def _process(
+        self, message: Dict[str, Any], segments: Dict[str, shared_memory.SharedMemory]
+    ) -> Dict[str, Any]:
+        """Handle a single decoded request"""
+        op = message.get("op")
+        if op == "health":
+            return {"healthy": self.provider.pipeline is not None}
+        if op != "transcribe":
+            raise ValueError(f"Unknown operation: {op}")
+
+        # Clients reuse one segment across requests, so keep it attached until
+        # the client replaces it with a larger one
+        name = message["shm"]
+        segment = segments.get(name)
+        if segment is None:
+            for stale in segments.values():
+                try:
+                    stale.close()
+                except BufferError:
+                    pass
+            segments.clear()
+            segment = segments[name] = _attach(name)
+
+        clips = [
+            np.ndarray((length,), dtype=np.float32, buffer=segment.buf, offset=offset)
+            for offset, length in message["clips"]
+        ]
+        results = await asyncio.gather(
+            *(self.provider.scheduler.submit(clip) for clip in clips)
+        )
+        return {"results": results}
+
+
+class InferenceClient:
+    """Blocking client for InferenceServer, one per calling thread"""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._socket: Optional[socket.socket] = None
+        self._segment: Optional[shared_memory.SharedMemory] = None
+
+    def _request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request and wait for its response"""
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(self.socket_path)
+
+        try:
+            self._socket.sendall(_encode(message))
+            (length,) = _HEADER.unpack(self._recv_exactly(_HEADER.size))
+            response = json.loads(self._recv_exactly(length))
+        except OSError:
+            self._socket.close()
+            self._socket = None
+            raise
+
+        if "error" in response:
+            raise RuntimeError(f"Inference server error: {response['error']}")
+        return response
+
+    def _recv_exactly(self, size: int) -> bytes:
+        """Read exactly `size` bytes from the socket"""
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._socket.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Inference server closed the connection")
+            data.extend(chunk)
+        return bytes(data)
+
+    def _ensure_segment(self, size: int) -> shared_memory.SharedMemory:
+        """Return this client's shared segment, growing it if needed"""
+        if self._segment is None or self._segment.size < size:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment.unlink()
+            # Round up so slightly longer clips don't force a new segment
+            self._segment = shared_memory.SharedMemory(
+                create=True, size=max(size * 5 // 4, 1 << 20)
+            )
+        return self._segment
+
+    def health(self) -> bool:
+        """Whether the server has a loaded model"""
+        return bool(self._request({"op": "health"}).get("healthy"))
+
+    def transcribe_batch(self, clips: List[np.ndarray]) -> List[Any]:
+        """
+        Run a batch of clips through the server's model
+
+        Args:
+            clips: Mono audio clips at the server's sample rate
+
+        Returns:
+            One pipeline result per clip
+        """
+        total = sum(len(clip) for clip in clips) * 4
+        segment = self._ensure_segment(total)
+
+        layout = []
+        offset = 0
+        for clip in clips:
+            target = np.ndarray(
+                (len(clip),), dtype=np.float32, buffer=segment.buf, offset=offset
+            )
+            target[:] = clip
+            layout.append((offset, len(clip)))
+            offset += len(clip) * 4
+
+        response = self._request(
+            {"op": "transcribe", "shm": segment.name, "clips": layout}
+        )
+        return response["results"]
+
+    def close(self):
+        """Close the connection and release the shared segment"""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+
+
+class RemotePipeline:
+    """Pipeline-compatible callable forwarding to an InferenceServer"""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._local = threading.local()
+        self._clients: List[InferenceClient] = []
+        self._lock = threading.Lock()
+
+    def client(self) -> InferenceClient:
+        """Return the calling thread's client"""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = InferenceClient(self.socket_path)
+            with self._lock:
+                self._clients.append(client)
+        return client
+
+    def __call__(self, audio):
+        if isinstance(audio, list):
+            return self.client().transcribe_batch(audio)
+        return self.client().transcribe_batch([audio])[0]
+
+    def close(self):
+        """Close every thread's client"""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            client.close()
+
+
+def run_inference_server(socket_path: str, provider_kwargs: Dict[str, Any]):
+    """
+    Entry point of a model-owning inference process
+
+    Args:
+        socket_path: Unix socket path to listen on
+        provider_kwargs: Keyword arguments for Qwen3ASRProvider
+    """
+    from .providers.qwen3_asr import Qwen3ASRProvider
+
+    logging.basicConfig(level=logging.INFO)
+    server = InferenceServer(Qwen3ASRProvider(**provider_kwargs), socket_path)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
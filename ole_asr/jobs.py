@@ -0,0 +1,572 @@
+"""Asynchronous bulk transcription jobs backed by a local SQLite queue
+
+Jobs survive restarts: items are persisted with their audio (or a path to it),
+and items that were running when the process stopped are queued again on the
+next start. A single worker loop feeds items concurrently into ASRService,
+where the provider's batch scheduler groups them into model batches.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from .admission import OverloadedError, QueueFullError
+from .models import (
+    ASRRequest,
+    ASRResponse,
+    JobInfo,
+    JobItemResult,
+    JobRequest,
+    JobStatus,
+    Priority,
+)
+from .services import ASRService
+from .utils import map_audio_file, resolve_under_root
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    provider TEXT,
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    audio_seconds REAL NOT NULL DEFAULT 0,
+    processing_seconds REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    source TEXT NOT NULL,
+    params TEXT NOT NULL,
+    audio BLOB,
+    path TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    seq INTEGER,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS items_by_status ON items (status);
+CREATE INDEX IF NOT EXISTS items_by_seq ON items (job_id, seq);
+"""
+
+# (job_id, idx, provider, params, audio, path, attempts)
+ClaimedItem = Tuple[str, int, Optional[str], str, Optional[bytes], Optional[str], int]
+
+# (source, params, audio, path) of an item being submitted
+NewItem = Tuple[str, str, Optional[bytes], Optional[str]]
+
+
+class JobStore:
+    """SQLite persistence for jobs and their items
+
+    Not thread-safe; JobManager calls it from a single dedicated thread.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the job database
+
+        Args:
+            path: SQLite database file
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        (self._seq,) = self._conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM items"
+        ).fetchone()
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+    def recover(self) -> int:
+        """Queue items interrupted by a restart again; returns how many"""
+        cursor = self._conn.execute(
+            "UPDATE items SET status = ? WHERE status = ?",
+            (JobStatus.PENDING.value, JobStatus.RUNNING.value),
+        )
+        return cursor.rowcount
+
+    def create_job(self, provider: Optional[str], items: Sequence[NewItem]) -> str:
+        """Persist a job and its items; returns the job ID"""
+        job_id = uuid.uuid4().hex
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, provider, total, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, JobStatus.PENDING.value, provider, len(items), time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO items (job_id, idx, status, source, params, audio, path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (job_id, idx, JobStatus.PENDING.value, source, params, audio, path)
+                    for idx, (source, params, audio, path) in enumerate(items)
+                ],
+            )
+        return job_id
+
+    def claim(self, limit: int) -> List[ClaimedItem]:
+        """Mark up to `limit` pending items, oldest job first, as running"""
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT items.job_id, items.idx, jobs.provider, items.params, "
+                "items.audio, items.path, items.attempts + 1 "
+                "FROM items JOIN jobs ON jobs.id = items.job_id "
+                "WHERE items.status = ? AND jobs.status != ? "
+                "ORDER BY jobs.created_at, items.idx LIMIT ?",
+                (JobStatus.PENDING.value, JobStatus.CANCELLED.value, limit),
+            ).fetchall()
+            for job_id, idx, *_ in rows:
+                self._conn.execute(
+                    "UPDATE items SET status = ?, attempts = attempts + 1 "
+                    "WHERE job_id = ? AND idx = ?",
+                    (JobStatus.RUNNING.value, job_id, idx),
+                )
+            for job_id in {row[0] for row in rows}:
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, "
+                    "started_at = COALESCE(started_at, ?) WHERE id = ?",
+                    (JobStatus.RUNNING.value, time.time(), job_id),
+                )
+        return rows
+
+    def complete(
+        self,
+        job_id: str,
+        idx: int,
+        result: str,
+        audio_seconds: float,
+        processing_seconds: float,
+    ):
+        """Store an item's result and update the job's counters"""
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._seq += 1
+            self._conn.execute(
+                "UPDATE items SET status = ?, result = ?, audio = NULL, seq = ? "
+                "WHERE job_id = ? AND idx = ?",
+                (JobStatus.COMPLETED.value, result, self._seq, job_id, idx),
+            )
+            self._conn.execute(
+                "UPDATE jobs SET completed = completed + 1, "
+                "audio_seconds = audio_seconds + ?, "
+                "processing_seconds = processing_seconds + ? WHERE id = ?",
+                (audio_seconds, processing_seconds, job_id),
+            )
+            self._finish_if_done(job_id)
+
+    def fail(self, job_id: str, idx: int, error: str, retry: bool):
+        """Record an item failure, queueing it again if `retry`"""
+        with self._conn:
+            self._conn.execute("BEGIN")
+            if retry:
+                self._conn.execute(
+                    "UPDATE items SET status = ?, error = ? WHERE job_id = ? AND idx = ?",
+                    (JobStatus.PENDING.value, error, job_id, idx),
+                )
+                return
+            self._seq += 1
+            self._conn.execute(
+                "UPDATE items SET status = ?, error = ?, audio = NULL, seq = ? "
+                "WHERE job_id = ? AND idx = ?",
+                (JobStatus.FAILED.value, error, self._seq, job_id, idx),
+            )
+            self._conn.execute(
+                "UPDATE jobs SET failed = failed + 1 WHERE id = ?", (job_id,)
+            )
+            self._finish_if_done(job_id)
+
+    def release(self, job_id: str, idx: int):
+        """Return a claimed item to the queue without counting an attempt"""
+        self._conn.execute(
+            "UPDATE items SET status = ?, attempts = attempts - 1 "
+            "WHERE job_id = ? AND idx = ? AND status = ?",
+            (JobStatus.PENDING.value, job_id, idx, JobStatus.RUNNING.value),
+        )
+
+    def _finish_if_done(self, job_id: str):
+        """Close the job once no item is pending or running"""
+        total, completed, failed, status = self._conn.execute(
+            "SELECT total, completed, failed, status FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if completed + failed < total or status == JobStatus.CANCELLED.value:
+            return
+        final = JobStatus.FAILED if completed == 0 and failed else JobStatus.COMPLETED
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?",
+            (final.value, time.time(), job_id),
+        )
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job's pending items; returns False if the job is unknown"""
+        with self._conn:
+            self._conn.execute("BEGIN")
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? "
+                "WHERE id = ? AND status IN (?, ?)",
+                (
+                    JobStatus.CANCELLED.value,
+                    time.time(),
+                    job_id,
+                    JobStatus.PENDING.value,
+                    JobStatus.RUNNING.value,
+                ),
+            )
+            if cursor.rowcount:
+                self._conn.execute(
+                    "UPDATE items SET status = ?, audio = NULL "
+                    "WHERE job_id = ? AND status = ?",
+                    (JobStatus.CANCELLED.value, job_id, JobStatus.PENDING.value),
+                )
+        return self.job(job_id) is not None
+
+    def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job row as a dictionary, or None"""
+        cursor = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([column[0] for column in cursor.description], row))
+
+    def job_ids(self, limit: int) -> List[str]:
+        """Most recently created job IDs"""
+        rows = self._conn.execute(
+            "SELECT id FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def items(
+        self, job_id: str, offset: int = 0, limit: int = 100
+    ) -> List[Tuple[int, str, str, Optional[str], Optional[str]]]:
+        """(idx, source, status, result, error) of items in submission order"""
+        return self._conn.execute(
+            "SELECT idx, source, status, result, error FROM items WHERE job_id = ? "
+            "ORDER BY idx LIMIT ? OFFSET ?",
+            (job_id, limit, offset),
+        ).fetchall()
+
+    def finished_items(
+        self, job_id: str, after_seq: int
+    ) -> List[Tuple[int, int, str, str, Optional[str], Optional[str]]]:
+        """(seq, idx, source, status, result, error) of items finished after a seq"""
+        return self._conn.execute(
+            "SELECT seq, idx, source, status, result, error FROM items "
+            "WHERE job_id = ? AND seq > ? ORDER BY seq",
+            (job_id, after_seq),
+        ).fetchall()
+
+
+def _job_info(row: Dict[str, Any]) -> JobInfo:
+    """Build a JobInfo, deriving throughput from the job's counters"""
+    done = row["completed"] + row["failed"]
+    elapsed = None
+    if row["started_at"] is not None:
+        elapsed = (row["finished_at"] or time.time()) - row["started_at"]
+
+    return JobInfo(
+        id=row["id"],
+        status=JobStatus(row["status"]),
+        provider=row["provider"],
+        total=row["total"],
+        completed=row["completed"],
+        failed=row["failed"],
+        pending=row["total"] - done,
+        created_at=row["created_at"],
+        started_at=row["started_at"],
+        finished_at=row["finished_at"],
+        audio_seconds=row["audio_seconds"],
+        items_per_second=done / elapsed if elapsed else None,
+        audio_seconds_per_second=row["audio_seconds"] / elapsed if elapsed else None,
+        real_time_factor=(
+            row["processing_seconds"] / row["audio_seconds"]
+            if row["audio_seconds"]
+            else None
+        ),
+    )
+
+
+def _item_result(
+    idx: int, source: str, status: str, result: Optional[str], error: Optional[str]
+) -> JobItemResult:
+    """Build a JobItemResult from stored columns"""
+    return JobItemResult(
+        index=idx,
+        source=source,
+        status=JobStatus(status),
+        result=ASRResponse.model_validate_json(result) if result else None,
+        error=error,
+    )
+
+
+class JobManager:
+    """Accepts bulk jobs and works through them in the background"""
+
+    def __init__(
+        self,
+        service: ASRService,
+        db_path: str,
+        concurrency: int = 8,
+        max_attempts: int = 3,
+        input_root: Optional[str] = None,
+    ):
+        """
+        Initialize the job manager
+
+        Args:
+            service: Service used to transcribe items
+            db_path: SQLite database file for the job queue
+            concurrency: Items transcribed at once; concurrent items are batched
+                together by the provider
+            max_attempts: Attempts per item before it is marked failed
+            input_root: Directory `paths` submissions must be under (path
+                submissions are rejected if None)
+        """
+        self.service = service
+        self.db_path = db_path
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.input_root = os.path.realpath(input_root) if input_root else None
+
+        # SQLite work is serialized on one thread, off the event loop
+        self._db_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="asr-jobs-db"
+        )
+        self.store: Optional[JobStore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._backoff_until = 0.0
+
+    async def _call(self, fn, *args):
+        """Run a JobStore method on the database thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, fn, *args)
+
+    async def start(self):
+        """Open the queue, recover interrupted items and start the worker"""
+        self.store = await self._call(JobStore, self.db_path)
+        recovered = await self._call(self.store.recover)
+        if recovered:
+            logger.info(f"Re-queued {recovered} interrupted job items")
+        self._wakeup = asyncio.Event()
+        self._changed = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker; unfinished items resume on the next start"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self.store is not None:
+            await self._call(self.store.close)
+            self.store = None
+        self._db_executor.shutdown(wait=True)
+
+    def resolve_path(self, path: str) -> str:
+        """
+        Resolve a submitted path inside the input root
+
+        Raises:
+            ValueError: If path submissions are disabled or the path escapes
+                the root or does not exist
+        """
+        if self.input_root is None:
+            raise ValueError("Path submissions are disabled (JOBS_INPUT_ROOT unset)")
+        return resolve_under_root(self.input_root, path)
+
+    async def submit(
+        self, job: JobRequest, uploads: Sequence[Tuple[str, bytes]] = ()
+    ) -> JobInfo:
+        """
+        Queue a job
+
+        Args:
+            job: Inline requests, input-root paths and settings for the paths
+            uploads: (file name, contents) of uploaded files, using the job settings
+
+        Returns:
+            The new job's state
+        """
+        if job.provider is not None and job.provider not in (
+            self.service.list_providers()
+        ):
+            raise ValueError(f"Provider '{job.provider}' not found")
+
+        shared = json.dumps(
+            {
+                "sample_rate": job.sample_rate,
+                "language": job.language,
+                "model_params": job.model_params,
+                "priority": Priority.BATCH.value,
+            }
+        )
+        items: List[NewItem] = []
+        for i, request in enumerate(job.requests):
+            params = request.model_dump(
+                mode="json", exclude={"audio", "path", "timeout"}
+            )
+            params["priority"] = Priority.BATCH.value
+            if request.path is not None:
+                # Read in place like job.paths; offset and length stay in params
+                path = self.resolve_path(request.path)
+                items.append((f"request[{i}]", json.dumps(params), None, path))
+                continue
+            audio = request.audio_buffer
+            if audio is None:
+                audio = await asyncio.get_running_loop().run_in_executor(
+                    None, base64.b64decode, request.audio
+                )
+            items.append((f"request[{i}]", json.dumps(params), bytes(audio), None))
+        for path in job.paths:
+            items.append((path, shared, None, self.resolve_path(path)))
+        for name, contents in uploads:
+            items.append((name, shared, contents, None))
+        if not items:
+            raise ValueError("Job has no items")
+
+        job_id = await self._call(self.store.create_job, job.provider, items)
+        self._wakeup.set()
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[JobInfo]:
+        """Job state and throughput, or None if unknown"""
+        row = await self._call(self.store.job, job_id)
+        return _job_info(row) if row is not None else None
+
+    async def list(self, limit: int = 50) -> List[JobInfo]:
+        """Most recent jobs"""
+        jobs = []
+        for job_id in await self._call(self.store.job_ids, limit):
+            info = await self.get(job_id)
+            if info is not None:
+                jobs.append(info)
+        return jobs
+
+    async def results(
+        self, job_id: str, offset: int = 0, limit: int = 100
+    ) -> List[JobItemResult]:
+        """Items of a job in submission order, with results where finished"""
+        rows = await self._call(self.store.items, job_id, offset, limit)
+        return [_item_result(*row) for row in rows]
+
+    async def stream(self, job_id: str) -> AsyncIterator[JobItemResult]:
+        """Yield items as they finish until the job is done"""
+        last_seq = 0
+        while True:
+            changed = self._changed
+            rows = await self._call(self.store.finished_items, job_id, last_seq)
+            for seq, *row in rows:
+                last_seq = seq
+                yield _item_result(*row)
+            if not rows:
+                info = await self.get(job_id)
+                if info is None or info.status not in (
+                    JobStatus.PENDING,
+                    JobStatus.RUNNING,
+                ):
+                    return
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a job's pending items; returns False if the job is unknown"""
+        found = await self._call(self.store.cancel, job_id)
+        self._notify()
+        return found
+
+    def _notify(self):
+        """Wake up result streams"""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _run(self):
+        """Claim pending items and transcribe them until cancelled"""
+        active: set = set()
+        try:
+            while True:
+                free = self.concurrency - len(active)
+                backoff = self._backoff_until - time.monotonic()
+                if free > 0 and backoff <= 0:
+                    for item in await self._call(self.store.claim, free):
+                        active.add(asyncio.create_task(self._process(item)))
+
+                self._wakeup.clear()
+                wakeup = asyncio.create_task(self._wakeup.wait())
+                timeout = max(backoff, 0.05) if backoff > 0 else 1.0
+                done, _ = await asyncio.wait(
+                    active | {wakeup},
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                wakeup.cancel()
+                active -= done
+        finally:
+            for task in active:
+                task.cancel()
+            await asyncio.gather(*active, return_exceptions=True)
+
+    async def _process(self, item: ClaimedItem):
+        """Transcribe one claimed item and record the outcome"""
+        job_id, idx, provider, params, audio, path, attempts = item
+        try:
+            params = json.loads(params)
+            if path is not None:
+                offset, length = params.pop("offset", 0), params.pop("length", None)
+                audio = await asyncio.get_running_loop().run_in_executor(
+                    None, map_audio_file, path, offset, length
+                )
+                if not audio:
+                    raise ValueError(f"No audio in the requested range of {path}")
+            request = ASRRequest.from_bytes(audio, **params)
+            started = time.perf_counter()
+            response = await self.service.transcribe(request, provider)
+            elapsed = time.perf_counter() - started
+            await self._call(
+                self.store.complete,
+                job_id,
+                idx,
+                response.model_dump_json(),
+                response.duration,
+                elapsed,
+            )
+        except (QueueFullError, OverloadedError) as e:
+            # The service is saturated; put the item back and slow down
+            await self._call(self.store.release, job_id, idx)
+            self._backoff_until = time.monotonic() + (e.retry_after or 1.0)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Bad input won't get better with retries
+            retry = attempts < self.max_attempts and not isinstance(e, ValueError)
+            logger.error(f"Job {job_id} item {idx} failed: {str(e)}")
+            await self._call(self.store.fail, job_id, idx, str(e), retry)
+        self._notify()
@@ -0,0 +1,234 @@
+"""Inference lanes: a fixed number of model-running threads with core budgets
+
+Running several pipeline calls at once lets each torch op spread over every
+core, so concurrent calls oversubscribe the CPU and throughput drops as
+concurrency rises. LaneExecutor runs at most `lanes` calls at once, each
+with `threads_per_lane` torch threads and, optionally, pinned to its own set
+of cores. Work waits in one queue and goes to whichever lane is free.
+"""
+
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, List, Optional
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LANE_BUSY_SECONDS = registry.counter(
+    "ole_asr_inference_lane_busy_seconds_total",
+    "Time each inference lane spent running work",
+    ("provider", "lane"),
+)
+LANE_BUSY = registry.gauge(
+    "ole_asr_inference_lane_busy",
+    "Whether each inference lane is running work",
+    ("provider", "lane"),
+)
+
+
+def available_cpus() -> List[int]:
+    """CPUs this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class _Lane:
+    """One worker thread and its accounting"""
+
+    __slots__ = (
+        "index",
+        "cpus",
+        "thread",
+        "tasks",
+        "busy_seconds",
+        "busy_since",
+        "torch_configured",
+        "__weakref__",
+    )
+
+    def __init__(self, index: int, cpus: Optional[List[int]]):
+        self.index = index
+        self.cpus = cpus
+        self.thread: Optional[threading.Thread] = None
+        self.tasks = 0
+        self.busy_seconds = 0.0
+        self.busy_since: Optional[float] = None
+        self.torch_configured = False
+
+    def busy(self) -> float:
+        """1 while the lane runs a task, else 0"""
+        return float(self.busy_since is not None)
+
+
+class LaneExecutor(Executor):
+    """Executor with a fixed number of lanes, each with its own core budget"""
+
+    def __init__(
+        self,
+        lanes: int = 1,
+        threads_per_lane: Optional[int] = None,
+        pin: bool = False,
+        name: str = "asr-inference",
+    ):
+        """
+        Initialize the lanes
+
+        Args:
+            lanes: Calls run at once
+            threads_per_lane: torch intra-op threads of each lane; if None, the
+                available CPUs divided between the lanes (torch's own default
+                with a single lane)
+            pin: Bind each lane, and the threads torch starts from it, to a
+                separate set of CPUs (Linux only)
+            name: Provider name used in thread names and metric labels
+        """
+        if lanes < 1:
+            raise ValueError("At least one inference lane is required")
+        cpus = available_cpus()
+        if threads_per_lane is None and lanes > 1:
+            threads_per_lane = max(1, len(cpus) // lanes)
+        self.threads_per_lane = threads_per_lane
+        self.name = name
+
+        partitions: List[Optional[List[int]]] = [None] * lanes
+        if pin:
+            per_lane = threads_per_lane or max(1, len(cpus) // lanes)
+            if not hasattr(os, "sched_setaffinity"):
+                logger.warning("CPU affinity is not supported here; lanes not pinned")
+            elif per_lane * lanes > len(cpus):
+                logger.warning(
+                    f"{lanes} lanes of {per_lane} threads need more than the "
+                    f"{len(cpus)} available CPUs; lanes not pinned"
+                )
+            else:
+                partitions = [
+                    cpus[i * per_lane : (i + 1) * per_lane] for i in range(lanes)
+                ]
+
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._lanes = [_Lane(i, partitions[i]) for i in range(lanes)]
+        self._shutdown = False
+        self._shutdown_lock = threading.Lock()
+        self._started = time.monotonic()
+        for lane in self._lanes:
+            labels = {"provider": name, "lane": str(lane.index)}
+            LANE_BUSY_SECONDS.labels(**labels)
+            LANE_BUSY.labels(**labels).set_function(lane.busy)
+            lane.thread = threading.Thread(
+                target=self._work,
+                args=(lane,),
+                name=f"{name}-lane-{lane.index}",
+                daemon=True,
+            )
+            lane.thread.start()
+
+    @property
+    def _work_queue(self) -> "queue.SimpleQueue[Any]":
+        """Pending work, named like ThreadPoolExecutor's for queue-depth metrics"""
+        return self._queue
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        """Queue a call for the next free lane"""
+        with self._shutdown_lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future: Future = Future()
+            self._queue.put((future, fn, args, kwargs))
+            return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        """Stop the lanes once queued work is done (or cancelled)"""
+        with self._shutdown_lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not None:
+                        item[0].cancel()
+            for _ in self._lanes:
+                self._queue.put(None)
+        if wait:
+            for lane in self._lanes:
+                lane.thread.join()
+
+    def _configure(self, lane: _Lane):
+        """Apply the lane's thread budget once torch is loaded"""
+        torch = sys.modules.get("torch")
+        if torch is None:
+            return
+        if self.threads_per_lane:
+            torch.set_num_threads(self.threads_per_lane)
+        lane.torch_configured = True
+
+    def _work(self, lane: _Lane):
+        """Lane thread: run queued calls until shutdown"""
+        if lane.cpus is not None:
+            # Threads torch starts from this one inherit the affinity
+            os.sched_setaffinity(0, lane.cpus)
+        busy_seconds = LANE_BUSY_SECONDS.labels(
+            provider=self.name, lane=str(lane.index)
+        )
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            if not lane.torch_configured:
+                self._configure(lane)
+
+            lane.busy_since = time.perf_counter()
+            result = error = None
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                error = e
+            # Account before resolving, so callers see their call in stats()
+            elapsed = time.perf_counter() - lane.busy_since
+            lane.busy_since = None
+            lane.tasks += 1
+            lane.busy_seconds += elapsed
+            busy_seconds.inc(elapsed)
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+            # Drop references to the call's arguments and result
+            del item, future, fn, args, kwargs, result, error
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the lane layout and per-lane utilization"""
+        now = time.perf_counter()
+        elapsed = time.monotonic() - self._started
+        lanes = []
+        for lane in self._lanes:
+            busy_since = lane.busy_since
+            busy = lane.busy_seconds + (now - busy_since if busy_since else 0.0)
+            lanes.append(
+                {
+                    "lane": lane.index,
+                    "cpus": lane.cpus,
+                    "busy": busy_since is not None,
+                    "tasks": lane.tasks,
+                    "busy_seconds": busy,
+                    "utilization": busy / elapsed if elapsed else 0.0,
+                }
+            )
+        return {
+            "lanes": len(self._lanes),
+            "threads_per_lane": self.threads_per_lane,
+            "queue_depth": self._queue.qsize(),
+            "per_lane": lanes,
+        }
@@ -0,0 +1,342 @@
+"""Lightweight metrics primitives for the ASR service
+
+Metrics are plain in-process objects; observing a value is a bisect and a lock
+acquisition, so instrumentation can stay on under load. The registry renders
+everything in the Prometheus text exposition format for `GET /metrics`.
+"""
+
+import bisect
+import inspect
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class Counter:
+    """Monotonically increasing value"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        """Increase the counter"""
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down, or be computed at scrape time"""
+
+    def __init__(self):
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        """Set the gauge to a value"""
+        self._value = value
+
+    def inc(self, amount: float = 1.0):
+        """Increase the gauge"""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        """Decrease the gauge"""
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, function: Callable[[], float]):
+        """Compute the value by calling `function` whenever it is read
+
+        A bound method is held weakly, so the gauge doesn't keep e.g. an
+        evicted provider (and its model) alive; it then reads 0.
+        """
+        if inspect.ismethod(function):
+            method = weakref.WeakMethod(function)
+
+            def function() -> float:
+                bound = method()
+                return bound() if bound is not None else 0.0
+
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        """Current value"""
+        if self._function is not None:
+            return float(self._function())
+        return self._value
+
+
+class Histogram:
+    """Thread-safe histogram with fixed bucket upper bounds"""
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Initialize the histogram
+
+        Args:
+            buckets: Upper bounds of the finite buckets (an implicit +Inf is added)
+        """
+        self.buckets = sorted(float(b) for b in buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record a single observation"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return a point-in-time copy of the histogram
+
+        Returns:
+            Dictionary with count, sum, mean and cumulative bucket counts
+        """
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+            total = self.sum
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[f"{bound:g}"] = running
+        cumulative["+Inf"] = count
+
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "buckets": cumulative,
+        }
+
+
+class MetricFamily:
+    """A named metric with one child per combination of label values"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: str,
+        labelnames: Sequence[str],
+        factory: Callable[[], Any],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        """Label values in declaration order"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def labels(self, **labels: Any):
+        """Return the child for the given label values, creating it if needed"""
+        key = self._key(labels)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def attach(self, child: Any, **labels: Any):
+        """Export an existing metric object under the given label values"""
+        with self._lock:
+            self._children[self._key(labels)] = child
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        """Yield (sample name, labels, value) for every child"""
+        with self._lock:
+            children = list(self._children.items())
+
+        for key, child in children:
+            labels = dict(zip(self.labelnames, key))
+            if self.metric_type == "histogram":
+                snapshot = child.snapshot()
+                for bound, count in snapshot["buckets"].items():
+                    yield f"{self.name}_bucket", {**labels, "le": bound}, count
+                yield f"{self.name}_sum", labels, snapshot["sum"]
+                yield f"{self.name}_count", labels, snapshot["count"]
+            else:
+                yield self.name, labels, child.value
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Render labels as {name="value",...}"""
+    if not labels:
+        return ""
+    pairs = (
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together"""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        """Add a family, returning the existing one if already registered"""
+        with self._lock:
+            return self._families.setdefault(family.name, family)
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> MetricFamily:
+        """Register a counter family"""
+        return self._register(
+            MetricFamily(name, documentation, "counter", labelnames, Counter)
+        )
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> MetricFamily:
+        """Register a gauge family"""
+        return self._register(
+            MetricFamily(name, documentation, "gauge", labelnames, Gauge)
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = (),
+    ) -> MetricFamily:
+        """Register a histogram family"""
+        return self._register(
+            MetricFamily(
+                name,
+                documentation,
+                "histogram",
+                labelnames,
+                lambda: Histogram(buckets),
+            )
+        )
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            families = list(self._families.values())
+
+        lines: List[str] = []
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.documentation}")
+            lines.append(f"# TYPE {family.name} {family.metric_type}")
+            for sample_name, labels, value in family.samples():
+                lines.append(f"{sample_name}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry exposed on /metrics
+registry = MetricsRegistry()
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+    30.0, 60.0,
+)  # fmt: skip
+RTF_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+STAGE_SECONDS = registry.histogram(
+    "ole_asr_stage_duration_seconds",
+    "Time spent in each processing stage",
+    ("provider", "stage"),
+    LATENCY_BUCKETS,
+)
+REQUESTS_TOTAL = registry.counter(
+    "ole_asr_transcriptions_total",
+    "Transcription requests by provider and outcome",
+    ("provider", "status"),
+)
+REQUESTS_IN_FLIGHT = registry.gauge(
+    "ole_asr_transcriptions_in_flight",
+    "Transcription requests currently being processed",
+    ("provider",),
+)
+AUDIO_SECONDS = registry.counter(
+    "ole_asr_audio_seconds_total",
+    "Seconds of audio transcribed",
+    ("provider",),
+)
+REAL_TIME_FACTOR = registry.histogram(
+    "ole_asr_real_time_factor",
+    "Processing time divided by audio duration per request",
+    ("provider",),
+    RTF_BUCKETS,
+)
+EXECUTOR_QUEUE_DEPTH = registry.gauge(
+    "ole_asr_executor_queue_depth",
+    "Work items waiting for a thread in each executor",
+    ("provider", "executor"),
+)
+
+# Provider label for stage timings recorded in shared helpers such as utils
+current_provider: ContextVar[str] = ContextVar("current_provider", default="")
+
+
+@contextmanager
+def track_stage(stage: str, provider: Optional[str] = None):
+    """
+    Time the enclosed block as a processing stage
+
+    Args:
+        stage: Stage name (e.g. "decode", "resample")
+        provider: Provider label; defaults to the current provider context
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(
+            provider=provider if provider is not None else current_provider.get(),
+            stage=stage,
+        ).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def provider_context(provider: str):
+    """Attribute stage timings in the enclosed block to `provider`"""
+    token = current_provider.set(provider)
+    try:
+        yield
+    finally:
+        current_provider.reset(token)
+
+
+def executor_queue_depth(executor) -> float:
+    """Pending work items of a ThreadPoolExecutor (0 for None)"""
+    work_queue = getattr(executor, "_work_queue", None)
+    return work_queue.qsize() if work_queue is not None else 0
@@ -0,0 +1,420 @@
+"""Lazily loaded ASR models kept within a memory budget
+
+Models are registered with a factory and loaded on first use; concurrent
+requests for a model that is loading wait for the same load. When the resident
+models exceed the memory budget, the least recently used ones that are neither
+pinned nor serving a request are unloaded.
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+MODEL_OPERATION_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+MODEL_LOAD_SECONDS = registry.histogram(
+    "ole_asr_model_load_seconds",
+    "Time to load a model",
+    ("model",),
+    MODEL_OPERATION_BUCKETS,
+)
+MODEL_UNLOAD_SECONDS = registry.histogram(
+    "ole_asr_model_unload_seconds",
+    "Time to unload a model",
+    ("model",),
+    MODEL_OPERATION_BUCKETS,
+)
+MODEL_RESIDENT_BYTES = registry.gauge(
+    "ole_asr_model_resident_bytes", "Memory attributed to a loaded model", ("model",)
+)
+MODEL_EVICTIONS = registry.counter(
+    "ole_asr_model_evictions_total",
+    "Models unloaded to stay within the memory budget",
+    ("model",),
+)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where /proc is available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _Model:
+    """Registration and residency state of one model"""
+
+    __slots__ = (
+        "name",
+        "factory",
+        "pinned",
+        "memory_estimate",
+        "provider",
+        "memory_bytes",
+        "loading",
+        "in_use",
+        "last_used",
+        "loads",
+        "unloads",
+        "last_load_seconds",
+        "total_load_seconds",
+        "last_unload_seconds",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        pinned: bool,
+        memory_estimate: Optional[int],
+    ):
+        self.name = name
+        self.factory = factory
+        self.pinned = pinned
+        self.memory_estimate = memory_estimate
+        self.provider: Any = None
+        self.memory_bytes = 0
+        self.loading: Optional[asyncio.Task] = None
+        self.in_use = 0
+        self.last_used = 0.0
+        self.loads = 0
+        self.unloads = 0
+        self.last_load_seconds: Optional[float] = None
+        self.total_load_seconds = 0.0
+        self.last_unload_seconds: Optional[float] = None
+
+    def expected_bytes(self) -> int:
+        """Memory the model is expected to take when loaded"""
+        if self.memory_estimate is not None:
+            return self.memory_estimate
+        return self.memory_bytes
+
+
+class ModelManager:
+    """Loads providers on demand and unloads least recently used ones"""
+
+    def __init__(self, memory_budget_bytes: Optional[int] = None):
+        """
+        Initialize the model manager
+
+        Args:
+            memory_budget_bytes: Memory resident models may take in total
+                (unlimited if None)
+        """
+        self.memory_budget_bytes = memory_budget_bytes
+        self._models: Dict[str, _Model] = {}
+        # Resident model names, least recently used first
+        self._resident: "OrderedDict[str, None]" = OrderedDict()
+        # Loads run one at a time so memory is measured per model
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._rebalancing: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        memory_bytes: Optional[int] = None,
+        pinned: bool = False,
+    ):
+        """
+        Register a model without loading it
+
+        Args:
+            name: Provider name requests refer to
+            factory: Builds the (uninitialized) provider
+            memory_bytes: Memory the model takes; if None it is taken from the
+                provider's memory_bytes() or the process RSS growth during load
+            pinned: Load at preload() and never evict
+        """
+        self._models[name] = _Model(name, factory, pinned, memory_bytes)
+        MODEL_RESIDENT_BYTES.labels(model=name).set_function(
+            lambda model=self._models[name]: (
+                model.memory_bytes if model.provider is not None else 0
+            )
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._models
+
+    def names(self) -> List[str]:
+        """Registered model names"""
+        return list(self._models)
+
+    def resident(self) -> Dict[str, Any]:
+        """Loaded providers by name"""
+        return {name: self._models[name].provider for name in self._resident}
+
+    def ready(self) -> bool:
+        """Whether every pinned model is loaded"""
+        return all(
+            model.provider is not None
+            for model in self._models.values()
+            if model.pinned
+        )
+
+    @property
+    def resident_bytes(self) -> int:
+        """Memory attributed to loaded models"""
+        return sum(self._models[name].memory_bytes for name in self._resident)
+
+    def _get(self, name: str) -> _Model:
+        """Registered model by name"""
+        if name not in self._models:
+            raise ValueError(f"Model '{name}' not found. Available: {self.names()}")
+        return self._models[name]
+
+    async def load(self, name: str) -> Any:
+        """
+        Return the provider for a model, loading it if needed
+
+        Raises:
+            ValueError: If the model is not registered
+        """
+        model = self._get(name)
+        if model.provider is not None:
+            self.hits += 1
+            self._resident.move_to_end(name)
+            return model.provider
+
+        if model.loading is None:
+            self.misses += 1
+            model.loading = asyncio.create_task(self._load(model))
+        else:
+            self.coalesced += 1
+        # Shielded so one caller giving up doesn't cancel the shared load
+        return await asyncio.shield(model.loading)
+
+    async def _load(self, model: _Model) -> Any:
+        """Make room, then build and initialize the provider"""
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        try:
+            async with self._load_lock:
+                await self._evict(model.expected_bytes(), keep=model.name)
+
+                started = time.perf_counter()
+                rss_before = _rss_bytes()
+                provider = model.factory()
+                try:
+                    if hasattr(provider, "initialize"):
+                        await provider.initialize()
+                except BaseException:
+                    close = getattr(provider, "close", None)
+                    if callable(close):
+                        await close()
+                    raise
+                elapsed = time.perf_counter() - started
+
+                measured = getattr(provider, "memory_bytes", None)
+                memory_bytes = measured() if callable(measured) else None
+                if memory_bytes is None:
+                    memory_bytes = model.memory_estimate
+                if memory_bytes is None:
+                    rss_after = _rss_bytes()
+                    if rss_before is not None and rss_after is not None:
+                        memory_bytes = max(rss_after - rss_before, 0)
+
+                model.provider = provider
+                model.memory_bytes = memory_bytes or 0
+                model.loads += 1
+                model.last_load_seconds = elapsed
+                model.total_load_seconds += elapsed
+                model.last_used = time.monotonic()
+                self._resident[model.name] = None
+                MODEL_LOAD_SECONDS.labels(model=model.name).observe(elapsed)
+                logger.info(
+                    f"Loaded model {model.name} in {elapsed:.2f}s "
+                    f"({model.memory_bytes / 2**20:.0f} MiB)"
+                )
+
+                # The estimate may have been low
+                await self._evict(0, keep=model.name)
+                return provider
+        finally:
+            model.loading = None
+
+    async def _evict(self, needed: int, keep: Optional[str] = None):
+        """Unload LRU models until `needed` more bytes fit in the budget"""
+        if self.memory_budget_bytes is None:
+            return
+        for name in list(self._resident):
+            if self.resident_bytes + needed <= self.memory_budget_bytes:
+                return
+            model = self._models[name]
+            if name == keep or model.pinned or model.in_use:
+                continue
+            self.evictions += 1
+            MODEL_EVICTIONS.labels(model=name).inc()
+            await self._unload(model)
+
+        total = self.resident_bytes + needed
+        if total > self.memory_budget_bytes:
+            # Models in use or pinned can't go; run over budget rather than fail,
+            # and evict again once they are released
+            logger.warning(
+                f"Models need {total / 2**20:.0f} MiB, over the memory budget "
+                f"({self.memory_budget_bytes / 2**20:.0f} MiB)"
+            )
+
+    def _over_budget(self) -> bool:
+        """Whether resident models exceed the budget"""
+        return (
+            self.memory_budget_bytes is not None
+            and self.resident_bytes > self.memory_budget_bytes
+        )
+
+    async def _rebalance(self):
+        """Evict models left over budget while they were in use"""
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        try:
+            async with self._load_lock:
+                await self._evict(0)
+        finally:
+            self._rebalancing = None
+
+    async def _unload(self, model: _Model):
+        """Close a loaded provider and drop it"""
+        provider = model.provider
+        model.provider = None
+        del self._resident[model.name]
+
+        started = time.perf_counter()
+        close = getattr(provider, "close", None)
+        if callable(close):
+            await close()
+        del provider
+        gc.collect()
+        elapsed = time.perf_counter() - started
+
+        model.unloads += 1
+        model.last_unload_seconds = elapsed
+        MODEL_UNLOAD_SECONDS.labels(model=model.name).observe(elapsed)
+        logger.info(f"Unloaded model {model.name} in {elapsed:.2f}s")
+
+    async def unload(self, name: str) -> bool:
+        """
+        Unload a model now
+
+        Returns:
+            False if it was not loaded or is serving requests
+        """
+        model = self._get(name)
+        if model.provider is None or model.in_use:
+            return False
+        await self._unload(model)
+        return True
+
+    async def acquire(self, name: str) -> Any:
+        """Load a model and keep it resident until release()"""
+        model = self._get(name)
+        model.in_use += 1
+        try:
+            return await self.load(name)
+        except BaseException:
+            model.in_use -= 1
+            raise
+
+    def acquire_loaded(self, name: str) -> Optional[Any]:
+        """
+        Like acquire, but only for a model already in memory; never loads it
+
+        Leaves the LRU order alone, so background work (e.g. the health
+        canary) doesn't keep a model resident.
+
+        Returns:
+            The provider, to be given back with release(), or None if the
+            model isn't loaded
+        """
+        model = self._get(name)
+        if model.provider is None:
+            return None
+        model.in_use += 1
+        return model.provider
+
+    def release(self, name: str):
+        """Let an acquired model be evicted again"""
+        model = self._models[name]
+        model.in_use -= 1
+        model.last_used = time.monotonic()
+        if model.in_use == 0 and self._over_budget() and self._rebalancing is None:
+            self._rebalancing = asyncio.get_running_loop().create_task(
+                self._rebalance()
+            )
+
+    @asynccontextmanager
+    async def use(self, name: str):
+        """Hold a loaded model's provider for the enclosed block"""
+        provider = await self.acquire(name)
+        try:
+            yield provider
+        finally:
+            self.release(name)
+
+    async def preload(self):
+        """Load the pinned models; failures are logged, not raised"""
+        for model in self._models.values():
+            if not model.pinned:
+                continue
+            try:
+                await self.load(model.name)
+            except ImportError as e:
+                logger.warning(
+                    f"Could not load model {model.name}: {e}. "
+                    "This may be due to missing dependencies."
+                )
+            except Exception as e:
+                logger.error(f"Failed to load model {model.name}: {e}")
+
+    async def close(self):
+        """Unload every model"""
+        for name in list(self._resident):
+            await self._unload(self._models[name])
+
+    def stats(self) -> Dict[str, Any]:
+        """Report residency, load/unload timings and counters"""
+        now = time.monotonic()
+        return {
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "resident_bytes": self.resident_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "models": {
+                name: {
+                    "state": (
+                        "loaded"
+                        if model.provider is not None
+                        else "loading" if model.loading is not None else "unloaded"
+                    ),
+                    "pinned": model.pinned,
+                    "memory_bytes": model.memory_bytes,
+                    "in_use": model.in_use,
+                    "idle_seconds": (
+                        now - model.last_used if model.provider is not None else None
+                    ),
+                    "loads": model.loads,
+                    "unloads": model.unloads,
+                    "last_load_seconds": model.last_load_seconds,
+                    "total_load_seconds": model.total_load_seconds,
+                    "last_unload_seconds": model.last_unload_seconds,
+                }
+                for name, model in self._models.items()
+            },
+        }
@@ -1,7 +1,7 @@
 """ASR Data Models"""
 
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import List, Optional, Dict, Any, Union
 from enum import Enum
 
 
@@ -16,14 +16,64 @@ class AudioFormat(str, Enum):
     OGG = "ogg"
 
 
+class Priority(str, Enum):
+    """Admission priority classes"""
+
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
+class StreamFormat(str, Enum):
+    """Encodings for segments streamed as they are transcribed"""
+
+    NDJSON = "ndjson"
+    SSE = "sse"
+
+
 class ASRRequest(BaseModel):
     """ASR Request Model"""
 
-    audio: str  # Base64 encoded audio data
+    audio: str = ""  # Base64 encoded audio data (unless `path` is given)
+    # File under the server's audio input root, read in place instead of `audio`
+    path: Optional[str] = None
+    offset: int = Field(default=0, ge=0)  # Byte range of `path` holding the audio
+    length: Optional[int] = Field(default=None, gt=0)
+    # Part of the audio to transcribe, in seconds; segment times are relative
+    # to start_time
+    start_time: Optional[float] = Field(default=None, ge=0)
+    end_time: Optional[float] = Field(default=None, gt=0)
     sample_rate: int = 16000  # Audio sample rate in Hz
     language: str = "auto"  # Language code (e.g., 'en', 'zh', 'auto')
     format: AudioFormat = AudioFormat.WAV  # Audio format
     model_params: Optional[Dict[str, Any]] = None  # Model-specific parameters
+    priority: Priority = Priority.INTERACTIVE  # Admission priority class
+    timeout: Optional[float] = None  # Seconds the client waits; later it's dropped
+
+    # Raw audio bytes for binary uploads; takes precedence over `audio`
+    _audio_buffer: Optional[memoryview] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_bytes(
+        cls, audio_bytes: Union[bytes, bytearray, memoryview], **kwargs: Any
+    ) -> "ASRRequest":
+        """Build a request around raw audio bytes without base64 encoding them"""
+        request = cls(audio="", **kwargs)
+        request._audio_buffer = memoryview(audio_bytes)
+        return request
+
+    @property
+    def audio_buffer(self) -> Optional[memoryview]:
+        """Raw audio bytes when the request came from a binary upload"""
+        return self._audio_buffer
+
+
+class ASRWord(BaseModel):
+    """A word (or CJK character) with its timing in the audio"""
+
+    word: str
+    start_time: float  # Start time in seconds
+    end_time: float  # End time in seconds
+    confidence: Optional[float] = None  # Token probability, where available
 
 
 class ASRSegment(BaseModel):
@@ -33,6 +83,10 @@ class ASRSegment(BaseModel):
     end_time: float  # End time in seconds
     text: str  # Transcribed text
     confidence: Optional[float] = None  # Confidence score
+    # Word timings, when requested with model_params={"word_timestamps": true}
+    words: Optional[List[ASRWord]] = None
+    # Source channel, when requested with model_params={"split_channels": true}
+    channel: Optional[int] = None
 
 
 class ASRResponse(BaseModel):
@@ -44,3 +98,54 @@ class ASRResponse(BaseModel):
     model: str  # Model identifier
     language: Optional[str] = None  # Detected/used language
     sample_rate: Optional[int] = None  # Sample rate used for processing
+
+
+class JobStatus(str, Enum):
+    """State of a bulk transcription job or one of its items"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobRequest(BaseModel):
+    """Bulk transcription job submission"""
+
+    requests: List[ASRRequest] = []  # Inline audio, one request per item
+    paths: List[str] = []  # Files under the server's job input root
+    provider: Optional[str] = None  # Provider name (default if None)
+    # Settings applied to `paths` items and uploaded files
+    sample_rate: int = 16000
+    language: str = "auto"
+    model_params: Optional[Dict[str, Any]] = None
+
+
+class JobInfo(BaseModel):
+    """Bulk transcription job state and throughput"""
+
+    id: str
+    status: JobStatus
+    provider: Optional[str] = None
+    total: int
+    completed: int
+    failed: int
+    pending: int
+    created_at: float  # Unix timestamps
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    audio_seconds: float  # Audio transcribed so far
+    items_per_second: Optional[float] = None
+    audio_seconds_per_second: Optional[float] = None
+    real_time_factor: Optional[float] = None  # Mean processing time / audio time
+
+
+class JobItemResult(BaseModel):
+    """Outcome of one item of a bulk transcription job"""
+
+    index: int
+    source: str  # File name, path, or "request[i]"
+    status: JobStatus
+    result: Optional[ASRResponse] = None
+    error: Optional[str] = None
@@ -0,0 +1,246 @@
+"""Offline batch transcription of files on disk
+
+Files are decoded, resampled and split into chunks in a process pool, a bounded
+number of files ahead of inference, and the decoded audio is handed straight
+to ASRService. Results are appended to a JSONL file as they finish; files
+already transcribed there are skipped when a run is resumed.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, Optional, Set, Tuple
+from .models import ASRRequest
+from .services import ASRService
+from .utils import AudioBuffer, map_audio_file
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = {".wav", ".flac", ".ogg", ".mp3", ".m4a", ".aac"}
+
+
+def iter_inputs(source: str) -> Iterator[str]:
+    """
+    Audio files of a directory (recursively, in sorted order) or a manifest
+
+    A manifest is a text file with one path per line, or JSONL lines with a
+    "path" field; relative paths are taken relative to the manifest.
+
+    Args:
+        source: Directory or manifest file
+
+    Returns:
+        Iterator over file paths
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in AUDIO_EXTENSIONS:
+                    yield os.path.join(root, name)
+        return
+
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = json.loads(line)["path"] if line.startswith("{") else line
+            yield os.path.join(base, path)
+
+
+def load_completed(output_path: str) -> Set[str]:
+    """Paths with a successful result in an existing JSONL output"""
+    completed: Set[str] = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Line cut short by an interrupted run
+            if "error" not in record:
+                completed.add(record["path"])
+    return completed
+
+
+def prepare_file(
+    path: str, sample_rate: int, max_chunk_seconds: float, use_vad: bool
+) -> AudioBuffer:
+    """
+    Decode, resample and chunk one file (runs in a worker process)
+
+    Returns:
+        Audio with its chunks for ASRService.transcribe
+    """
+    audio = AudioBuffer.decode(map_audio_file(path), sample_rate)
+    audio.split(max_chunk_seconds, use_vad)
+    return audio
+
+
+class BatchRun:
+    """Transcribes a list of files into a JSONL output"""
+
+    def __init__(
+        self,
+        service: ASRService,
+        output_path: str,
+        provider_name: Optional[str] = None,
+        sample_rate: int = 16000,
+        language: str = "auto",
+        max_chunk_seconds: float = 30.0,
+        use_vad: bool = True,
+        decode_workers: int = 4,
+        prefetch: int = 16,
+        concurrency: int = 8,
+    ):
+        """
+        Initialize the run
+
+        Args:
+            service: Service with the provider registered
+            output_path: JSONL file results are appended to
+            provider_name: Provider to use (default provider if None)
+            sample_rate: Sample rate the provider expects
+            language: Language code
+            max_chunk_seconds: Maximum chunk duration in seconds
+            use_vad: Split on voice activity
+            decode_workers: Decoding processes
+            prefetch: Files decoded ahead of inference
+            concurrency: Files transcribed at once; their chunks are batched
+                together by the provider
+        """
+        self.service = service
+        self.output_path = output_path
+        self.provider_name = provider_name
+        self.sample_rate = sample_rate
+        self.language = language
+        self.max_chunk_seconds = max_chunk_seconds
+        self.use_vad = use_vad
+        self.decode_workers = decode_workers
+        self.prefetch = prefetch
+        self.concurrency = concurrency
+
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.audio_seconds = 0.0
+        self.started: Optional[float] = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts and throughput of the run so far"""
+        wall_seconds = time.perf_counter() - self.started if self.started else 0.0
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "audio_hours": self.audio_seconds / 3600,
+            "wall_seconds": wall_seconds,
+            "audio_hours_per_hour": (
+                self.audio_seconds / wall_seconds if wall_seconds else 0.0
+            ),
+        }
+
+    async def run(self, paths: Iterator[str]) -> Dict[str, Any]:
+        """
+        Transcribe every path not already in the output
+
+        Args:
+            paths: Input files
+
+        Returns:
+            The run summary
+        """
+        self.started = time.perf_counter()
+        done = load_completed(self.output_path)
+
+        # Don't append to a line an interrupted run left unfinished
+        if os.path.exists(self.output_path) and os.path.getsize(self.output_path):
+            with open(self.output_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        else:
+            needs_newline = False
+
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks: Set[asyncio.Task] = set()
+        decoding: Deque[Tuple[str, asyncio.Future]] = deque()
+
+        # Spawn rather than fork so workers don't inherit torch/thread state
+        with ProcessPoolExecutor(
+            max_workers=self.decode_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool, open(self.output_path, "a") as output:
+            if needs_newline:
+                output.write("\n")
+
+            async def dispatch():
+                """Hand the oldest decoded file to inference once a slot is free"""
+                path, decoded = decoding.popleft()
+                await slots.acquire()
+                task = asyncio.create_task(self._transcribe(path, decoded, output))
+                task.add_done_callback(lambda _: slots.release())
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            try:
+                for path in paths:
+                    if path in done:
+                        self.skipped += 1
+                        continue
+                    decoded = loop.run_in_executor(
+                        pool,
+                        prepare_file,
+                        path,
+                        self.sample_rate,
+                        self.max_chunk_seconds,
+                        self.use_vad,
+                    )
+                    decoding.append((path, decoded))
+                    if len(decoding) >= self.prefetch:
+                        await dispatch()
+                while decoding:
+                    await dispatch()
+                await asyncio.gather(*tasks)
+            finally:
+                for _, decoded in decoding:
+                    decoded.cancel()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return self.summary()
+
+    async def _transcribe(self, path: str, decoded: asyncio.Future, output):
+        """Transcribe one decoded file and append its record"""
+        try:
+            prepared = await decoded
+            request = ASRRequest(
+                audio="",
+                sample_rate=self.sample_rate,
+                language=self.language,
+                model_params={"vad": self.use_vad},
+            )
+            response = await self.service.transcribe(
+                request, self.provider_name, prepared=prepared
+            )
+            record = {"path": path, **response.model_dump()}
+            self.completed += 1
+            self.audio_seconds += response.duration
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to transcribe {path}: {str(e)}")
+            record = {"path": path, "error": str(e)}
+            self.failed += 1
+
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
@@ -0,0 +1,162 @@
+"""CPU inference provider backed by int8 torch or ONNX Runtime"""
+
+import logging
+import os
+import sys
+from typing import Any, List, Optional, Union
+import numpy as np
+from .qwen3_asr import Qwen3ASRProvider
+
+logger = logging.getLogger(__name__)
+
+CPU_BACKENDS = ("int8", "onnx")
+
+
+class OnnxPipeline:
+    """Adapts a funasr_onnx Paraformer to the ModelScope pipeline interface"""
+
+    def __init__(self, model: Any):
+        self.model = model
+        # The stock loader treats a list as file paths; inputs here are
+        # already decoded PCM
+        model.load_data = lambda wav_content, fs=None: (
+            wav_content if isinstance(wav_content, list) else [wav_content]
+        )
+
+    def __call__(
+        self, audio: Union[np.ndarray, List[np.ndarray]]
+    ) -> Union[dict, List[dict]]:
+        results = [
+            {"text": self._text(result), "timestamp": result.get("timestamp")}
+            for result in self.model(audio)
+        ]
+        return results if isinstance(audio, list) else results[0]
+
+    @staticmethod
+    def _text(result: dict) -> str:
+        """Text of one result; postprocessing may return (text, words)"""
+        preds = result.get("preds", "")
+        return preds[0] if isinstance(preds, tuple) else preds
+
+
+class CPUInferenceProvider(Qwen3ASRProvider):
+    """Qwen3 ASR provider tuned for CPU-only nodes
+
+    The "int8" backend loads the usual ModelScope pipeline on the CPU and
+    dynamically quantizes its linear layers to int8. The "onnx" backend runs a
+    Paraformer export with ONNX Runtime through funasr_onnx, exporting (and
+    quantizing) the model into its snapshot directory on first load.
+    """
+
+    name = "qwen3-asr-cpu"
+
+    def __init__(
+        self,
+        backend: str = "int8",
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+        onnx_model_dir: Optional[str] = None,
+        **kwargs,
+    ):
+        """
+        Initialize the CPU inference provider
+
+        Args:
+            backend: "int8" for dynamically quantized torch, "onnx" for ONNX
+                Runtime
+            intra_op_threads: Threads used within one operator, per inference
+                lane (threads_per_lane if None)
+            inter_op_threads: Threads running independent operators at once
+                (library default if None); only torch uses them, ONNX Runtime
+                sessions execute sequentially
+            onnx_model_dir: Directory of an existing ONNX export (exported from
+                the model snapshot if None)
+            **kwargs: Arguments for Qwen3ASRProvider
+        """
+        if kwargs.get("threads_per_lane") is None:
+            kwargs["threads_per_lane"] = intra_op_threads
+        super().__init__(**kwargs)
+        if backend not in CPU_BACKENDS:
+            raise ValueError(
+                f"Unknown CPU backend '{backend}'. Available: {list(CPU_BACKENDS)}"
+            )
+        self.backend = backend
+        self.intra_op_threads = self.inference_executor.threads_per_lane
+        self.inter_op_threads = inter_op_threads
+        self.onnx_model_dir = onnx_model_dir
+
+    def _device(self) -> str:
+        """Always the CPU, even where CUDA is available"""
+        return "cpu"
+
+    def _load_model(self):
+        """Load and quantize or export the model (runs in thread pool)"""
+        if self.backend == "onnx":
+            self._load_onnx()
+            return
+
+        import torch
+
+        self._set_torch_threads(torch)
+        super()._load_model()
+
+    def _optimize_model(self):
+        """Quantize the torch network's linear layers to int8"""
+        import torch
+
+        chain = [self.pipeline] + self._model_chain()
+        for parent, model in reversed(list(zip(chain, chain[1:]))):
+            if isinstance(model, torch.nn.Module):
+                parent.model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                return
+
+    def _set_torch_threads(self, torch: Any):
+        """Apply the inter-op setting to torch (lanes set intra-op threads)"""
+        if self.inter_op_threads:
+            try:
+                torch.set_num_interop_threads(self.inter_op_threads)
+            except RuntimeError as e:
+                # Only settable before torch's first parallel work
+                logger.warning(f"Could not set inter-op threads: {e}")
+
+    def _load_onnx(self):
+        """Load the quantized ONNX export with funasr_onnx"""
+        from funasr_onnx import Paraformer
+
+        model_dir = self.onnx_model_dir or self._resolve_model()
+        model = Paraformer(
+            model_dir,
+            batch_size=self.max_batch_size,
+            quantize=True,
+            intra_op_num_threads=self.intra_op_threads or os.cpu_count() or 4,
+            cache_dir=self.model_cache_dir,
+        )
+        self.pipeline = OnnxPipeline(model)
+
+    def memory_bytes(self) -> Optional[int]:
+        """Size of the quantized model's weights, if known"""
+        # ONNX Runtime's memory isn't visible here; the RSS growth is used
+        if self.backend == "onnx":
+            return None
+        # Packed int8 weights are in the state dict, not parameters()
+        torch = sys.modules.get("torch")
+        model = self._network()
+        if model is None:
+            return None
+        total = 0
+        for value in model.state_dict().values():
+            for tensor in value if isinstance(value, tuple) else (value,):
+                if isinstance(tensor, torch.Tensor):
+                    total += tensor.numel() * tensor.element_size()
+        return total
+
+    def stats(self) -> dict:
+        """Report provider statistics"""
+        return {
+            **super().stats(),
+            "backend": self.backend,
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+        }
@@ -0,0 +1,221 @@
+"""Provider that forwards requests to this service running on another node"""
+
+import asyncio
+import base64
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+from ..admission import (
+    AudioTooLongError,
+    DeadlineExceededError,
+    OverloadedError,
+    QueueFullError,
+)
+from ..models import ASRRequest, ASRResponse
+
+# Errors of a kept-alive connection the server closed between requests
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class HTTPBackendProvider:
+    """Sends requests to the /transcribe endpoints of a remote instance
+
+    Calls run in a small thread pool, each thread keeping one connection alive
+    to the backend. Raw uploads are forwarded as-is to /transcribe/raw, so the
+    audio isn't base64 encoded on the way, and requests for files on the shared
+    input root are forwarded by path. The backend's admission rejections
+    are raised as the same AdmissionError types, so a router can send the
+    request elsewhere.
+    """
+
+    # The backend runs its own admission control, so this node doesn't
+    remote = True
+
+    def __init__(
+        self,
+        base_url: str,
+        provider: Optional[str] = None,
+        timeout: float = 300.0,
+        health_timeout: float = 2.0,
+        max_connections: int = 8,
+    ):
+        """
+        Initialize the HTTP backend provider
+
+        Args:
+            base_url: URL of the remote service, e.g. "http://asr-2:8000"
+            provider: Provider to request on the backend (its default if None)
+            timeout: Socket timeout of requests without their own timeout
+            health_timeout: Socket timeout of health checks
+            max_connections: Requests sent to the backend at once
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Invalid backend URL '{base_url}'")
+        self.base_url = base_url.rstrip("/")
+        self.provider = provider
+        self.timeout = timeout
+        self.health_timeout = health_timeout
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._prefix = parts.path.rstrip("/")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_connections, thread_name_prefix="asr-http-backend"
+        )
+        self._local = threading.local()
+        self._connections: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def _connection(self, timeout: float) -> http.client.HTTPConnection:
+        """This thread's connection to the backend"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection_cls = (
+                http.client.HTTPSConnection
+                if self._scheme == "https"
+                else http.client.HTTPConnection
+            )
+            connection = self._local.connection = connection_cls(self._netloc)
+            with self._lock:
+                self._connections.append(connection)
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+        timeout: float,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Send one request and read the whole response (runs in thread pool)"""
+        for attempt in range(2):
+            connection = self._connection(timeout)
+            reused = connection.sock is not None
+            try:
+                connection.request(method, self._prefix + path, body, headers)
+                response = connection.getresponse()
+                return response.status, dict(response.getheaders()), response.read()
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                # Only a connection the backend closed while idle is retried
+                if not reused or attempt:
+                    raise
+            except Exception:
+                connection.close()
+                raise
+        raise AssertionError("unreachable")
+
+    def _post(self, request: ASRRequest) -> ASRResponse:
+        """Forward a transcription request (runs in thread pool)"""
+        query = {"provider": self.provider} if self.provider else {}
+        # Path requests stay paths: the backend reads the shared volume itself
+        raw = request.audio_buffer is not None and request.path is None
+        if raw and not request.model_params:
+            query.update(
+                sample_rate=request.sample_rate,
+                language=request.language,
+                format=request.format.value,
+                priority=request.priority.value,
+            )
+            for name in ("timeout", "start_time", "end_time"):
+                if getattr(request, name) is not None:
+                    query[name] = getattr(request, name)
+            path = "/transcribe/raw"
+            body = bytes(request.audio_buffer)
+            content_type = "application/octet-stream"
+        else:
+            payload = request.model_dump(mode="json", exclude_none=True)
+            if raw:
+                payload["audio"] = base64.b64encode(request.audio_buffer).decode()
+            path = "/transcribe"
+            body = json.dumps(payload).encode()
+            content_type = "application/json"
+        if query:
+            path += "?" + urlencode(query)
+
+        status, headers, content = self._call(
+            "POST",
+            path,
+            body,
+            {"Content-Type": content_type},
+            request.timeout or self.timeout,
+        )
+        if status == 200:
+            return ASRResponse.model_validate_json(content)
+        raise self._error(status, headers, content)
+
+    def _error(self, status: int, headers: Dict[str, str], content: bytes) -> Exception:
+        """Exception matching an error response of the backend"""
+        try:
+            detail = json.loads(content)["detail"]
+        except (ValueError, KeyError, TypeError):
+            detail = content.decode(errors="replace")[:200]
+        message = f"Backend {self.base_url}: {detail}"
+
+        retry_after = None
+        header = headers.get("Retry-After") or headers.get("retry-after")
+        if header and header.isdigit():
+            retry_after = float(header)
+        if status == 429:
+            return QueueFullError(message, retry_after)
+        if status == 413:
+            return AudioTooLongError(message)
+        if status == 504:
+            return DeadlineExceededError(message, retry_after)
+        if status == 503:
+            return OverloadedError(message, retry_after)
+        if 400 <= status < 500:
+            return ValueError(message)
+        return RuntimeError(f"{message} (HTTP {status})")
+
+    async def transcribe(self, request: ASRRequest) -> ASRResponse:
+        """Transcribe on the backend"""
+        loop = asyncio.get_running_loop()
+        self.requests += 1
+        try:
+            return await loop.run_in_executor(self._executor, self._post, request)
+        except Exception:
+            self.errors += 1
+            raise
+
+    def _ready(self) -> bool:
+        """Whether the backend reports its models ready (runs in thread pool)"""
+        status, _, _ = self._call("GET", "/ready", None, {}, self.health_timeout)
+        return status == 200
+
+    async def health_check(self) -> bool:
+        """Check that the backend is reachable and ready"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self._ready)
+        except (OSError, http.client.HTTPException):
+            return False
+
+    def stats(self) -> dict:
+        """Report provider statistics"""
+        return {
+            "url": self.base_url,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+    async def close(self):
+        """Close the backend connections"""
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
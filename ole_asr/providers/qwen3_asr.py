@@ -1,35 +1,142 @@
 """Qwen3 ASR Provider Implementation"""
 
 import asyncio
-import torch
+import logging
+import os
+import sys
+import time
+import weakref
 import numpy as np
-from typing import Optional, Any, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Optional, Any, List, TYPE_CHECKING
 from ..models import ASRRequest, ASRResponse, ASRSegment
 from .base import ASRProvider
-from ..utils import decode_audio, resample_audio, get_audio_duration
+from ..batching import BatchScheduler
+from ..lanes import LaneExecutor
+from ..streaming import join_texts
+from .word_timing import (
+    TokenScoreCapture,
+    confidence_from_scores,
+    words_from_result,
+)
+from ..metrics import (
+    EXECUTOR_QUEUE_DEPTH,
+    executor_queue_depth,
+    provider_context,
+)
+from ..utils import (
+    AudioBuffer,
+    decode_base64,
+    resample_audio,
+    synthetic_speech,
+)
 
 # Only import for type checking to avoid runtime import issues
 if TYPE_CHECKING:
     pass  # We won't import modelscope here to avoid static analysis issues
 
+logger = logging.getLogger(__name__)
+
+# Input rate exercised by warmup, so its resampler is ready for real requests
+WARMUP_INPUT_SAMPLE_RATE = 48000
+
 
 class Qwen3ASRProvider:
     """Qwen3 ASR Provider implementing the ASRProvider protocol"""
 
+    name = "qwen3-asr"  # Model identifier in responses and metrics
+
     def __init__(
         self,
         model_path: str = "damo/speech_paraformer-large_asr_nat-zh-cn-16k-common-vocab8404-pytorch",
+        max_batch_size: int = 1,
+        max_batch_wait_ms: float = 10.0,
+        max_batch_audio_seconds: float = 120.0,
+        sample_rate: int = 16000,
+        preprocess_workers: int = 4,
+        inference_workers: int = 1,
+        max_chunk_seconds: float = 30.0,
+        name: Optional[str] = None,
+        model_revision: str = "v1.0.4",
+        model_cache_dir: Optional[str] = None,
+        warmup_seconds: float = 0.0,
+        threads_per_lane: Optional[int] = None,
+        pin_lanes: bool = False,
+        output_timestamps: bool = True,
     ):
         """
         Initialize the Qwen3 ASR Provider
 
         Args:
             model_path: Path to the Qwen3 ASR model on ModelScope
+            max_batch_size: Maximum number of requests batched into one pipeline call
+            max_batch_wait_ms: Maximum time to wait for a batch to fill up
+            max_batch_audio_seconds: Total audio budget per batch in seconds
+            sample_rate: Sample rate the model consumes
+            preprocess_workers: Thread pool size for audio decoding and resampling
+            inference_workers: Inference lanes, i.e. pipeline calls running at
+                once
+            max_chunk_seconds: Longest audio chunk sent to the model in one piece
+            name: Model identifier overriding the class default, for serving
+                several variants side by side
+            model_revision: ModelScope revision of the model
+            model_cache_dir: Directory to keep a local snapshot of the model in,
+                so restarts load from disk without querying the hub
+            warmup_seconds: Length of the synthetic audio run through the
+                pipeline after loading (no warmup if 0)
+            threads_per_lane: torch threads of each inference lane (available
+                CPUs divided between the lanes if None)
+            pin_lanes: Pin each inference lane to its own CPUs
+            output_timestamps: Have the model predict token timestamps in the
+                same inference pass, so requests can ask for word timings
         """
+        if name is not None:
+            self.name = name
         self.model_path = model_path
+        self.model_revision = model_revision
+        self.model_cache_dir = model_cache_dir
+        self.warmup_seconds = warmup_seconds
+        self.max_batch_size = max_batch_size
+        self.startup_seconds: dict = {}
+        self.sample_rate = sample_rate
+        self.max_chunk_seconds = max_chunk_seconds
+        self.output_timestamps = output_timestamps
         self.pipeline = None
+        self.token_scores: Optional[TokenScoreCapture] = None
         self.is_initialized = False
 
+        # Separate pools so decoding and inference are pipelined and neither
+        # runs on the event loop
+        self.preprocess_executor = ThreadPoolExecutor(
+            max_workers=preprocess_workers, thread_name_prefix="asr-preprocess"
+        )
+        self.inference_executor = LaneExecutor(
+            lanes=inference_workers,
+            threads_per_lane=threads_per_lane,
+            pin=pin_lanes,
+            name=self.name,
+        )
+        self.scheduler = BatchScheduler(
+            self._perform_batch_transcription,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_batch_wait_ms,
+            max_batch_audio_seconds=max_batch_audio_seconds,
+            sample_rate=sample_rate,
+            executor=self.inference_executor,
+            name=self.name,
+            max_concurrent_batches=inference_workers,
+        )
+        for executor_name, executor in (
+            ("preprocess", self.preprocess_executor),
+            ("inference", self.inference_executor),
+        ):
+            EXECUTOR_QUEUE_DEPTH.labels(
+                provider=self.name, executor=executor_name
+            ).set_function(
+                # Weak, so the gauge doesn't keep an evicted provider's pool
+                lambda executor=weakref.ref(executor): executor_queue_depth(executor())
+            )
+
     def _get_pipeline_class(self):
         """Lazy load the pipeline class to avoid import issues during static analysis"""
         # Dynamically import only when called
@@ -48,20 +155,116 @@ class Qwen3ASRProvider:
         if not self.is_initialized:
             # Run model loading in a thread pool to avoid blocking
             loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._load_model)
+            started = time.perf_counter()
+            await loop.run_in_executor(self.inference_executor, self._load_model)
+            self.startup_seconds["load"] = time.perf_counter() - started
+            if self.warmup_seconds > 0:
+                await self.warmup()
             self.is_initialized = True
 
+    async def warmup(self):
+        """
+        Run synthetic audio through resampling, VAD and inference once
+
+        The first real request then doesn't pay for kernel compilation,
+        allocator growth or resampler filter design. Inference runs directly
+        on the pipeline, at batch size 1 and max_batch_size, so batching
+        statistics only reflect real traffic.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        clip = await loop.run_in_executor(
+            self.preprocess_executor, self._warmup_preprocess
+        )
+        await loop.run_in_executor(
+            self.inference_executor, self._warmup_inference, clip
+        )
+        self.startup_seconds["warmup"] = time.perf_counter() - started
+        logger.info(f"Warmed up {self.name} in {self.startup_seconds['warmup']:.2f}s")
+
+    def _warmup_preprocess(self) -> np.ndarray:
+        """Resample and chunk synthetic audio (runs in preprocessing pool)"""
+        audio = AudioBuffer.from_pcm(
+            synthetic_speech(self.warmup_seconds, WARMUP_INPUT_SAMPLE_RATE),
+            WARMUP_INPUT_SAMPLE_RATE,
+        ).resample(self.sample_rate)
+        audio.split(self.max_chunk_seconds)
+        return audio.samples
+
+    def _warmup_inference(self, clip: np.ndarray):
+        """Transcribe a synthetic clip alone and as a full batch (runs in thread pool)"""
+        self._perform_batch_transcription([clip])
+        if self.max_batch_size > 1:
+            self._perform_batch_transcription([clip] * self.max_batch_size)
+
+    def _resolve_model(self) -> str:
+        """Local snapshot directory of the model, downloading it once if needed"""
+        if self.model_cache_dir is None or os.path.isdir(self.model_path):
+            return self.model_path
+        try:
+            from modelscope.hub.snapshot_download import snapshot_download
+
+            return snapshot_download(
+                self.model_path,
+                revision=self.model_revision,
+                cache_dir=self.model_cache_dir,
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not snapshot {self.model_path} into {self.model_cache_dir}: "
+                f"{e}; loading it by name"
+            )
+            return self.model_path
+
     def _load_model(self):
         """Load the ASR model (runs in thread pool)"""
         pipeline_cls, tasks_cls = self._get_pipeline_class()
+        model = self._resolve_model()
 
-        device = "cuda" if torch.cuda.is_available() else "cpu"
+        options = {"output_timestamp": True} if self.output_timestamps else {}
         self.pipeline = pipeline_cls(
             task=tasks_cls.auto_speech_recognition,
-            model=self.model_path,
-            model_revision="v1.0.4",
-            device=device,
+            model=model,
+            model_revision=self.model_revision,
+            device=self._device(),
+            **options,
         )
+        self._optimize_model()
+        self.token_scores = TokenScoreCapture.install(self._model_chain())
+
+    def _optimize_model(self):
+        """Transform the loaded model, e.g. quantize it (runs in thread pool)"""
+
+    def _model_chain(self) -> List[Any]:
+        """Objects reached by following `.model` from the pipeline inwards
+
+        e.g. the ModelScope model, the FunASR AutoModel and the torch network
+        """
+        chain: List[Any] = []
+        obj = self.pipeline
+        while len(chain) < 8:
+            obj = getattr(obj, "model", None)
+            if obj is None or any(obj is seen for seen in chain):
+                break
+            chain.append(obj)
+        return chain
+
+    def _network(self) -> Any:
+        """Innermost torch module of the pipeline, if any"""
+        # Without torch imported the pipeline can't hold a torch model
+        torch = sys.modules.get("torch")
+        if torch is None:
+            return None
+        for model in reversed(self._model_chain()):
+            if isinstance(model, torch.nn.Module):
+                return model
+        return None
+
+    def _device(self) -> str:
+        """Device the pipeline runs on"""
+        import torch
+
+        return "cuda" if torch.cuda.is_available() else "cpu"
 
     async def transcribe(self, request: ASRRequest) -> ASRResponse:
         """
@@ -73,57 +276,197 @@ class Qwen3ASRProvider:
         Returns:
             ASR response with transcription
         """
-        if not self.is_initialized:
-            await self.initialize()
-
-        if self.pipeline is None:
-            raise RuntimeError("ASR pipeline not initialized properly")
-
-        # Decode the base64 audio
-        audio_data, original_sample_rate = decode_audio(request.audio)
+        prepared = await self.prepare(request)
+        return await self.transcribe_prepared(request, prepared)
 
-        # Resample audio if needed
-        if original_sample_rate != request.sample_rate:
-            audio_data = resample_audio(
-                audio_data, original_sample_rate, request.sample_rate
-            )
+    async def prepare(self, request: ASRRequest) -> AudioBuffer:
+        """
+        Decode, resample and split request audio into speech chunks
 
-        # Calculate audio duration
-        duration = get_audio_duration(audio_data, request.sample_rate)
+        Args:
+            request: ASR request containing audio data
 
-        # Perform transcription (run in thread pool to avoid blocking)
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, self._perform_transcription, audio_data
+        Returns:
+            Audio at request.sample_rate with its chunks, for transcribe_prepared
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.preprocess_executor, self._preprocess, request
         )
 
-        # Extract text from result
-        if isinstance(result, dict) and "text" in result:
-            text = result["text"]
-        elif isinstance(result, str):
-            text = result
-        else:
-            text = str(result) if result is not None else ""
+    async def transcribe_prepared(
+        self,
+        request: ASRRequest,
+        prepared: AudioBuffer,
+    ) -> ASRResponse:
+        """
+        Transcribe audio already decoded by prepare
+
+        Args:
+            request: ASR request the audio came from
+            prepared: Result of prepare
 
-        # Create a single segment for the full audio
+        Returns:
+            ASR response with transcription
+        """
         segments = [
-            ASRSegment(
-                start_time=0.0,
-                end_time=duration,
-                text=text,
-                confidence=0.9,  # Placeholder confidence value
-            )
+            segment async for segment in self.stream_prepared(request, prepared)
         ]
+        text = join_texts([segment.text for segment in segments])
 
         return ASRResponse(
             text=text,
             segments=segments,
-            duration=duration,
-            model="qwen3-asr",
+            duration=prepared.duration,
+            model=self.name,
             language=request.language,
             sample_rate=request.sample_rate,
         )
 
+    async def stream_prepared(
+        self,
+        request: ASRRequest,
+        prepared: AudioBuffer,
+    ) -> AsyncIterator[ASRSegment]:
+        """
+        Yield the segments of audio already decoded by prepare as they finish
+
+        Every chunk is submitted at once so the scheduler can batch them, and
+        segments come out in chunk order, each as soon as its chunk is decoded.
+        The chunks of audio split into channels are merged in time order, so
+        all channels share the same batches.
+
+        Args:
+            request: ASR request the audio came from
+            prepared: Result of prepare
+
+        Yields:
+            One segment per chunk with speech
+        """
+        if not self.is_initialized:
+            await self.initialize()
+
+        if self.pipeline is None:
+            raise RuntimeError("ASR pipeline not initialized properly")
+
+        word_timestamps = (request.model_params or {}).get("word_timestamps", False)
+        # (start, channel, samples, end) of every chunk, in time order
+        if prepared.tracks is None:
+            chunks = [
+                (start, None, prepared.samples, end) for start, end in prepared.chunks
+            ]
+        else:
+            chunks = sorted(
+                (
+                    (start, channel, track.samples, end)
+                    for channel, track in enumerate(prepared.tracks)
+                    for start, end in track.chunks
+                ),
+                key=lambda chunk: chunk[:2],
+            )
+
+        pending = [
+            asyncio.ensure_future(self.scheduler.submit(samples[start:end]))
+            for start, _, samples, end in chunks
+        ]
+        try:
+            for (start, channel, _, end), task in zip(chunks, pending):
+                segment = self._segment(
+                    request, start, end, await task, word_timestamps, channel
+                )
+                if segment is not None:
+                    yield segment
+        finally:
+            # A failed chunk or a consumer that stops early drops the rest
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _segment(
+        self,
+        request: ASRRequest,
+        start: int,
+        end: int,
+        result: Any,
+        word_timestamps: bool,
+        channel: Optional[int] = None,
+    ) -> Optional[ASRSegment]:
+        """Segment for one chunk's pipeline result, or None if it has no text"""
+        if isinstance(result, list) and len(result) == 1:
+            result = result[0]
+        chunk_text = self._extract_text(result).strip()
+        if not chunk_text:
+            return None
+        scores = result.get("token_scores") if isinstance(result, dict) else None
+        return ASRSegment(
+            start_time=start / request.sample_rate,
+            end_time=end / request.sample_rate,
+            text=chunk_text,
+            confidence=confidence_from_scores(scores),
+            words=(
+                words_from_result(result, chunk_text, start / request.sample_rate)
+                if word_timestamps
+                else None
+            ),
+            channel=channel,
+        )
+
+    async def transcribe_pcm(self, audio_data: np.ndarray, sample_rate: int) -> str:
+        """
+        Transcribe already-decoded PCM samples, e.g. a streaming window
+
+        Args:
+            audio_data: Mono float32 audio samples
+            sample_rate: Sample rate of the samples
+
+        Returns:
+            Transcribed text
+        """
+        if not self.is_initialized:
+            await self.initialize()
+
+        if sample_rate != self.sample_rate:
+            loop = asyncio.get_running_loop()
+            audio_data = await loop.run_in_executor(
+                self.preprocess_executor,
+                self._resample,
+                audio_data,
+                sample_rate,
+            )
+
+        result = await self.scheduler.submit(audio_data)
+        return self._extract_text(result)
+
+    def _resample(self, audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Resample PCM to the model rate (runs in preprocessing pool)"""
+        with provider_context(self.name):
+            return resample_audio(audio_data, sample_rate, self.sample_rate)
+
+    def _preprocess(self, request: ASRRequest) -> AudioBuffer:
+        """Decode, resample and chunk request audio (runs in preprocessing pool)"""
+        with provider_context(self.name):
+            return self._decode_and_chunk(request)
+
+    def _decode_and_chunk(self, request: ASRRequest) -> AudioBuffer:
+        """Body of _preprocess"""
+        params = request.model_params or {}
+        # Decode raw uploads in place, otherwise the base64 audio
+        audio_bytes = request.audio_buffer
+        if audio_bytes is None:
+            audio_bytes = decode_base64(request.audio)
+        audio = AudioBuffer.decode(
+            audio_bytes,
+            request.sample_rate,
+            request.start_time,
+            request.end_time,
+            split_channels=params.get("split_channels", False),
+        )
+
+        # Split on voice activity unless disabled; either way no chunk exceeds
+        # max_chunk_seconds, so long files are processed instead of rejected
+        audio.split(self.max_chunk_seconds, use_vad=params.get("vad", True))
+        return audio
+
     def _perform_transcription(self, audio_data: np.ndarray):
         """Perform transcription with the loaded model (runs in thread pool)"""
         if self.pipeline is None:
@@ -133,17 +476,99 @@ class Qwen3ASRProvider:
         result = self.pipeline(audio_data)
         return result
 
+    def _perform_batch_transcription(self, audio_batch: List[np.ndarray]) -> List[Any]:
+        """Perform transcription for a batch of clips (runs in thread pool)"""
+        if self.token_scores is None:
+            return self._transcribe_batch(audio_batch)
+
+        # Token scores come from the same decoder pass as the text
+        self.token_scores.start()
+        try:
+            results = self._transcribe_batch(audio_batch)
+        finally:
+            rows = self.token_scores.finish()
+        if len(rows) != len(results):
+            return results
+        return [self._with_scores(result, row) for result, row in zip(results, rows)]
+
+    @staticmethod
+    def _with_scores(result: Any, scores: List[float]) -> Any:
+        """Attach token log-probabilities to a pipeline result"""
+        if isinstance(result, list) and len(result) == 1:
+            result = result[0]
+        if isinstance(result, dict):
+            return {**result, "token_scores": scores}
+        return result
+
+    def _transcribe_batch(self, audio_batch: List[np.ndarray]) -> List[Any]:
+        """Body of _perform_batch_transcription"""
+        if self.pipeline is None:
+            raise RuntimeError("ASR pipeline not initialized")
+
+        if len(audio_batch) == 1:
+            return [self._perform_transcription(audio_batch[0])]
+
+        # The pipeline accepts a list of inputs and returns one result per input
+        try:
+            results = self.pipeline(audio_batch)
+        except Exception as e:
+            logger.warning(f"Batched inference failed, retrying clip by clip: {e}")
+            results = None
+        if isinstance(results, list) and len(results) == len(audio_batch):
+            return results
+
+        # Fall back to one call per clip if the pipeline did not batch (or
+        # failed), so a bad clip only fails its own request
+        return [self._transcribe_clip(audio) for audio in audio_batch]
+
+    def _transcribe_clip(self, audio_data: np.ndarray) -> Any:
+        """Transcribe one clip of a batch, returning its error instead of raising"""
+        try:
+            return self._perform_transcription(audio_data)
+        except Exception as e:
+            return e
+
+    @staticmethod
+    def _extract_text(result: Any) -> str:
+        """Extract the transcribed text from a pipeline result"""
+        if isinstance(result, list) and len(result) == 1:
+            result = result[0]
+        if isinstance(result, dict) and "text" in result:
+            return result["text"]
+        elif isinstance(result, str):
+            return result
+        return str(result) if result is not None else ""
+
+    def memory_bytes(self) -> Optional[int]:
+        """Size of the loaded model's parameters and buffers, if known"""
+        model = self._network()
+        if model is None:
+            return None
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+    def stats(self) -> dict:
+        """Report provider statistics"""
+        return {
+            "batching": self.scheduler.stats(),
+            "startup_seconds": dict(self.startup_seconds),
+            "inference_lanes": self.inference_executor.stats(),
+        }
+
+    async def close(self):
+        """Release background resources"""
+        await self.scheduler.close()
+        self.preprocess_executor.shutdown(wait=False)
+        self.inference_executor.shutdown(wait=False)
+
     async def health_check(self) -> bool:
         """
         Check if the ASR provider is healthy and ready
 
+        Never loads the model: a provider that isn't initialized yet reports
+        not ready, so probes can't trigger a load.
+
         Returns:
             True if the provider is ready, False otherwise
         """
-        try:
-            if not self.is_initialized:
-                await self.initialize()
-            return self.pipeline is not None
-        except Exception as e:
-            print(f"Health check failed: {e}")
-            return False
+        return self.is_initialized and self.pipeline is not None
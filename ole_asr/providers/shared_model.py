@@ -0,0 +1,57 @@
+"""Provider backed by a shared model-owning inference process"""
+
+import asyncio
+import os
+from typing import List
+from .qwen3_asr import Qwen3ASRProvider
+from ..inference_server import RemotePipeline
+
+
+class SharedModelProvider(Qwen3ASRProvider):
+    """Qwen3 ASR provider whose model lives in a separate inference process
+
+    Decoding, resampling and chunking happen in this (HTTP worker) process; the
+    PCM is handed to the inference process through shared memory.
+    """
+
+    def __init__(self, socket_paths: List[str], **kwargs):
+        """
+        Initialize the shared model provider
+
+        Args:
+            socket_paths: Unix sockets of the inference processes; each worker
+                process sticks to one of them
+            **kwargs: Arguments for Qwen3ASRProvider
+        """
+        super().__init__(**kwargs)
+        if not socket_paths:
+            raise ValueError("At least one inference socket is required")
+        self.socket_path = socket_paths[os.getpid() % len(socket_paths)]
+
+    def _load_model(self):
+        """Connect to the inference process instead of loading a model"""
+        pipeline = RemotePipeline(self.socket_path)
+        if not pipeline.client().health():
+            raise RuntimeError(f"Inference server at {self.socket_path} is not ready")
+        self.pipeline = pipeline
+
+    async def health_check(self) -> bool:
+        """Check that the inference process still answers"""
+        if not await super().health_check():
+            return False
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.preprocess_executor, lambda: self.pipeline.client().health()
+            )
+        except OSError:
+            return False
+
+    def _warmup_inference(self, clip):
+        """The inference process warms up its own model; nothing to do here"""
+
+    async def close(self):
+        """Release background resources and shared memory"""
+        await super().close()
+        if self.pipeline is not None:
+            self.pipeline.close()
@@ -0,0 +1,108 @@
+"""Word timings and confidence from the recognizer's own outputs
+
+Paraformer-style models predict a timestamp for every output token from the
+same predictor pass that produces the text, and the decoder's log-softmax
+gives each token's probability. Both are collected during the normal
+inference call, so word timings need no separate alignment pass.
+"""
+
+import json
+import math
+import re
+import threading
+from typing import Any, List, Optional, Sequence
+from ..models import ASRWord
+
+# Kana, CJK ideographs and Hangul
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+# The model emits one timestamp per CJK character and per other word
+_WORD_UNITS = re.compile(f"[{_CJK}]|[^\\s{_CJK}]+")
+
+
+class TokenScoreCapture:
+    """Records per-token log-probabilities from a Paraformer decoder
+
+    Wraps the model's `cal_decoder_with_predictor` on the instance. Scores are
+    kept per thread, so concurrent inference lanes don't mix them, and only
+    between start() and finish().
+    """
+
+    def __init__(self, network: Any):
+        self._local = threading.local()
+        original = network.cal_decoder_with_predictor
+
+        def cal_decoder_with_predictor(*args, **kwargs):
+            outputs = original(*args, **kwargs)
+            rows = getattr(self._local, "rows", None)
+            if rows is not None:
+                # Log-softmax output: the best entry is the emitted token's score
+                decoder_out, lengths = outputs[0], outputs[1]
+                best = decoder_out.max(dim=-1)[0].float().cpu()
+                for row, length in zip(best, lengths.tolist()):
+                    rows.append(row[: int(length)].tolist())
+            return outputs
+
+        network.cal_decoder_with_predictor = cal_decoder_with_predictor
+
+    @classmethod
+    def install(cls, chain: Sequence[Any]) -> Optional["TokenScoreCapture"]:
+        """Hook the first model in `chain` that has a Paraformer decoder"""
+        for obj in chain:
+            if callable(getattr(obj, "cal_decoder_with_predictor", None)):
+                return cls(obj)
+        return None
+
+    def start(self):
+        """Start recording for this thread's next pipeline calls"""
+        self._local.rows = []
+
+    def finish(self) -> List[List[float]]:
+        """Stop recording and return one score row per decoded clip"""
+        rows, self._local.rows = self._local.rows, None
+        return rows
+
+
+def confidence_from_scores(scores: Optional[Sequence[float]]) -> Optional[float]:
+    """Geometric mean token probability of per-token log-probabilities"""
+    if not scores:
+        return None
+    return math.exp(sum(scores) / len(scores))
+
+
+def words_from_result(result: Any, text: str, offset: float) -> Optional[List[ASRWord]]:
+    """
+    Word entries from a pipeline result's token timestamps
+
+    Args:
+        result: Pipeline result with "timestamp" ([start_ms, end_ms] per word)
+            and optionally "token_scores"
+        text: Transcribed text of the result
+        offset: Start of the transcribed chunk in the request audio, in seconds
+
+    Returns:
+        Words with times relative to the request audio, or None if the model
+        gave no timestamps or they don't line up with the text
+    """
+    timestamps = result.get("timestamp") if isinstance(result, dict) else None
+    if isinstance(timestamps, str):
+        timestamps = json.loads(timestamps)
+    if not timestamps:
+        return None
+    units = _WORD_UNITS.findall(text)
+    if len(units) != len(timestamps):
+        return None
+
+    # Word-level confidence where tokens map one-to-one onto words (e.g. CJK);
+    # merged subword tokens leave it to the segment confidence
+    scores = result.get("token_scores")
+    if scores is None or len(scores) != len(units):
+        scores = None
+    return [
+        ASRWord(
+            word=unit,
+            start_time=offset + start / 1000,
+            end_time=offset + end / 1000,
+            confidence=math.exp(scores[i]) if scores is not None else None,
+        )
+        for i, (unit, (start, end)) in enumerate(zip(units, timestamps))
+    ]
@@ -0,0 +1,206 @@
+"""Routing requests over replica providers by outstanding work
+
+A route is a name for several providers that serve the same model: local
+ones and HTTP backends running this service on other nodes. Each request
+goes to the healthy replica with the fewest audio-seconds in flight, and to
+the next one if that replica fails or turns the request away.
+"""
+
+import base64
+import contextlib
+import struct
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+from .metrics import registry
+from .models import ASRRequest
+
+ROUTE_OUTSTANDING_SECONDS = registry.gauge(
+    "ole_asr_route_outstanding_audio_seconds",
+    "Audio-seconds in flight on each replica of a route",
+    ("route", "replica"),
+)
+ROUTE_REQUESTS = registry.counter(
+    "ole_asr_route_requests_total",
+    "Requests sent to each replica of a route by outcome",
+    ("route", "replica", "status"),
+)
+
+# Assumed bitrate of compressed uploads (128 kbit/s) for estimating their length
+COMPRESSED_BYTES_PER_SECOND = 16000
+
+
+def _wav_byte_rate(header: bytes) -> Optional[int]:
+    """Byte rate of a canonical WAV header, or None for other formats"""
+    if len(header) < 32 or header[:4] not in (b"RIFF", b"RF64"):
+        return None
+    if header[8:16] != b"WAVEfmt ":
+        return None
+    (byte_rate,) = struct.unpack_from("<I", header, 28)
+    return byte_rate or None
+
+
+def estimate_audio_seconds(request: ASRRequest) -> float:
+    """
+    Audio length of a request from its encoded size, without decoding it
+
+    Near exact for PCM WAV; compressed formats are assumed to be 128 kbit/s.
+
+    Args:
+        request: ASR request with base64 audio or a raw upload
+
+    Returns:
+        Estimated duration in seconds
+    """
+    if request.start_time is not None and request.end_time is not None:
+        return max(0.0, request.end_time - request.start_time)
+    if request.audio_buffer is not None:
+        size = len(request.audio_buffer)
+        header = bytes(request.audio_buffer[:36])
+    else:
+        size = len(request.audio) * 3 // 4
+        try:
+            header = base64.b64decode(request.audio[:48])
+        except ValueError:
+            header = b""
+    return size / (_wav_byte_rate(header) or COMPRESSED_BYTES_PER_SECOND)
+
+
+class _Replica:
+    """Load and health of one replica"""
+
+    __slots__ = ("name", "outstanding", "in_flight", "healthy", "down_until")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.outstanding = 0.0
+        self.in_flight = 0
+        self.healthy = True
+        self.down_until = 0.0
+
+
+class ReplicaRouter:
+    """Picks the least loaded healthy replica of a route"""
+
+    def __init__(self, name: str, replicas: Sequence[str], retry_seconds: float = 10.0):
+        """
+        Initialize the router
+
+        Args:
+            name: Route name, used in metric labels
+            replicas: Names of the providers serving this route
+            retry_seconds: How long a failed replica is tried only after the
+                healthy ones, unless a health check finds it healthy sooner
+        """
+        if not replicas:
+            raise ValueError(f"Route '{name}' needs at least one replica")
+        self.name = name
+        self.retry_seconds = retry_seconds
+        self._replicas = {replica: _Replica(replica) for replica in replicas}
+        for replica in self._replicas.values():
+            ROUTE_OUTSTANDING_SECONDS.labels(
+                route=name, replica=replica.name
+            ).set_function(lambda replica=replica: replica.outstanding)
+
+    @property
+    def replicas(self) -> List[str]:
+        """Replica names in configuration order"""
+        return list(self._replicas)
+
+    def _available(self, replica: _Replica, now: float) -> bool:
+        """Whether a replica is considered up"""
+        return replica.healthy or now >= replica.down_until
+
+    def choose(self, exclude: Set[str] = frozenset()) -> Optional[str]:
+        """
+        Replica for the next attempt
+
+        Args:
+            exclude: Replicas already tried for this request
+
+        Returns:
+            The available replica with the fewest outstanding audio-seconds
+            (ties go to the fewest requests, then configuration order); a
+            replica that is down only when no other is left; None when every
+            replica has been excluded
+        """
+        now = time.monotonic()
+        candidates = [
+            replica
+            for replica in self._replicas.values()
+            if replica.name not in exclude
+        ]
+        if not candidates:
+            return None
+        best = min(
+            candidates,
+            key=lambda replica: (
+                not self._available(replica, now),
+                replica.outstanding,
+                replica.in_flight,
+            ),
+        )
+        return best.name
+
+    @contextlib.contextmanager
+    def lease(self, name: str, cost: float) -> Iterator[None]:
+        """Count `cost` audio-seconds against a replica for the enclosed block"""
+        replica = self._replicas[name]
+        replica.outstanding += cost
+        replica.in_flight += 1
+        try:
+            yield
+        finally:
+            replica.in_flight -= 1
+            # Reset when idle so float rounding doesn't accumulate
+            replica.outstanding = (
+                replica.outstanding - cost if replica.in_flight else 0.0
+            )
+
+    def record(self, name: str, status: str):
+        """
+        Record the outcome of a request sent to a replica
+
+        Args:
+            name: Replica name
+            status: "ok", "rejected" (turned away, e.g. its queue was full) or
+                "error" (marks the replica down for retry_seconds)
+        """
+        ROUTE_REQUESTS.labels(route=self.name, replica=name, status=status).inc()
+        replica = self._replicas[name]
+        if status == "ok":
+            replica.healthy = True
+        elif status == "error":
+            self._mark_down(replica)
+
+    def _mark_down(self, replica: _Replica):
+        """Try a replica only after the healthy ones for a while"""
+        replica.healthy = False
+        replica.down_until = time.monotonic() + self.retry_seconds
+
+    def update_health(self, results: Dict[str, bool]):
+        """Apply health check results of the replicas that were checked"""
+        for name, healthy in results.items():
+            replica = self._replicas.get(name)
+            if replica is None:
+                continue
+            if healthy:
+                replica.healthy = True
+            elif replica.healthy or time.monotonic() >= replica.down_until:
+                self._mark_down(replica)
+
+    def is_healthy(self) -> bool:
+        """Whether any replica is considered up"""
+        now = time.monotonic()
+        return any(self._available(replica, now) for replica in self._replicas.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Report load and health of every replica"""
+        now = time.monotonic()
+        return {
+            replica.name: {
+                "outstanding_audio_seconds": replica.outstanding,
+                "in_flight": replica.in_flight,
+                "available": self._available(replica, now),
+            }
+            for replica in self._replicas.values()
+        }
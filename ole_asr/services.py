@@ -1,8 +1,42 @@
 """Universal ASR Service Interface"""
 
 from abc import ABC, abstractmethod
-from typing import Protocol, runtime_checkable, Optional
-from .models import ASRRequest, ASRResponse
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Protocol,
+    runtime_checkable,
+    Optional,
+    Sequence,
+    Set,
+)
+from .admission import (
+    AdmissionController,
+    AdmissionError,
+    AudioTooLongError,
+    DeadlineExceededError,
+)
+from .cache import TranscriptionCache
+from .health import HealthMonitor
+from .model_manager import ModelManager
+from .metrics import (
+    AUDIO_SECONDS,
+    REAL_TIME_FACTOR,
+    REQUESTS_IN_FLIGHT,
+    REQUESTS_TOTAL,
+    STAGE_SECONDS,
+)
+from .models import ASRRequest, ASRResponse, ASRSegment
+from .routing import ReplicaRouter, estimate_audio_seconds
+from .utils import AudioBuffer, map_audio_file, resolve_under_root
+
+logger = logging.getLogger(__name__)
 
 
 @runtime_checkable
@@ -23,9 +57,37 @@ class ASRProvider(Protocol):
 class ASRService:
     """Main ASR Service that manages different ASR providers"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[TranscriptionCache] = None,
+        admission: Optional[AdmissionController] = None,
+        max_audio_seconds: Optional[float] = None,
+        models: Optional[ModelManager] = None,
+        health: Optional[HealthMonitor] = None,
+        input_root: Optional[str] = None,
+    ):
+        """
+        Initialize the service
+
+        Args:
+            cache: Transcription result cache (disabled if None)
+            admission: Admission controller bounding queued work (unbounded if None)
+            max_audio_seconds: Longest audio accepted, in seconds (unlimited if None)
+            models: Manager for lazily loaded providers (created on first
+                register_model if None)
+            health: Provider health checking (default settings if None)
+            input_root: Directory request `path`s must be under (path requests
+                are rejected if None)
+        """
         self.providers: dict[str, ASRProvider] = {}
         self.default_provider: str = ""
+        self.cache = cache
+        self.admission = admission
+        self.max_audio_seconds = max_audio_seconds
+        self.models = models
+        self.routes: dict[str, ReplicaRouter] = {}
+        self.health = health if health is not None else HealthMonitor()
+        self.input_root = os.path.realpath(input_root) if input_root else None
 
     def register_provider(self, name: str, provider: ASRProvider):
         """Register a new ASR provider"""
@@ -33,38 +95,514 @@ class ASRService:
         if not self.default_provider:
             self.default_provider = name
 
+    def register_model(
+        self,
+        name: str,
+        factory: Callable[[], ASRProvider],
+        memory_bytes: Optional[int] = None,
+        pinned: bool = False,
+    ):
+        """
+        Register a provider that is loaded on first use and may be unloaded
+
+        Args:
+            name: Provider name
+            factory: Builds the (uninitialized) provider
+            memory_bytes: Memory the model takes (measured at load if None)
+            pinned: Load at startup and never unload
+        """
+        if self.models is None:
+            self.models = ModelManager()
+        self.models.register(name, factory, memory_bytes=memory_bytes, pinned=pinned)
+        if not self.default_provider:
+            self.default_provider = name
+
+    def register_route(
+        self, name: str, replicas: Sequence[str], retry_seconds: float = 10.0
+    ):
+        """
+        Register a name that spreads requests over several providers
+
+        Args:
+            name: Route name, used like a provider name
+            replicas: Providers serving the same model: local ones and HTTP
+                backends
+            retry_seconds: How long a failed replica is avoided
+        """
+        self.routes[name] = ReplicaRouter(name, replicas, retry_seconds)
+        if not self.default_provider:
+            self.default_provider = name
+
     def get_provider(self, name: str) -> ASRProvider:
-        """Get a specific ASR provider"""
+        """Get a specific ASR provider that is always loaded"""
         if name not in self.providers:
+            if self.models is not None and name in self.models:
+                raise ValueError(
+                    f"Provider '{name}' is loaded on demand; use acquire_provider"
+                )
             raise ValueError(
-                f"Provider '{name}' not found. Available: {list(self.providers.keys())}"
+                f"Provider '{name}' not found. Available: {self.list_providers()}"
             )
         return self.providers[name]
 
+    async def acquire_provider(self, name: str) -> ASRProvider:
+        """
+        Get a provider, loading it if needed, and keep it loaded until
+        release_provider is called with the same name
+
+        Raises:
+            ValueError: If no provider has this name
+        """
+        if self.models is not None and name in self.models:
+            return await self.models.acquire(name)
+        return self.get_provider(name)
+
+    def release_provider(self, name: str):
+        """Allow a provider from acquire_provider to be unloaded again"""
+        if self.models is not None and name in self.models:
+            self.models.release(name)
+
+    @contextlib.asynccontextmanager
+    async def _hold_loaded(self, name: str):
+        """
+        Hold a provider that is in memory without loading it
+
+        Yields the provider, kept from eviction until the block ends, or None
+        if it has been unloaded
+        """
+        if self.models is None or name not in self.models:
+            yield self.providers.get(name)
+            return
+        provider = self.models.acquire_loaded(name)
+        if provider is None:
+            yield None
+            return
+        try:
+            yield provider
+        finally:
+            self.models.release(name)
+
     def list_providers(self) -> list[str]:
         """List all registered providers"""
-        return list(self.providers.keys())
+        names = list(self.providers.keys())
+        if self.models is not None:
+            names += [name for name in self.models.names() if name not in names]
+        return names + [name for name in self.routes if name not in names]
+
+    def _loaded_providers(self) -> dict:
+        """Providers currently in memory by name"""
+        loaded = dict(self.providers)
+        if self.models is not None:
+            loaded.update(self.models.resident())
+        return loaded
 
     async def transcribe(
-        self, request: ASRRequest, provider_name: Optional[str] = None
+        self,
+        request: ASRRequest,
+        provider_name: Optional[str] = None,
+        prepared: Optional[AudioBuffer] = None,
     ) -> ASRResponse:
-        """Transcribe audio using the specified provider or default"""
+        """
+        Transcribe audio using the specified provider or default
+
+        Args:
+            request: ASR request; its audio is ignored when `prepared` is given
+            provider_name: Provider to use (default provider if None)
+            prepared: Audio already decoded, resampled to request.sample_rate and
+                chunked, as returned by the provider's prepare step
+
+        Returns:
+            ASR response with transcription
+        """
         if provider_name is None:
             provider_name = self.default_provider
 
         if not provider_name:
             raise ValueError("No ASR provider available")
 
-        provider = self.get_provider(provider_name)
-        return await provider.transcribe(request)
+        if request.path is not None and prepared is None:
+            request = await self._open_path(request)
+
+        router = self.routes.get(provider_name)
+        if router is not None:
+            return await self._transcribe_routed(router, request, prepared)
+
+        # The client's timeout also covers loading the model on first use
+        deadline = None
+        if request.timeout is not None:
+            deadline = time.monotonic() + request.timeout
+
+        provider = await self.acquire_provider(provider_name)
+        try:
+            return await self._transcribe_measured(
+                provider, provider_name, request, deadline, prepared
+            )
+        finally:
+            self.release_provider(provider_name)
+
+    async def _open_path(self, request: ASRRequest) -> ASRRequest:
+        """
+        Map the file a request refers to into its audio buffer
+
+        Raises:
+            ValueError: If path requests are disabled, or the path escapes the
+                input root or does not exist
+        """
+        if request.audio_buffer is not None:
+            return request
+
+        def open_file():
+            # Resolving stats the file, which can block on network storage
+            path = resolve_under_root(self.input_root, request.path)
+            return map_audio_file(path, request.offset, request.length)
+
+        view = await asyncio.get_running_loop().run_in_executor(None, open_file)
+        if not view:
+            raise ValueError(f"No audio in the requested range of {request.path}")
+        opened = request.model_copy()
+        opened._audio_buffer = view
+        return opened
+
+    def _accepts_prepared(self, name: str) -> bool:
+        """Whether a provider can be given audio this node already decoded"""
+        provider = self.providers.get(name)
+        # Providers loaded on demand are all local models
+        return provider is None or hasattr(provider, "prepare")
+
+    async def _transcribe_routed(
+        self,
+        router: ReplicaRouter,
+        request: ASRRequest,
+        prepared: Optional[AudioBuffer],
+    ) -> ASRResponse:
+        """Send a request to the least loaded replica, failing over to the others"""
+        cost = (
+            prepared.duration
+            if prepared is not None
+            else estimate_audio_seconds(request)
+        )
+        deadline = None
+        if request.timeout is not None:
+            deadline = time.monotonic() + request.timeout
+
+        tried: Set[str] = set()
+        if prepared is not None:
+            tried.update(
+                name for name in router.replicas if not self._accepts_prepared(name)
+            )
+        error: Optional[Exception] = None
+        rejection: Optional[AdmissionError] = None
+        while True:
+            replica = router.choose(tried)
+            if replica is None:
+                break
+            tried.add(replica)
+
+            attempt = request
+            if deadline is not None:
+                # Failing over doesn't extend the client's timeout
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DeadlineExceededError(
+                        f"Deadline passed before route '{router.name}' found a "
+                        f"working replica"
+                    )
+                attempt = request.model_copy(update={"timeout": remaining})
 
-    async def health_check(self) -> dict:
-        """Health check for all providers"""
-        results = {}
-        for name, provider in self.providers.items():
             try:
-                results[name] = await provider.health_check()
+                with router.lease(replica, cost):
+                    response = await self.transcribe(attempt, replica, prepared)
+            except (ValueError, AudioTooLongError):
+                # The request itself is at fault; other replicas would refuse it too
+                raise
+            except AdmissionError as e:
+                router.record(replica, "rejected")
+                rejection = e
             except Exception as e:
-                results[name] = False
+                router.record(replica, "error")
+                logger.warning(
+                    f"Replica '{replica}' of route '{router.name}' failed: {str(e)}"
+                )
+                error = e
+            else:
+                router.record(replica, "ok")
+                return response
+
+        # A busy replica tells the client when to retry; prefer that error
+        if rejection is not None:
+            raise rejection
+        if error is not None:
+            raise error
+        raise ValueError(
+            f"Route '{router.name}' has no replica that accepts decoded audio"
+        )
+
+    async def _transcribe_measured(
+        self,
+        provider: ASRProvider,
+        provider_name: str,
+        request: ASRRequest,
+        deadline: Optional[float],
+        prepared: Optional[AudioBuffer],
+    ) -> ASRResponse:
+        """Run a request and record its request metrics"""
+        in_flight = REQUESTS_IN_FLIGHT.labels(provider=provider_name)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            response = await self._transcribe_with(
+                provider, provider_name, request, deadline, prepared
+            )
+        except AdmissionError:
+            REQUESTS_TOTAL.labels(provider=provider_name, status="rejected").inc()
+            raise
+        except Exception:
+            REQUESTS_TOTAL.labels(provider=provider_name, status="error").inc()
+            raise
+        finally:
+            in_flight.dec()
+
+        self._record_success(
+            provider_name, time.perf_counter() - started, response.duration
+        )
+        return response
+
+    @staticmethod
+    def _record_success(provider_name: str, elapsed: float, duration: float):
+        """Record the metrics of a completed request"""
+        REQUESTS_TOTAL.labels(provider=provider_name, status="ok").inc()
+        STAGE_SECONDS.labels(provider=provider_name, stage="total").observe(elapsed)
+        AUDIO_SECONDS.labels(provider=provider_name).inc(duration)
+        if duration > 0:
+            REAL_TIME_FACTOR.labels(provider=provider_name).observe(elapsed / duration)
 
+    async def transcribe_stream(
+        self, request: ASRRequest, provider_name: Optional[str] = None
+    ) -> AsyncIterator[ASRSegment]:
+        """
+        Transcribe audio, yielding each segment as soon as its chunk is decoded
+
+        Goes through the same admission control, length limit and metrics as
+        transcribe, holding the admission slot until the last segment. The
+        result cache is not used: streamed segments are never collected.
+
+        Args:
+            request: ASR request
+            provider_name: Provider to use (default provider if None)
+
+        Yields:
+            Segments in order of their start time
+        """
+        if provider_name is None:
+            provider_name = self.default_provider
+
+        if not provider_name:
+            raise ValueError("No ASR provider available")
+
+        if request.path is not None:
+            request = await self._open_path(request)
+
+        router = self.routes.get(provider_name)
+        if router is not None:
+            # A stream goes to one local replica and isn't moved once started
+            replica = router.choose(
+                {name for name in router.replicas if not self._accepts_prepared(name)}
+            )
+            if replica is None:
+                raise ValueError(
+                    f"Route '{provider_name}' has no local replica to stream from"
+                )
+            with router.lease(replica, estimate_audio_seconds(request)):
+                async for segment in self.transcribe_stream(request, replica):
+                    yield segment
+            return
+
+        deadline = None
+        if request.timeout is not None:
+            deadline = time.monotonic() + request.timeout
+
+        provider = await self.acquire_provider(provider_name)
+        in_flight = REQUESTS_IN_FLIGHT.labels(provider=provider_name)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            if not hasattr(provider, "stream_prepared"):
+                raise ValueError(
+                    f"Provider '{provider_name}' does not support streaming"
+                )
+            if self.admission is not None:
+                self.admission.check(request.priority)
+
+            prepared = await provider.prepare(request)
+            duration = prepared.duration
+            self._check_duration(duration)
+
+            async with contextlib.AsyncExitStack() as stack:
+                if self.admission is not None:
+                    await stack.enter_async_context(
+                        self.admission.slot(duration, request.priority, deadline)
+                    )
+                segments = provider.stream_prepared(request, prepared)
+                stack.push_async_callback(segments.aclose)
+                async for segment in segments:
+                    yield segment
+        except AdmissionError:
+            REQUESTS_TOTAL.labels(provider=provider_name, status="rejected").inc()
+            raise
+        except Exception:
+            REQUESTS_TOTAL.labels(provider=provider_name, status="error").inc()
+            raise
+        finally:
+            in_flight.dec()
+            self.release_provider(provider_name)
+
+        self._record_success(provider_name, time.perf_counter() - started, duration)
+
+    async def _transcribe_with(
+        self,
+        provider: ASRProvider,
+        provider_name: str,
+        request: ASRRequest,
+        deadline: Optional[float] = None,
+        prepared: Optional[AudioBuffer] = None,
+    ) -> ASRResponse:
+        """Run a request through admission, the result cache and a provider"""
+        # HTTP backends apply their own admission control
+        remote = getattr(provider, "remote", False)
+        if self.admission is not None and not remote:
+            # Turn the request away before spending time decoding it
+            self.admission.check(request.priority)
+
+        # Only providers that expose the decode step separately report the
+        # duration up front and can use the cache
+        if not hasattr(provider, "prepare"):
+            if prepared is not None:
+                raise ValueError(
+                    f"Provider '{provider_name}' does not accept decoded audio"
+                )
+            if remote:
+                return await provider.transcribe(request)
+            return await self._admitted(
+                lambda: provider.transcribe(request), None, request, deadline
+            )
+
+        if prepared is None:
+            prepared = await provider.prepare(request)
+        duration = prepared.duration
+        self._check_duration(duration)
+
+        def compute():
+            return self._admitted(
+                lambda: provider.transcribe_prepared(request, prepared),
+                duration,
+                request,
+                deadline,
+            )
+
+        if self.cache is None:
+            return await compute()
+
+        loop = asyncio.get_running_loop()
+        key = await loop.run_in_executor(
+            None,
+            self.cache.make_key,
+            prepared.samples,
+            provider_name,
+            request.language,
+            request.sample_rate,
+            request.model_params,
+        )
+        # Cache hits are served without waiting for admission
+        return await self.cache.get_or_compute(key, compute)
+
+    def _check_duration(self, duration: float):
+        """Reject audio longer than the configured maximum"""
+        if self.max_audio_seconds is not None and duration > self.max_audio_seconds:
+            raise AudioTooLongError(
+                f"Audio is {duration:.1f}s long; the maximum is "
+                f"{self.max_audio_seconds:.0f}s"
+            )
+
+    async def _admitted(
+        self,
+        run: Callable[[], Awaitable[ASRResponse]],
+        duration: Optional[float],
+        request: ASRRequest,
+        deadline: Optional[float],
+    ) -> ASRResponse:
+        """Run `run` once admission control lets the request through"""
+        if self.admission is None:
+            return await run()
+        cost = duration if duration is not None else self.admission.default_cost
+        async with self.admission.slot(cost, request.priority, deadline):
+            return await run()
+
+    async def health_check(self) -> dict:
+        """
+        Health of loaded providers and routes
+
+        Providers are checked concurrently, each within the monitor's timeout,
+        and recent results are reused; providers that aren't loaded are not
+        loaded to check them.
+        """
+        results = await self.health.check(self._loaded_providers())
+        return self._with_routes(results)
+
+    def health_snapshot(self) -> dict:
+        """
+        Last known health of loaded providers and routes, without waiting
+
+        Providers not checked yet are reported as None; stale results are
+        refreshed in the background.
+        """
+        return self._with_routes(self.health.snapshot(self._loaded_providers()))
+
+    def _with_routes(self, results: dict) -> dict:
+        """Apply provider health to the routes and add theirs"""
+        # Replicas found unhealthy are avoided until they recover
+        known = {
+            name: healthy for name, healthy in results.items() if healthy is not None
+        }
+        for name, router in self.routes.items():
+            router.update_health(known)
+            results[name] = router.is_healthy()
         return results
+
+    def start_health_canary(self):
+        """Start the periodic canary transcription, if enabled"""
+        self.health.start_canary(self._loaded_providers, self._hold_loaded)
+
+    async def run_health_canary(self):
+        """Run one round of the canary through the loaded providers now"""
+        await self.health.run_canary(self._loaded_providers(), self._hold_loaded)
+
+    def stats(self) -> dict:
+        """Collect runtime statistics from providers that report them"""
+        results = {}
+        for name, provider in self._loaded_providers().items():
+            provider_stats = getattr(provider, "stats", None)
+            if callable(provider_stats):
+                results[name] = provider_stats()
+        stats = {"providers": results}
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        if self.admission is not None:
+            stats["admission"] = self.admission.stats()
+        if self.models is not None:
+            stats["models"] = self.models.stats()
+        stats["health"] = self.health.stats()
+        if self.routes:
+            stats["routes"] = {
+                name: router.stats() for name, router in self.routes.items()
+            }
+        return stats
+
+    async def close(self):
+        """Release background resources held by providers"""
+        await self.health.stop()
+        for provider in self.providers.values():
+            close = getattr(provider, "close", None)
+            if callable(close):
+                await close()
+        if self.models is not None:
+            await self.models.close()
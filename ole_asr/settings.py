@@ -0,0 +1,27 @@
+"""Provider settings derived from the configuration
+
+Kept apart from the API module so command-line tools and the server launcher
+can build providers without importing the FastAPI app.
+"""
+
+from config import config
+
+
+def provider_settings() -> dict:
+    """Qwen3ASRProvider keyword arguments derived from the configuration"""
+    return {
+        "model_path": config.DEFAULT_MODEL_PATH,
+        "max_batch_size": config.BATCH_MAX_SIZE,
+        "max_batch_wait_ms": config.BATCH_MAX_WAIT_MS,
+        "max_batch_audio_seconds": config.BATCH_MAX_AUDIO_SECONDS,
+        "sample_rate": config.DEFAULT_SAMPLE_RATE,
+        "preprocess_workers": config.THREAD_POOL_SIZE,
+        "inference_workers": config.INFERENCE_WORKERS,
+        "threads_per_lane": config.INFERENCE_THREADS_PER_LANE or None,
+        "pin_lanes": config.INFERENCE_PIN_LANES,
+        "max_chunk_seconds": min(
+            config.VAD_MAX_CHUNK_SECONDS, config.MAX_AUDIO_DURATION
+        ),
+        "model_cache_dir": config.MODEL_CACHE_DIR,
+        "warmup_seconds": config.WARMUP_SECONDS,
+    }
@@ -0,0 +1,232 @@
+"""Incremental streaming transcription over a sliding window"""
+
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import numpy as np
+from .models import ASRSegment
+
+
+class RingBuffer:
+    """Fixed-capacity float32 ring buffer addressed by absolute sample index"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.total = 0  # Number of samples ever written
+
+    def append(self, samples: np.ndarray):
+        """Append samples, overwriting the oldest ones when full"""
+        if len(samples) >= self.capacity:
+            self.total += len(samples)
+            # Place the newest samples so absolute index i lives at i % capacity
+            self._data[:] = np.roll(
+                samples[-self.capacity :], self.total % self.capacity
+            )
+            return
+
+        start = self.total % self.capacity
+        end = start + len(samples)
+        if end <= self.capacity:
+            self._data[start:end] = samples
+        else:
+            split = self.capacity - start
+            self._data[start:] = samples[:split]
+            self._data[: end - self.capacity] = samples[split:]
+        self.total += len(samples)
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest sample still held"""
+        return max(0, self.total - self.capacity)
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Return a contiguous copy of absolute samples [start, end)"""
+        start = max(start, self.oldest)
+        end = min(end, self.total)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+
+        first = start % self.capacity
+        last = first + (end - start)
+        if last <= self.capacity:
+            return self._data[first:last].copy()
+        return np.concatenate((self._data[first:], self._data[: last - self.capacity]))
+
+
+# Kana and CJK ideographs, written without spaces between words
+_UNSPACED = re.compile("[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff]")
+
+
+def _tokens(text: str) -> List[str]:
+    """Split text into words, or characters for unspaced scripts"""
+    return text.split() if " " in text.strip() else list(text.strip())
+
+
+def _join(tokens: List[str], spaced: bool) -> str:
+    """Inverse of _tokens"""
+    return " ".join(tokens) if spaced else "".join(tokens)
+
+
+def join_texts(texts: List[str]) -> str:
+    """
+    Join the transcripts of consecutive chunks of one recording
+
+    Args:
+        texts: Chunk transcripts in time order
+
+    Returns:
+        The transcripts separated by spaces, or run together when they are in
+        an unspaced script (e.g. Chinese or Japanese)
+    """
+    texts = [text.strip() for text in texts if text.strip()]
+    spaced = any(" " in text for text in texts) or not any(
+        _UNSPACED.search(text) for text in texts
+    )
+    return _join(texts, spaced)
+
+
+def strip_overlap(previous: str, current: str, max_tokens: int = 32) -> str:
+    """
+    Remove the prefix of `current` that repeats the tail of `previous`
+
+    Args:
+        previous: Text recognized for the preceding window
+        current: Text recognized for a window overlapping the preceding one
+        max_tokens: Longest overlap to search for
+
+    Returns:
+        The part of `current` not already covered by `previous`
+    """
+    spaced = " " in current.strip()
+    prev_tokens, cur_tokens = _tokens(previous), _tokens(current)
+    limit = min(len(prev_tokens), len(cur_tokens), max_tokens)
+    for k in range(limit, 0, -1):
+        if prev_tokens[-k:] == cur_tokens[:k]:
+            return _join(cur_tokens[k:], spaced)
+    return _join(cur_tokens, spaced)
+
+
+class StreamingSession:
+    """Per-connection streaming state producing partial and final segments"""
+
+    def __init__(
+        self,
+        transcribe_fn: Callable[[np.ndarray, int], Awaitable[str]],
+        sample_rate: int = 16000,
+        window_seconds: float = 8.0,
+        step_seconds: float = 0.5,
+        overlap_seconds: float = 1.0,
+    ):
+        """
+        Initialize the streaming session
+
+        Args:
+            transcribe_fn: Coroutine transcribing (audio, sample_rate) to text
+            sample_rate: Sample rate of the incoming PCM
+            window_seconds: Maximum audio per inference, including overlap
+            step_seconds: New audio required before the next partial result
+            overlap_seconds: Audio from the previous segment re-fed as context
+        """
+        if overlap_seconds >= window_seconds:
+            raise ValueError("overlap_seconds must be smaller than window_seconds")
+
+        self.transcribe_fn = transcribe_fn
+        self.sample_rate = sample_rate
+        self.window = int(window_seconds * sample_rate)
+        self.step = max(1, int(step_seconds * sample_rate))
+        self.overlap = int(overlap_seconds * sample_rate)
+        self.segment_limit = self.window - self.overlap
+
+        # Room for a full window plus audio that arrives while inference runs
+        self.buffer = RingBuffer(self.window * 2)
+        self.segment_start = 0
+        self.last_inference = 0
+        self.previous_text = ""
+
+        self.started_at: Optional[float] = None
+        self.first_token_at: Optional[float] = None
+        self.inference_count = 0
+
+    def feed(self, samples: np.ndarray):
+        """Append newly received PCM samples"""
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        self.buffer.append(samples)
+
+    def due(self) -> bool:
+        """Whether enough new audio has arrived for another inference"""
+        return self.buffer.total - self.last_inference >= self.step
+
+    async def poll(self) -> List[Dict[str, Any]]:
+        """
+        Run inference on buffered audio if due
+
+        Returns:
+            Final events for every completed segment, then a partial event for
+            the audio after them
+        """
+        if not self.due():
+            return []
+        self.last_inference = self.buffer.total
+
+        events = []
+        while self.buffer.total - self.segment_start >= self.segment_limit:
+            end = self.segment_start + self.segment_limit
+            events.append(await self._infer(end, final=True))
+        if self.buffer.total > self.segment_start:
+            events.append(await self._infer(self.buffer.total, final=False))
+        return events
+
+    async def finish(self) -> List[Dict[str, Any]]:
+        """
+        Flush all remaining audio as final segments
+
+        Returns:
+            Final events covering the rest of the stream
+        """
+        self.last_inference = self.buffer.total
+
+        events = []
+        while self.buffer.total > self.segment_start:
+            end = min(self.buffer.total, self.segment_start + self.segment_limit)
+            events.append(await self._infer(end, final=True))
+        return events
+
+    async def _infer(self, end: int, final: bool) -> Dict[str, Any]:
+        """Transcribe the current segment up to `end` with overlap context"""
+        # Skip audio that was overwritten because inference fell too far behind
+        self.segment_start = max(self.segment_start, self.buffer.oldest)
+        context_start = max(self.segment_start - self.overlap, self.buffer.oldest)
+        window = self.buffer.read(context_start, end)
+
+        raw_text = await self.transcribe_fn(window, self.sample_rate)
+        self.inference_count += 1
+        text = raw_text
+        if context_start < self.segment_start and self.previous_text:
+            text = strip_overlap(self.previous_text, raw_text)
+
+        if text and self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+        segment = ASRSegment(
+            start_time=self.segment_start / self.sample_rate,
+            end_time=end / self.sample_rate,
+            text=text,
+        )
+        if final:
+            self.previous_text = raw_text
+            self.segment_start = end
+
+        return {"type": "final" if final else "partial", "segment": segment}
+
+    def stats(self) -> Dict[str, Any]:
+        """Session latency statistics"""
+        ttft = None
+        if self.started_at is not None and self.first_token_at is not None:
+            ttft = self.first_token_at - self.started_at
+        return {
+            "duration": self.buffer.total / self.sample_rate,
+            "inferences": self.inference_count,
+            "time_to_first_token": ttft,
+        }
@@ -2,47 +2,453 @@
 
 import base64
 import io
+import mmap
+import os
+import struct
+import threading
 import numpy as np
-import soundfile as sf
-import librosa
-from typing import Tuple
-import torch
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, List, Optional, Set, Tuple, Union
+from .metrics import track_stage
 
+# torch, librosa, soundfile and soxr are imported where they are first used, so
+# processes that never decode audio (or decode only WAV) don't pay for them
+if TYPE_CHECKING:
+    import torch
 
-def decode_audio(audio_base64: str) -> Tuple[np.ndarray, int]:
+
+class BufferReader(io.RawIOBase):
+    """Read-only, seekable file object over an existing buffer without copying it"""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        remaining = len(self._view) - self._position
+        size = min(len(target), max(remaining, 0))
+        target[:size] = self._view[self._position : self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+def decode_audio(
+    audio_base64: str,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+) -> Tuple[np.ndarray, int]:
     """
     Decode base64 encoded audio to numpy array
 
     Args:
         audio_base64: Base64 encoded audio data
+        start_time: Decode from this many seconds into the audio
+        end_time: Decode up to this many seconds into the audio
 
     Returns:
         Tuple of (audio_array, sample_rate)
     """
-    # Decode base64 string
-    audio_bytes = base64.b64decode(audio_base64)
+    return decode_audio_bytes(decode_base64(audio_base64), start_time, end_time)
+
+
+def decode_base64(audio_base64: str) -> bytes:
+    """Decode base64 encoded audio to the encoded file contents"""
+    with track_stage("b64_decode"):
+        return base64.b64decode(audio_base64)
 
-    # Load audio using soundfile
-    audio_buffer = io.BytesIO(audio_bytes)
 
-    # Try to load with soundfile first
-    try:
-        audio_data, sample_rate = sf.read(audio_buffer)
-    except:
-        # If soundfile fails, try librosa (for mp3 and other formats)
-        audio_buffer.seek(0)
-        audio_data, sample_rate = librosa.load(audio_buffer, sr=None)
+def resolve_under_root(root: Optional[str], path: str) -> str:
+    """
+    Resolve a client-supplied path inside an allowlisted directory
+
+    Args:
+        root: Directory paths must be under (already resolved with realpath),
+            or None if path access is disabled
+        path: Path relative to the root (or absolute, if under it)
+
+    Returns:
+        The resolved path of an existing file
+
+    Raises:
+        ValueError: If path access is disabled, or the path escapes the root
+            (including through symlinks) or is not a file
+    """
+    if root is None:
+        raise ValueError("Server-side paths are disabled (no input root set)")
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([resolved, root]) != root:
+        raise ValueError(f"Path is outside the input root: {path}")
+    if not os.path.isfile(resolved):
+        raise ValueError(f"File not found: {path}")
+    return resolved
+
+
+def map_audio_file(
+    path: str, offset: int = 0, length: Optional[int] = None
+) -> memoryview:
+    """
+    Memory-map a file, or a byte range of it, for decoding in place
 
-    # Ensure audio is mono
-    if len(audio_data.shape) > 1:
-        audio_data = audio_data.mean(axis=1)
+    Pages are read from disk (or the page cache) only as the decoder touches
+    them, so a range of a large file costs no more than the range itself.
 
-    # Ensure sample_rate is int
-    sample_rate_int = (
-        int(sample_rate) if isinstance(sample_rate, float) else sample_rate
+    Args:
+        path: File to map
+        offset: First byte of the range
+        length: Bytes in the range (to the end of the file if None)
+
+    Returns:
+        Read-only view of the range; the mapping is released with the last
+        reference to it (including arrays decoded from it without copying)
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if offset < 0 or offset > size:
+            raise ValueError(f"Offset {offset} is outside the {size}-byte file")
+        end = size if length is None else min(size, offset + length)
+        if end <= offset:
+            return memoryview(b"")
+        # Mappings must start on an allocation boundary
+        start = offset - offset % mmap.ALLOCATIONGRANULARITY
+        mapped = mmap.mmap(
+            f.fileno(), end - start, offset=start, access=mmap.ACCESS_READ
+        )
+    return memoryview(mapped)[offset - start :]
+
+
+def _frame_range(
+    sample_rate: int,
+    frames: int,
+    start_time: Optional[float],
+    end_time: Optional[float],
+) -> Tuple[int, int]:
+    """First frame and frame count of a time range within `frames` frames"""
+    first = int(round((start_time or 0.0) * sample_rate))
+    last = (
+        frames if end_time is None else min(frames, int(round(end_time * sample_rate)))
+    )
+    if first >= frames:
+        raise ValueError("start_time is past the end of the audio")
+    if last <= first:
+        raise ValueError("end_time must be after start_time")
+    return first, last - first
+
+
+# Formats libsndfile can read in this installation (MP3 needs libsndfile >= 1.1)
+@lru_cache(maxsize=1)
+def _soundfile_formats() -> Set[str]:
+    """Sniffed formats decoded with libsndfile (mp3 only if it was built with it)"""
+    import soundfile as sf
+
+    return {"wav", "flac", "ogg"} | (
+        {"mp3"} if "MP3" in sf.available_formats() else set()
     )
 
-    return audio_data.astype(np.float32), sample_rate_int
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def sniff_audio_format(
+    audio_bytes: Union[bytes, bytearray, memoryview],
+) -> Optional[str]:
+    """
+    Identify the container format from the leading bytes
+
+    Args:
+        audio_bytes: Encoded audio file contents
+
+    Returns:
+        Format name ("wav", "flac", "ogg", "mp3", "m4a" or "aac"), or None
+    """
+    header = bytes(memoryview(audio_bytes)[:12])
+    if len(header) < 4:
+        return None
+    if header[:4] in (b"RIFF", b"RF64") and header[8:12] == b"WAVE":
+        return "wav"
+    if header[:4] == b"fLaC":
+        return "flac"
+    if header[:4] == b"OggS":
+        return "ogg"
+    if header[4:8] == b"ftyp":
+        return "m4a"
+    if header[:3] == b"ID3":
+        return "mp3"
+    if header[0] == 0xFF:
+        # ADTS (AAC) and MPEG audio share the frame sync; ADTS has layer bits 00
+        if header[1] & 0xF6 == 0xF0:
+            return "aac"
+        if header[1] & 0xE0 == 0xE0:
+            return "mp3"
+    return None
+
+
+# Returns a float32 array for `frames` samples decoded at `sample_rate`
+Allocate = Callable[[int, int], np.ndarray]
+
+
+def _allocate(frames: int, sample_rate: int) -> np.ndarray:
+    """Fresh output array for decoded samples"""
+    return np.empty(frames, dtype=np.float32)
+
+
+def _decode_wav(
+    view: memoryview,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    allocate: Allocate = _allocate,
+    mono: bool = True,
+) -> Optional[Tuple[np.ndarray, int]]:
+    """
+    Decode PCM/float WAV data directly from the buffer
+
+    Only the frames within the time range are read, and samples that need
+    converting are written to an array from `allocate`.
+
+    Returns:
+        Tuple of (audio_array, sample_rate), or None for encodings this fast
+        path doesn't handle (the caller falls back to soundfile); without
+        `mono`, multi-channel audio has one row per channel
+    """
+    if len(view) < 12:
+        return None
+
+    position = 12
+    fmt = None
+    data_size_64 = None
+    while position + 8 <= len(view):
+        chunk_id = bytes(view[position : position + 4])
+        (chunk_size,) = struct.unpack_from("<I", view, position + 4)
+        body = position + 8
+        if chunk_id == b"fmt ":
+            if chunk_size < 16:
+                return None
+            fmt = struct.unpack_from("<HHIIHH", view, body)
+            if fmt[0] == _WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                # The real format tag is the first field of the SubFormat GUID
+                (sub_format,) = struct.unpack_from("<H", view, body + 24)
+                fmt = (sub_format,) + fmt[1:]
+        elif chunk_id == b"ds64" and chunk_size >= 16:
+            # RF64 keeps the real data size here and 0xFFFFFFFF in the data chunk
+            (data_size_64,) = struct.unpack_from("<Q", view, body + 8)
+        elif chunk_id == b"data":
+            if chunk_size == 0xFFFFFFFF and data_size_64 is not None:
+                chunk_size = data_size_64
+            break
+        # Chunks are padded to an even size
+        position = body + chunk_size + (chunk_size & 1)
+    else:
+        return None
+
+    if fmt is None:
+        return None
+    format_tag, channels, sample_rate, _, _, bits = fmt
+    if format_tag == _WAVE_FORMAT_PCM and bits in (8, 16, 32):
+        dtype = np.dtype({8: "u1", 16: "<i2", 32: "<i4"}[bits])
+    elif format_tag == _WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+        dtype = np.dtype("<f4")
+    else:
+        return None
+    if channels < 1:
+        return None
+
+    # Streamed WAVs may leave the data size at 0 or 0xFFFFFFFF; clamp to what's there
+    frame_bytes = channels * bits // 8
+    available = min(chunk_size, len(view) - body) if chunk_size else len(view) - body
+    frames = available // frame_bytes
+    if frames <= 0:
+        return None
+    first, frames = _frame_range(sample_rate, frames, start_time, end_time)
+
+    # Zero-copy view over the payload; the converted output is the only full-size array
+    samples = np.frombuffer(
+        view, dtype=dtype, count=frames * channels, offset=body + first * frame_bytes
+    )
+    if bits == 8:
+        offset, scale = 128.0, 1 / 128
+    elif dtype.kind == "i":
+        offset, scale = 0.0, 1 / (1 << (bits - 1))
+    else:
+        offset, scale = 0.0, 1.0
+
+    if channels == 1 and dtype.kind == "f":
+        audio = samples
+    elif channels == 1:
+        audio = np.multiply(
+            samples, np.float32(scale), out=allocate(frames, int(sample_rate))
+        )
+    elif not mono:
+        # Deinterleave into one contiguous row per channel
+        audio = allocate(channels * frames, int(sample_rate)).reshape(channels, frames)
+        for channel in range(channels):
+            np.multiply(
+                samples[channel::channels], np.float32(scale), out=audio[channel]
+            )
+    else:
+        # Downmix by accumulating strided channel views, cheaper than mean(axis=1)
+        audio = allocate(frames, int(sample_rate))
+        np.copyto(audio, samples[0::channels], casting="same_kind")
+        for channel in range(1, channels):
+            audio += samples[channel::channels]
+        audio *= np.float32(scale / channels)
+    if offset:
+        audio -= np.float32(offset * scale)
+    return audio, int(sample_rate)
+
+
+def decode_audio_bytes(
+    audio_bytes: Union[bytes, bytearray, memoryview],
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    mono: bool = True,
+) -> Tuple[np.ndarray, int]:
+    """
+    Decode raw encoded audio bytes to numpy array
+
+    The container is sniffed from its header: PCM/float WAV is decoded directly
+    from the buffer, other formats go straight to the backend that can read them.
+    With a time range, WAV and libsndfile formats seek to it and decode only
+    that part.
+
+    Args:
+        audio_bytes: Encoded audio file contents; read in place, never copied
+        start_time: Decode from this many seconds into the audio
+        end_time: Decode up to this many seconds into the audio
+        mono: Average the channels; otherwise return a (channels, frames) array
+            with a contiguous row per channel
+
+    Returns:
+        Tuple of (audio_array, sample_rate); float32 mono WAV input is returned as
+        a read-only view over `audio_bytes`
+    """
+    audio_data, sample_rate, _ = _decode(
+        memoryview(audio_bytes).cast("B"), start_time, end_time, _allocate, mono
+    )
+    return audio_data, sample_rate
+
+
+def _decode(
+    view: memoryview,
+    start_time: Optional[float],
+    end_time: Optional[float],
+    allocate: Allocate,
+    mono: bool = True,
+) -> Tuple[np.ndarray, int, str]:
+    """Body of decode_audio_bytes, also returning the decoder that was used"""
+    audio_format = sniff_audio_format(view)
+
+    with track_stage("decode"):
+        decoded = (
+            _decode_wav(view, start_time, end_time, allocate, mono)
+            if audio_format == "wav"
+            else None
+        )
+        if decoded is not None:
+            audio_data, sample_rate = decoded
+            if not mono and audio_data.ndim == 1:
+                audio_data = audio_data[np.newaxis]
+            return audio_data, sample_rate, "wav"
+
+        audio_buffer = BufferReader(view)
+        if audio_format in _soundfile_formats():
+            source = "soundfile"
+            audio_data, sample_rate = _read_soundfile(
+                audio_buffer, start_time, end_time
+            )
+        elif audio_format is not None:
+            # Formats libsndfile can't read (m4a/aac) are decoded by librosa
+            source = "librosa"
+            audio_data, sample_rate = _read_librosa(audio_buffer, start_time, end_time)
+        else:
+            try:
+                source = "soundfile"
+                audio_data, sample_rate = _read_soundfile(
+                    audio_buffer, start_time, end_time
+                )
+            except ValueError:
+                raise
+            except Exception:
+                # Unknown container; let librosa try its backends
+                audio_buffer.seek(0)
+                source = "librosa"
+                audio_data, sample_rate = _read_librosa(
+                    audio_buffer, start_time, end_time
+                )
+
+    if audio_data.ndim > 1 and mono:
+        audio_data = audio_data.mean(
+            axis=1,
+            dtype=np.float32,
+            out=allocate(len(audio_data), int(sample_rate)),
+        )
+    elif audio_data.ndim > 1:
+        # Decoders return (frames, channels); transpose to a row per channel
+        frames, channels = audio_data.shape
+        rows = allocate(channels * frames, int(sample_rate)).reshape(channels, frames)
+        np.copyto(rows, audio_data.T, casting="same_kind")
+        audio_data = rows
+    elif not mono:
+        audio_data = audio_data[np.newaxis]
+
+    return audio_data.astype(np.float32, copy=False), int(sample_rate), source
+
+
+def _read_soundfile(
+    audio_buffer: BufferReader,
+    start_time: Optional[float],
+    end_time: Optional[float],
+) -> Tuple[np.ndarray, int]:
+    """Decode with libsndfile, seeking to the time range if one is given"""
+    import soundfile as sf
+
+    if start_time is None and end_time is None:
+        return sf.read(audio_buffer, dtype="float32")
+    with sf.SoundFile(audio_buffer) as f:
+        first, frames = _frame_range(f.samplerate, f.frames, start_time, end_time)
+        f.seek(first)
+        return f.read(frames, dtype="float32"), f.samplerate
+
+
+def _read_librosa(
+    audio_buffer: BufferReader,
+    start_time: Optional[float],
+    end_time: Optional[float],
+) -> Tuple[np.ndarray, int]:
+    """Decode with librosa's backends, limited to the time range if one is given"""
+    import librosa
+
+    offset = start_time or 0.0
+    duration = None if end_time is None else end_time - offset
+    if duration is not None and duration <= 0:
+        raise ValueError("end_time must be after start_time")
+    audio_data, sample_rate = librosa.load(
+        audio_buffer, sr=None, mono=False, offset=offset, duration=duration
+    )
+    return audio_data.T, sample_rate
 
 
 def resample_audio(
@@ -62,12 +468,13 @@ def resample_audio(
     if original_sr == target_sr:
         return audio_data
 
-    # Use librosa for resampling
-    resampled = librosa.resample(audio_data, orig_sr=original_sr, target_sr=target_sr)
-    return resampled
+    with track_stage("resample"):
+        from .resampling import get_resampler
+
+        return get_resampler(original_sr, target_sr).resample(audio_data)
 
 
-def audio_to_tensor(audio_data: np.ndarray) -> torch.Tensor:
+def audio_to_tensor(audio_data: np.ndarray) -> "torch.Tensor":
     """
     Convert audio numpy array to PyTorch tensor
 
@@ -77,6 +484,8 @@ def audio_to_tensor(audio_data: np.ndarray) -> torch.Tensor:
     Returns:
         Audio data as PyTorch tensor
     """
+    import torch
+
     return torch.from_numpy(audio_data)
 
 
@@ -92,3 +501,359 @@ def get_audio_duration(audio_data: np.ndarray, sample_rate: int) -> float:
         Duration in seconds
     """
     return len(audio_data) / sample_rate
+
+
+# Longest decode held in a worker's reusable buffer (16 MiB of float32)
+SCRATCH_MAX_SAMPLES = 1 << 22
+
+
+class _Scratch(threading.local):
+    """Per-thread float32 buffer for decoded audio that is resampled right away"""
+
+    def __init__(self):
+        self.array = np.empty(0, dtype=np.float32)
+
+    def take(self, frames: int) -> Optional[np.ndarray]:
+        """The first `frames` samples of the buffer, or None if it can't hold them"""
+        if frames > SCRATCH_MAX_SAMPLES:
+            return None
+        if len(self.array) < frames:
+            # Grow geometrically so a worker settles after its first few requests
+            size = min(SCRATCH_MAX_SAMPLES, max(frames, 2 * len(self.array)))
+            self.array = np.empty(size, dtype=np.float32)
+        return self.array[:frames]
+
+
+_scratch = _Scratch()
+
+
+class _Allocator:
+    """Allocates decode output, in the thread's scratch buffer if it's resampled"""
+
+    __slots__ = ("target_rate", "allocations")
+
+    def __init__(self, target_rate: Optional[int]):
+        self.target_rate = target_rate
+        self.allocations = 0
+
+    def __call__(self, frames: int, sample_rate: int) -> np.ndarray:
+        if self.target_rate is not None and sample_rate != self.target_rate:
+            scratch = _scratch.take(frames)
+            if scratch is not None:
+                return scratch
+        self.allocations += 1
+        return np.empty(frames, dtype=np.float32)
+
+
+class AudioBuffer:
+    """
+    Mono float32 audio passed between the preprocessing stages
+
+    Stages replace `samples` rather than handing arrays along, and count every
+    full-length array they allocate in `copies`. Audio decoded only to be
+    resampled goes to a per-thread scratch buffer, so a request allocates one
+    array at the model's rate at most. `samples` is a read-only view over the
+    encoded bytes for float32 mono WAV at the target rate.
+
+    Audio decoded with split_channels holds a (channels, frames) array instead,
+    and split() gives each channel a mono buffer of its own in `tracks`.
+    """
+
+    __slots__ = (
+        "samples",
+        "sample_rate",
+        "source",
+        "original_sample_rate",
+        "copies",
+        "chunks",
+        "tracks",
+    )
+
+    def __init__(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        source: str = "pcm",
+        original_sample_rate: Optional[int] = None,
+        copies: int = 0,
+    ):
+        """
+        Initialize the buffer
+
+        Args:
+            samples: Contiguous float32 samples, mono or one row per channel
+            sample_rate: Sample rate of `samples`
+            source: Decoder the samples came from ("wav", "soundfile",
+                "librosa" or "pcm")
+            original_sample_rate: Sample rate before resampling
+            copies: Full-length arrays allocated for the samples so far
+        """
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.source = source
+        self.original_sample_rate = original_sample_rate or sample_rate
+        self.copies = copies
+        self.chunks: Optional[List[Tuple[int, int]]] = None
+        self.tracks: Optional[List["AudioBuffer"]] = None
+
+    @classmethod
+    def decode(
+        cls,
+        audio_bytes: Union[bytes, bytearray, memoryview],
+        sample_rate: Optional[int] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        split_channels: bool = False,
+    ) -> "AudioBuffer":
+        """
+        Decode encoded audio, resampled to `sample_rate`
+
+        Args:
+            audio_bytes: Encoded audio file contents; read in place
+            sample_rate: Sample rate to resample to (the file's own if None)
+            start_time: Decode from this many seconds into the audio
+            end_time: Decode up to this many seconds into the audio
+            split_channels: Keep the channels apart instead of averaging them
+
+        Returns:
+            The decoded audio
+        """
+        allocate = _Allocator(sample_rate)
+        samples, original_sample_rate, source = _decode(
+            memoryview(audio_bytes).cast("B"),
+            start_time,
+            end_time,
+            allocate,
+            mono=not split_channels,
+        )
+        # Decoder libraries return arrays of their own
+        copies = allocate.allocations + (source != "wav")
+        buffer = cls(samples, original_sample_rate, source, copies=copies)
+        if sample_rate is not None:
+            # Resampling right away keeps scratch-backed samples from escaping
+            buffer.resample(sample_rate)
+        return buffer
+
+    @classmethod
+    def from_pcm(cls, samples: np.ndarray, sample_rate: int) -> "AudioBuffer":
+        """Wrap decoded samples, converting them only if they're not float32"""
+        contiguous = np.ascontiguousarray(samples, dtype=np.float32)
+        return cls(contiguous, sample_rate, copies=int(contiguous is not samples))
+
+    @property
+    def duration(self) -> float:
+        """Length of the audio in seconds"""
+        return self.samples.shape[-1] / self.sample_rate
+
+    def resample(self, sample_rate: int) -> "AudioBuffer":
+        """Resample the audio in place of the current samples, returning self"""
+        if sample_rate == self.sample_rate:
+            return self
+        if self.samples.ndim > 1:
+            # Channels are resampled one by one, then gathered back into rows
+            self.samples = np.stack(
+                [
+                    resample_audio(channel, self.sample_rate, sample_rate)
+                    for channel in self.samples
+                ]
+            )
+            self.copies += 1
+        else:
+            self.samples = resample_audio(self.samples, self.sample_rate, sample_rate)
+        self.sample_rate = sample_rate
+        self.copies += 1
+        self.chunks = self.tracks = None
+        return self
+
+    def split(
+        self, max_chunk_seconds: float = 30.0, use_vad: bool = True
+    ) -> List[Tuple[int, int]]:
+        """
+        Split the audio into inference chunks, kept in `chunks`
+
+        Audio with a row per channel is split channel by channel instead: each
+        of `tracks` gets its own chunks, and `chunks` is left empty.
+        """
+        if self.samples.ndim == 1:
+            self.chunks = split_for_inference(
+                self.samples, self.sample_rate, max_chunk_seconds, use_vad
+            )
+            return self.chunks
+
+        self.tracks = []
+        for channel in self.samples:
+            track = AudioBuffer(
+                channel, self.sample_rate, self.source, self.original_sample_rate
+            )
+            track.split(max_chunk_seconds, use_vad)
+            self.tracks.append(track)
+        self.chunks = []
+        return self.chunks
+
+
+def synthetic_speech(duration: float, sample_rate: int = 16000) -> np.ndarray:
+    """
+    Deterministic speech-like test signal (amplitude-modulated tone plus noise)
+
+    Args:
+        duration: Length in seconds
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Float32 mono samples
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    return (tone + 0.01 * rng.standard_normal(t.shape)).astype(np.float32)
+
+
+def _frame_energy_db(audio_data: np.ndarray, frame_length: int) -> np.ndarray:
+    """Mean energy in dBFS of consecutive non-overlapping frames"""
+    n_frames = len(audio_data) // frame_length
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio_data[: n_frames * frame_length].reshape(n_frames, frame_length)
+    energy = np.einsum("ij,ij->i", frames, frames) / frame_length
+    return 10.0 * np.log10(energy + 1e-10)
+
+
+def _true_runs(mask: np.ndarray) -> np.ndarray:
+    """Return (start, end) index pairs of consecutive True runs in a mask"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.stack((np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)), axis=1)
+
+
+def detect_speech_regions(
+    audio_data: np.ndarray,
+    sample_rate: int,
+    frame_ms: float = 30.0,
+    min_silence_ms: float = 300.0,
+    min_speech_ms: float = 250.0,
+    padding_ms: float = 100.0,
+) -> List[Tuple[int, int]]:
+    """
+    Find speech regions with a vectorized frame-energy voice activity detector
+
+    Args:
+        audio_data: Mono audio data as numpy array
+        sample_rate: Sample rate in Hz
+        frame_ms: Analysis frame length in milliseconds
+        min_silence_ms: Shorter pauses are treated as part of the speech
+        min_speech_ms: Shorter bursts are discarded as noise
+        padding_ms: Audio kept on each side of a region
+
+    Returns:
+        List of (start_sample, end_sample) speech regions in time order
+    """
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    energy_db = _frame_energy_db(audio_data, frame_length)
+    if len(energy_db) == 0:
+        return [(0, len(audio_data))] if len(audio_data) else []
+
+    # Adapt to the recording: sit above the noise floor, but never so high
+    # that continuous speech without pauses is rejected
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = max(-50.0, min(noise_floor + 10.0, energy_db.max() - 20.0))
+    speech = energy_db > threshold
+
+    # Close short pauses inside speech
+    min_silence = int(np.ceil(min_silence_ms / frame_ms))
+    gaps = _true_runs(~speech)
+    interior = (gaps[:, 0] > 0) & (gaps[:, 1] < len(speech))
+    for start, end in gaps[interior & (gaps[:, 1] - gaps[:, 0] < min_silence)]:
+        speech[start:end] = True
+
+    # Drop bursts too short to be speech
+    runs = _true_runs(speech)
+    runs = runs[runs[:, 1] - runs[:, 0] >= int(np.ceil(min_speech_ms / frame_ms))]
+
+    padding = int(sample_rate * padding_ms / 1000)
+    regions: List[Tuple[int, int]] = []
+    for start_frame, end_frame in runs:
+        start = max(0, start_frame * frame_length - padding)
+        end = end_frame * frame_length
+        # Let a region reaching the last full frame cover the trailing samples
+        end = len(audio_data) if end_frame == len(speech) else end
+        end = min(len(audio_data), end + padding)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((int(start), int(end)))
+    return regions
+
+
+def chunk_speech_regions(
+    audio_data: np.ndarray,
+    sample_rate: int,
+    max_chunk_seconds: float = 30.0,
+    frame_ms: float = 30.0,
+    **vad_kwargs,
+) -> List[Tuple[int, int]]:
+    """
+    Split audio into speech chunks no longer than a maximum duration
+
+    Regions longer than the maximum are cut at the quietest frame in the last
+    fifth of each allowed span, so cuts land in pauses where possible.
+
+    Args:
+        audio_data: Mono audio data as numpy array
+        sample_rate: Sample rate in Hz
+        max_chunk_seconds: Maximum chunk duration in seconds
+        frame_ms: Analysis frame length in milliseconds
+        **vad_kwargs: Extra arguments for detect_speech_regions
+
+    Returns:
+        List of (start_sample, end_sample) chunks in time order
+    """
+    regions = detect_speech_regions(
+        audio_data, sample_rate, frame_ms=frame_ms, **vad_kwargs
+    )
+    max_length = int(max_chunk_seconds * sample_rate)
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+
+    chunks: List[Tuple[int, int]] = []
+    for start, end in regions:
+        while end - start > max_length:
+            search_from = start + int(max_length * 0.8)
+            search_to = start + max_length
+            energy_db = _frame_energy_db(
+                audio_data[search_from:search_to], frame_length
+            )
+            if len(energy_db):
+                cut = search_from + int(np.argmin(energy_db)) * frame_length
+            else:
+                cut = search_to
+            chunks.append((start, cut))
+            start = cut
+        chunks.append((start, end))
+    return chunks
+
+
+def split_for_inference(
+    audio_data: np.ndarray,
+    sample_rate: int,
+    max_chunk_seconds: float = 30.0,
+    use_vad: bool = True,
+) -> List[Tuple[int, int]]:
+    """
+    Split audio into the chunks sent to the model
+
+    Args:
+        audio_data: Mono audio data as numpy array
+        sample_rate: Sample rate in Hz
+        max_chunk_seconds: Maximum chunk duration in seconds
+        use_vad: Split on voice activity; otherwise cut fixed-length chunks
+
+    Returns:
+        List of (start_sample, end_sample) chunks in time order
+    """
+    if use_vad:
+        with track_stage("vad"):
+            return chunk_speech_regions(audio_data, sample_rate, max_chunk_seconds)
+
+    step = int(max_chunk_seconds * sample_rate)
+    return [
+        (start, min(start + step, len(audio_data)))
+        for start in range(0, len(audio_data), step)
+    ]
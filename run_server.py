@@ -2,8 +2,65 @@
 """Script to run the ASR service"""
 
 import argparse
+import multiprocessing
 import os
-import uvicorn
+import tempfile
+import time
+
+
+def inference_socket_paths(count: int) -> list:
+    """
+    Choose the inference sockets and export them as INFERENCE_SOCKETS
+
+    Must run before anything imports `config`, which reads the variable once;
+    with a single worker uvicorn reuses this process's modules.
+
+    Args:
+        count: Number of inference processes
+
+    Returns:
+        Unix socket paths, one per inference process
+    """
+    socket_dir = tempfile.mkdtemp(prefix="ole-asr-")
+    paths = [os.path.join(socket_dir, f"inference-{i}.sock") for i in range(count)]
+    os.environ["INFERENCE_SOCKETS"] = ",".join(paths)
+    return paths
+
+
+def start_inference_servers(socket_paths: list) -> list:
+    """
+    Start model-owning inference processes and wait until they are ready
+
+    Args:
+        socket_paths: Unix socket path of each inference process
+
+    Returns:
+        List of (process, socket_path) tuples
+    """
+    from ole_asr.settings import provider_settings
+    from ole_asr.inference_server import run_inference_server
+
+    # Spawn rather than fork so the children don't inherit torch/thread state
+    context = multiprocessing.get_context("spawn")
+    servers = []
+    for index, socket_path in enumerate(socket_paths):
+        process = context.Process(
+            target=run_inference_server,
+            args=(socket_path, provider_settings()),
+            name=f"asr-inference-{index}",
+            daemon=True,
+        )
+        process.start()
+        servers.append((process, socket_path))
+
+    # The socket only appears once the model has been loaded
+    for process, socket_path in servers:
+        while not os.path.exists(socket_path):
+            if not process.is_alive():
+                raise RuntimeError(f"Inference process {process.name} exited")
+            time.sleep(0.1)
+        print(f"Inference process {process.name} ready on {socket_path}")
+    return servers
 
 
 def main():
@@ -27,24 +84,50 @@ def main():
     parser.add_argument(
         "--workers", type=int, default=1, help="Number of worker processes"
     )
+    parser.add_argument(
+        "--shared-model",
+        action="store_true",
+        help="Load the model once in dedicated inference processes shared by all workers",
+    )
+    parser.add_argument(
+        "--inference-processes",
+        type=int,
+        default=1,
+        help="Number of model-owning inference processes (with --shared-model)",
+    )
 
     args = parser.parse_args()
 
+    servers = []
+    if args.shared_model:
+        # Workers read INFERENCE_SOCKETS when they import the config and then
+        # forward inference to the sockets, so it's set before any import
+        socket_paths = inference_socket_paths(args.inference_processes)
+        servers = start_inference_servers(socket_paths)
+
     print(f"Starting Ole ASR Service on {args.host}:{args.port}")
     print(f"Development mode (reload): {args.reload}")
     print(f"Workers: {args.workers}")
+    if servers:
+        print(f"Shared model inference processes: {len(servers)}")
     print("Access the service at:")
     print(f"  http://{args.host}:{args.port}")
     print(f"  http://{args.host}:{args.port}/docs (Swagger UI)")
 
-    uvicorn.run(
-        "ole_asr.api:app",
-        host=args.host,
-        port=args.port,
-        reload=args.reload,
-        workers=args.workers,
-        log_level="info",
-    )
+    import uvicorn
+
+    try:
+        uvicorn.run(
+            "ole_asr.api:app",
+            host=args.host,
+            port=args.port,
+            reload=args.reload,
+            workers=args.workers,
+            log_level="info",
+        )
+    finally:
+        for process, _ in servers:
+            process.terminate()
 
 
 if __name__ == "__main__":
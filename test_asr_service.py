@@ -12,6 +12,32 @@ from ole_asr.services import ASRService
 from ole_asr.models import ASRRequest, AudioFormat
 
 
+def _fake_provider(transcribe=lambda clip: "", on_batch=None, **config):
+    """
+    Qwen3ASRProvider with the model replaced by a function of each clip
+
+    Args:
+        transcribe: Maps one clip to its text
+        on_batch: Called with the clips of every pipeline call, e.g. to record
+            batch sizes or to fail a call
+        **config: Qwen3ASRProvider arguments
+    """
+    from ole_asr.providers.qwen3_asr import Qwen3ASRProvider
+
+    def pipeline(audio):
+        clips = audio if isinstance(audio, list) else [audio]
+        if on_batch is not None:
+            on_batch(clips)
+        results = [{"text": transcribe(clip)} for clip in clips]
+        return results if isinstance(audio, list) else results[0]
+
+    class FakeProvider(Qwen3ASRProvider):
+        def _load_model(self):
+            self.pipeline = pipeline
+
+    return FakeProvider(**config)
+
+
 def test_service_initialization():
     """Test that the ASR service initializes correctly"""
     print("Testing ASR service initialization...")
@@ -70,16 +96,1472 @@ async def test_service_async():
         return False
 
 
+async def test_batch_scheduler():
+    """Test that concurrent submissions are grouped into batches"""
+    print("\nTesting dynamic batch scheduler...")
+
+    import numpy as np
+    from ole_asr.batching import BatchScheduler
+
+    calls = []
+
+    def batch_fn(batch):
+        calls.append(len(batch))
+        return [len(audio) for audio in batch]
+
+    scheduler = BatchScheduler(
+        batch_fn, max_batch_size=4, max_wait_ms=50, sample_rate=16000
+    )
+    clips = [np.zeros(1600 * (i + 1), dtype=np.float32) for i in range(6)]
+    results = await asyncio.gather(*(scheduler.submit(c) for c in clips))
+    await scheduler.close()
+    stats = scheduler.stats()
+
+    assert results == [1600 * (i + 1) for i in range(6)]
+    assert calls == [4, 2], calls
+    assert stats["batch_size"]["count"] == 2
+    assert stats["queue_wait_seconds"]["count"] == 6
+    print(f"✓ Batches dispatched: {calls}")
+
+
+async def test_batch_fallback():
+    """Test a failing batched call falls back to clips, failing only bad ones"""
+    print("\nTesting batch fallback...")
+
+    import numpy as np
+
+    calls = []
+
+    def listless(clips):
+        calls.append(len(clips))
+        if len(clips) > 1:
+            raise TypeError("list input not supported")
+
+    def transcribe(clip):
+        if not clip.any():
+            raise ValueError("silent clip")
+        return str(len(clip))
+
+    provider = _fake_provider(
+        transcribe, listless, max_batch_size=4, max_batch_wait_ms=50
+    )
+    await provider.initialize()
+    clips = [np.full(1600 * (i + 1), 0.1, dtype=np.float32) for i in range(4)]
+    clips[2][:] = 0
+    results = await asyncio.gather(
+        *(provider.transcribe_pcm(clip, 16000) for clip in clips),
+        return_exceptions=True,
+    )
+    await provider.close()
+
+    assert calls == [4, 1, 1, 1, 1], calls
+    assert results[:2] == ["1600", "3200"] and results[3] == "6400", results
+    assert isinstance(results[2], ValueError), results[2]
+    print("✓ Batch retried clip by clip; one bad clip failed alone")
+
+
+async def test_inference_workers():
+    """Test that inference_workers batches run through the pipeline at once"""
+    print("\nTesting inference workers...")
+
+    import threading
+    import numpy as np
+
+    workers = 3
+    # Every call waits for the others, so this only passes if all overlap
+    barrier = threading.Barrier(workers, timeout=5)
+
+    provider = _fake_provider(
+        lambda clip: str(barrier.wait()), inference_workers=workers, max_batch_size=1
+    )
+    await provider.initialize()
+    clip = np.zeros(1600, dtype=np.float32)
+    texts = await asyncio.gather(
+        *(provider.transcribe_pcm(clip, 16000) for _ in range(workers))
+    )
+    assert sorted(texts) == [str(i) for i in range(workers)], texts
+    assert provider.scheduler.stats()["batches_processed"] == workers
+    await provider.close()
+
+    print(f"✓ {workers} batches ran through the pipeline at once")
+
+
+async def test_streaming_session():
+    """Test that streaming emits partial results and contiguous final segments"""
+    print("\nTesting streaming session...")
+
+    import numpy as np
+    from ole_asr.streaming import StreamingSession, strip_overlap
+
+    assert strip_overlap("the quick brown", "quick brown fox") == "fox"
+    assert strip_overlap("你好世界", "世界再见") == "再见"
+
+    async def transcribe(audio, sample_rate):
+        return f"{len(audio)}"
+
+    session = StreamingSession(
+        transcribe,
+        sample_rate=1000,
+        window_seconds=4,
+        step_seconds=1,
+        overlap_seconds=1,
+    )
+    events = []
+    for _ in range(10):
+        session.feed(np.zeros(1000, dtype=np.float32))
+        events.extend(await session.poll())
+    events.extend(await session.finish())
+
+    finals = [e["segment"] for e in events if e["type"] == "final"]
+    assert any(e["type"] == "partial" for e in events)
+    assert [(s.start_time, s.end_time) for s in finals] == [
+        (0.0, 3.0),
+        (3.0, 6.0),
+        (6.0, 9.0),
+        (9.0, 10.0),
+    ], finals
+    assert session.stats()["time_to_first_token"] is not None
+    print(f"✓ Streaming produced {len(finals)} final segments")
+
+
+def test_speech_chunking():
+    """Test that VAD finds speech regions and bounds chunk length"""
+    print("\nTesting VAD chunking...")
+
+    import numpy as np
+    from ole_asr.streaming import join_texts
+    from ole_asr.utils import chunk_speech_regions, detect_speech_regions
+
+    sr = 16000
+    silence = np.zeros(sr, dtype=np.float32)
+    speech = (0.3 * np.sin(np.arange(sr * 3) * 0.1)).astype(np.float32)
+    audio = np.concatenate([silence, speech, silence, speech, silence])
+
+    regions = detect_speech_regions(audio, sr, padding_ms=0)
+    assert len(regions) == 2, regions
+    assert abs(regions[0][0] / sr - 1.0) < 0.05
+    assert abs(regions[1][1] / sr - 8.0) < 0.05
+
+    chunks = chunk_speech_regions(audio, sr, max_chunk_seconds=2.0, padding_ms=0)
+    assert all(e - s <= 2 * sr for s, e in chunks), chunks
+    assert chunks[0][0] == regions[0][0] and chunks[-1][1] == regions[-1][1]
+
+    # Chunk transcripts are spaced like the script they are written in
+    assert join_texts(["你好", "世界"]) == "你好世界"
+    assert join_texts(["こんにちは", "", "世界"]) == "こんにちは世界"
+    assert join_texts(["hello", "big world"]) == "hello big world"
+    assert join_texts(["hello", "world"]) == "hello world"
+    print(f"✓ Found {len(regions)} speech regions, {len(chunks)} chunks")
+
+
+def test_metrics_registry():
+    """Test Prometheus text rendering of counters, gauges and histograms"""
+    print("\nTesting metrics registry...")
+
+    from ole_asr.metrics import MetricsRegistry, provider_context, track_stage
+
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("status",))
+    depth = registry.gauge("queue_depth", "Queue depth")
+    latency = registry.histogram("latency_seconds", "Latency", ("stage",), (0.1, 1))
+
+    requests.labels(status="ok").inc(2)
+    depth.labels().set_function(lambda: 3)
+    latency.labels(stage="decode").observe(0.05)
+    latency.labels(stage="decode").observe(0.5)
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{status="ok"} 2' in text
+    assert "queue_depth 3" in text
+    assert 'latency_seconds_bucket{stage="decode",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="decode",le="+Inf"} 2' in text
+    assert 'latency_seconds_count{stage="decode"} 2' in text
+
+    with provider_context("fake"):
+        with track_stage("vad"):
+            pass
+    from ole_asr.metrics import STAGE_SECONDS
+
+    assert STAGE_SECONDS.labels(provider="fake", stage="vad").count == 1
+    print("✓ Metrics rendered in Prometheus text format")
+
+
+def test_wav_fast_path():
+    """Test that the WAV fast path matches soundfile and sniffing routes formats"""
+    print("\nTesting WAV fast-path decoder...")
+
+    import io
+    import numpy as np
+    import soundfile as sf
+    from ole_asr.utils import decode_audio_bytes, sniff_audio_format
+
+    rng = np.random.default_rng(0)
+    for subtype in ["PCM_U8", "PCM_16", "PCM_32", "FLOAT"]:
+        for channels in [1, 2]:
+            audio = (0.2 * rng.standard_normal((1001, channels))).clip(-1, 1)
+            buffer = io.BytesIO()
+            sf.write(buffer, audio, 22050, format="WAV", subtype=subtype)
+            payload = buffer.getvalue()
+
+            expected, _ = sf.read(io.BytesIO(payload), dtype="float32")
+            expected = expected.mean(axis=1) if channels > 1 else expected
+            decoded, sample_rate = decode_audio_bytes(payload)
+            assert sample_rate == 22050 and decoded.dtype == np.float32
+            assert np.allclose(decoded, expected, atol=1e-6), subtype
+
+    buffer = io.BytesIO()
+    sf.write(buffer, np.zeros(1600), 16000, format="FLAC")
+    assert sniff_audio_format(buffer.getvalue()) == "flac"
+    assert sniff_audio_format(b"\x00\x00\x00\x20ftypM4A ") == "m4a"
+    assert sniff_audio_format(b"\xff\xf1\x50\x80") == "aac"
+    assert sniff_audio_format(b"ID3\x04") == "mp3"
+    print("✓ WAV fast path matches soundfile; formats sniffed correctly")
+
+
+def test_resampling():
+    """Test the resampler against librosa and streaming against whole clips"""
+    print("\nTesting resampling engine...")
+
+    import librosa
+    import numpy as np
+    from ole_asr.resampling import StreamingResampler, get_resampler
+
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal(44100 + 123).astype(np.float32)
+    resampler = get_resampler(44100, 16000)
+    assert get_resampler(44100, 16000) is resampler
+
+    expected = librosa.resample(audio, orig_sr=44100, target_sr=16000)
+    resampled = resampler.resample(audio)
+    assert len(resampled) == len(expected)
+    assert np.allclose(resampled, expected, atol=1e-6)
+
+    clips = [audio[:1000], audio, audio[:7]]
+    for clip, batched in zip(clips, resampler.resample_batch(clips)):
+        assert np.allclose(batched, resampler.resample(clip), atol=1e-6)
+
+    stream = StreamingResampler(44100, 16000)
+    pieces = [stream.process(audio[i : i + 441]) for i in range(0, len(audio), 441)]
+    streamed = np.concatenate(pieces + [stream.flush()])
+    length = min(len(streamed), len(resampled))
+    assert length >= len(resampled) - 1
+    assert np.allclose(streamed[:length], resampled[:length], atol=1e-6)
+    print("✓ Resampler matches librosa; streaming matches whole-clip output")
+
+
+async def test_admission_control():
+    """Test queue bounds, priority order and deadlines of admission control"""
+    print("\nTesting admission control...")
+
+    import asyncio
+    import time
+    from ole_asr.admission import (
+        AdmissionController,
+        DeadlineExceededError,
+        QueueFullError,
+    )
+    from ole_asr.models import Priority
+
+    admission = AdmissionController(
+        max_active_seconds=10.0,
+        max_queued_seconds={Priority.INTERACTIVE: 10.0, Priority.BATCH: 20.0},
+    )
+    order = []
+
+    async def run(cost, priority, name):
+        async with admission.slot(cost, priority):
+            order.append(name)
+
+    await admission.acquire(10.0)
+    batch = asyncio.create_task(run(5.0, Priority.BATCH, "batch"))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(run(5.0, Priority.INTERACTIVE, "interactive"))
+    await asyncio.sleep(0)
+
+    try:
+        await admission.acquire(6.0, Priority.INTERACTIVE)
+        raise AssertionError("queue limit not enforced")
+    except QueueFullError as e:
+        assert e.retry_after is not None
+
+    try:
+        await admission.acquire(1.0, deadline=time.monotonic() + 0.05)
+        raise AssertionError("deadline not enforced")
+    except DeadlineExceededError:
+        pass
+
+    admission.release(10.0)
+    await asyncio.gather(batch, interactive)
+    assert order == ["interactive", "batch"], order
+    assert admission.active_seconds == 0
+    assert admission.stats()["rejected"] == {"queue_full": 1, "deadline": 1}
+    print(f"✓ Admission order {order}, rejections {admission.stats()['rejected']}")
+
+
+async def test_result_cache():
+    """Test cache hits, in-flight coalescing, LRU eviction and the disk tier"""
+    print("\nTesting transcription result cache...")
+
+    import tempfile
+    import numpy as np
+    from ole_asr.cache import TranscriptionCache
+    from ole_asr.models import ASRResponse
+
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ASRResponse(text="hello", segments=[], duration=1.0, model="x")
+
+    with tempfile.TemporaryDirectory() as disk_dir:
+        cache = TranscriptionCache(max_bytes=300, disk_dir=disk_dir)
+        audio = np.zeros(16000, dtype=np.float32)
+        key = cache.make_key(audio, "fake", "en", 16000)
+        assert key != cache.make_key(audio, "fake", "zh", 16000)
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute(key, compute) for _ in range(5))
+        )
+        assert len(calls) == 1 and all(r.text == "hello" for r in results)
+        assert cache.coalesced == 4
+
+        await cache.get_or_compute(key, compute)
+        assert cache.hits == 1
+
+        # Push the first entry out of the memory tier, then find it on disk
+        for i in range(5):
+            other = cache.make_key(audio + i + 1, "fake", "en", 16000)
+            await cache.get_or_compute(other, compute)
+        assert cache.evictions > 0
+        await cache.get_or_compute(key, compute)
+        assert cache.disk_hits == 1, cache.stats()
+
+    print(f"✓ Cache stats: {cache.stats()}")
+
+
+async def test_cache_coalesced_errors():
+    """Test that waiting callers only share failures caused by the audio"""
+    print("\nTesting coalesced cache errors...")
+
+    from ole_asr.admission import DeadlineExceededError
+    from ole_asr.cache import TranscriptionCache
+    from ole_asr.models import ASRResponse
+
+    cache = TranscriptionCache()
+    computed = []
+
+    def transcription(timeout):
+        async def compute():
+            computed.append(timeout)
+            try:
+                await asyncio.wait_for(asyncio.sleep(0.1), timeout)
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError("Deadline passed")
+            return ASRResponse(text="ok", segments=[], duration=1.0, model="x")
+
+        return compute
+
+    # The short-deadline leader times out; the patient follower still succeeds
+    short, patient = await asyncio.gather(
+        cache.get_or_compute("a", transcription(0.02)),
+        cache.get_or_compute("a", transcription(1.0)),
+        return_exceptions=True,
+    )
+    assert isinstance(short, DeadlineExceededError), short
+    assert patient.text == "ok" and computed == [0.02, 1.0], computed
+
+    async def undecodable():
+        await asyncio.sleep(0.05)
+        raise ValueError("Could not decode audio")
+
+    async def unreachable():
+        raise AssertionError("follower recomputed undecodable audio")
+
+    results = await asyncio.gather(
+        cache.get_or_compute("b", undecodable),
+        cache.get_or_compute("b", unreachable),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, ValueError) for result in results), results
+
+    print("✓ Deadlines retried by waiting callers, decode errors shared")
+
+
+async def test_job_queue():
+    """Test bulk jobs complete, report throughput and resume after a restart"""
+    print("\nTesting bulk job queue...")
+
+    import os
+    import tempfile
+    from ole_asr.jobs import JobManager, JobStore
+    from ole_asr.models import ASRResponse, JobRequest, JobStatus
+
+    class EchoService:
+        """Returns the audio length as the transcript"""
+
+        async def transcribe(self, request, provider_name=None):
+            await asyncio.sleep(0.01)
+            if request.audio_buffer.tobytes() == b"bad":
+                raise ValueError("undecodable")
+            return ASRResponse(
+                text=str(len(request.audio_buffer)),
+                segments=[],
+                duration=1.0,
+                model="echo",
+            )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "jobs.sqlite3")
+        job = JobRequest(
+            requests=[ASRRequest.from_bytes(b"x" * (i + 1)) for i in range(6)]
+            + [ASRRequest.from_bytes(b"bad")]
+        )
+
+        # Simulate a crash: items claimed as running are never finished
+        manager = JobManager(EchoService(), db_path, concurrency=2)
+        await manager.start()
+        manager._worker.cancel()
+        info = await manager.submit(job)
+        await manager._call(manager.store.claim, 3)
+        await manager.stop()
+
+        store = JobStore(db_path)
+        assert store.recover() == 3
+        store.close()
+
+        manager = JobManager(EchoService(), db_path, concurrency=2)
+        await manager.start()
+        streamed = [item async for item in manager.stream(info.id)]
+        done = await manager.get(info.id)
+        results = await manager.results(info.id)
+        await manager.stop()
+
+    assert done.status == JobStatus.COMPLETED, done
+    assert (done.completed, done.failed, done.pending) == (6, 1, 0)
+    assert done.audio_seconds == 6.0 and done.items_per_second > 0
+    assert len(streamed) == 7
+    assert [r.result.text for r in results[:6]] == ["1", "2", "3", "4", "5", "6"]
+    assert results[6].status == JobStatus.FAILED and results[6].error
+    print(f"✓ Job resumed and finished at {done.items_per_second:.1f} items/s")
+
+
+async def test_offline_batch():
+    """Test the offline batch run decodes in workers, writes JSONL and resumes"""
+    print("\nTesting offline batch transcription...")
+
+    import json
+    import os
+    import tempfile
+    import numpy as np
+    import soundfile as sf
+    from ole_asr.models import ASRResponse
+    from ole_asr.offline import BatchRun, iter_inputs
+
+    class PreparedProvider:
+        """Echoes the number of chunks it was given"""
+
+        async def prepare(self, request):
+            raise AssertionError("audio should arrive decoded")
+
+        async def transcribe_prepared(self, request, prepared):
+            return ASRResponse(
+                text=f"{len(prepared.chunks)} chunks",
+                segments=[],
+                duration=prepared.duration,
+                model="x",
+            )
+
+        async def health_check(self):
+            return True
+
+    service = ASRService()
+    service.register_provider("prepared", PreparedProvider())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "in", "sub"))
+        for i, name in enumerate(["a.wav", "b.flac", "sub/c.wav"]):
+            sf.write(
+                os.path.join(tmp, "in", name),
+                np.full(8000 * (i + 1), 0.1, dtype=np.float32),
+                8000,
+            )
+        with open(os.path.join(tmp, "in", "broken.wav"), "wb") as f:
+            f.write(b"RIFF")
+        output = os.path.join(tmp, "out.jsonl")
+
+        first = BatchRun(service, output, decode_workers=2, use_vad=False)
+        summary = await first.run(iter_inputs(os.path.join(tmp, "in")))
+        assert (summary["completed"], summary["failed"]) == (3, 1), summary
+        assert abs(summary["audio_hours"] * 3600 - 6.0) < 1e-6
+
+        # A rerun only retries the file that failed
+        second = BatchRun(service, output, decode_workers=1, use_vad=False)
+        summary = await second.run(iter_inputs(os.path.join(tmp, "in")))
+        assert (summary["skipped"], summary["failed"]) == (3, 1), summary
+
+        with open(output) as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == 5
+        durations = sorted(r["duration"] for r in records if "error" not in r)
+        assert durations == [1.0, 2.0, 3.0], durations
+
+    print(f"✓ Offline batch wrote {len(records)} records and resumed")
+
+
+async def test_model_manager():
+    """Test lazy loading, load coalescing and LRU eviction under a budget"""
+    print("\nTesting model manager...")
+
+    from ole_asr.model_manager import ModelManager
+    from ole_asr.models import ASRResponse
+
+    built = []
+
+    class SizedProvider:
+        def __init__(self, name):
+            self.name = name
+            self.closed = False
+            built.append(name)
+
+        async def initialize(self):
+            await asyncio.sleep(0.01)
+
+        def memory_bytes(self):
+            return 100
+
+        async def transcribe(self, request):
+            return ASRResponse(
+                text=self.name, segments=[], duration=0.0, model=self.name
+            )
+
+        async def health_check(self):
+            return True
+
+        async def close(self):
+            self.closed = True
+
+    service = ASRService(models=ModelManager(memory_budget_bytes=250))
+    for name in ("a", "b", "c"):
+        service.register_model(
+            name, lambda name=name: SizedProvider(name), pinned=name == "a"
+        )
+    await service.models.preload()
+    assert built == ["a"]
+
+    request = ASRRequest(audio="")
+    responses = await asyncio.gather(
+        *(service.transcribe(request, "b") for _ in range(3))
+    )
+    assert [r.text for r in responses] == ["b"] * 3
+    assert built == ["a", "b"], built
+
+    b = service.models.resident()["b"]
+    await service.transcribe(request, "c")
+    stats = service.models.stats()
+    assert b.closed and stats["models"]["b"]["state"] == "unloaded"
+    assert stats["models"]["a"]["state"] == "loaded"
+    assert stats["resident_bytes"] == 200 and stats["evictions"] == 1
+    assert stats["coalesced"] == 2
+
+    # A model in use is not evicted, even over budget
+    async with service.models.use("c"):
+        await service.transcribe(request, "b")
+    assert service.models.stats()["models"]["c"]["state"] == "loaded"
+
+    await service.close()
+    print(f"✓ Models loaded {built}, evictions {service.models.evictions}")
+
+
+async def test_evicted_model_freed():
+    """Test an evicted provider's model is freed, not kept alive by metrics"""
+    print("\nTesting evicted model is freed...")
+
+    import gc
+    import weakref
+    import numpy as np
+    from ole_asr.model_manager import ModelManager
+    from ole_asr.metrics import registry
+
+    manager = ModelManager(memory_budget_bytes=150)
+    for name in ("evict-a", "evict-b"):
+        manager.register(
+            name,
+            lambda name=name: _fake_provider(
+                lambda clip: "freed", name=name, inference_workers=2
+            ),
+            memory_bytes=100,
+        )
+    pipelines = []
+    async with manager.use("evict-a") as provider:
+        assert await provider.transcribe_pcm(np.zeros(1600, np.float32), 16000)
+        pipelines.append(weakref.ref(provider.pipeline))
+        del provider
+    await manager.load("evict-b")
+    assert manager.stats()["models"]["evict-a"]["state"] == "unloaded"
+
+    # Scraping still works and the evicted provider's gauges read 0
+    assert 'ole_asr_batch_queue_depth{provider="evict-a"} 0' in registry.render()
+    for _ in range(50):
+        gc.collect()
+        if pipelines[0]() is None:
+            break
+        await asyncio.sleep(0.01)
+    assert pipelines[0]() is None, gc.get_referrers(pipelines[0]())
+
+    await manager.close()
+    print("✓ Evicted model garbage collected")
+
+
+async def test_cold_start():
+    """Test lazy heavy imports and warmup before the provider reports ready"""
+    print("\nTesting cold start...")
+
+    import subprocess
+
+    probe = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, ole_asr.api; "
+            "print([m for m in ('torch', 'librosa', 'soundfile') "
+            "if m in sys.modules])",
+        ],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert probe.stdout.strip() == "[]", probe.stdout
+
+    calls = []
+
+    provider = _fake_provider(
+        lambda clip: "warm",
+        lambda clips: calls.append(len(clips)),
+        max_batch_size=4,
+        warmup_seconds=1.0,
+    )
+    await provider.initialize()
+    stats = provider.stats()
+    assert provider.is_initialized and calls == [1, 4], calls
+    assert set(stats["startup_seconds"]) == {"load", "warmup"}
+    # Warmup bypasses the scheduler so batching stats only see real traffic
+    assert stats["batching"]["batches_processed"] == 0
+
+    await provider.close()
+    print(f"✓ No heavy imports at startup, warmup batches {calls}")
+
+
+async def test_cpu_inference_provider():
+    """Test the int8 CPU backend quantizes the pipeline's model"""
+    print("\nTesting CPU inference provider...")
+
+    import numpy as np
+    import torch
+    from ole_asr.providers.cpu_inference import CPUInferenceProvider
+
+    devices = []
+
+    class TinyPipeline:
+        def __init__(self, task, model, model_revision, device, **options):
+            devices.append(device)
+            self.model = torch.nn.Sequential(torch.nn.Linear(64, 64))
+
+        def __call__(self, audio):
+            self.model(torch.zeros(1, 64))
+            return {"text": "quantized"}
+
+    class TinyCPUProvider(CPUInferenceProvider):
+        def _get_pipeline_class(self):
+            tasks = type("Tasks", (), {"auto_speech_recognition": "asr"})
+            return TinyPipeline, tasks
+
+    try:
+        CPUInferenceProvider(backend="fp16")
+        raise AssertionError("unknown backend accepted")
+    except ValueError:
+        pass
+
+    provider = TinyCPUProvider(backend="int8", intra_op_threads=2)
+    await provider.initialize()
+    linear = provider.pipeline.model[0]
+    assert devices == ["cpu"]
+    assert isinstance(linear, torch.ao.nn.quantized.dynamic.Linear), linear
+    # int8 weights: a quarter of the fp32 size, plus fp32 bias and scales
+    assert 64 * 64 <= provider.memory_bytes() < 64 * 64 * 2
+    assert torch.get_num_threads() == 2
+
+    pcm = np.zeros(16000, dtype=np.float32)
+    assert await provider.transcribe_pcm(pcm, 16000) == "quantized"
+    stats = provider.stats()
+    assert stats["backend"] == "int8" and stats["intra_op_threads"] == 2
+
+    await provider.close()
+    print(f"✓ int8 provider loaded on {devices[0]}, {provider.memory_bytes()} B")
+
+
+async def test_inference_lanes():
+    """Test that lanes bound concurrent inference and report utilization"""
+    print("\nTesting inference lanes...")
+
+    import os
+    import threading
+    import time
+    import numpy as np
+    from ole_asr.batching import BatchScheduler
+    from ole_asr.lanes import LaneExecutor, available_cpus
+
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def batch_fn(batch):
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+        return [threading.current_thread().name for _ in batch]
+
+    lanes = LaneExecutor(lanes=2, threads_per_lane=1, name="test")
+    scheduler = BatchScheduler(
+        batch_fn,
+        max_batch_size=1,
+        max_wait_ms=0,
+        executor=lanes,
+        name="test",
+        max_concurrent_batches=2,
+    )
+    clip = np.zeros(1600, dtype=np.float32)
+    names = await asyncio.gather(*(scheduler.submit(clip) for _ in range(6)))
+    stats = lanes.stats()
+    assert max(peak) == 2, peak
+    assert set(names) == {"test-lane-0", "test-lane-1"}, names
+    assert sum(lane["tasks"] for lane in stats["per_lane"]) == 6
+    assert all(lane["utilization"] > 0 for lane in stats["per_lane"])
+    await scheduler.close()
+    lanes.shutdown()
+
+    if hasattr(os, "sched_setaffinity"):
+        pinned = LaneExecutor(lanes=1, threads_per_lane=1, pin=True)
+        cpus = pinned.stats()["per_lane"][0]["cpus"]
+        affinity = pinned.submit(os.sched_getaffinity, 0).result()
+        assert cpus == available_cpus()[:1] and affinity == set(cpus)
+        pinned.shutdown()
+
+    print(f"✓ {max(peak)} lanes ran at once, utilization reported per lane")
+
+
+async def test_word_timestamps():
+    """Test word timings and token confidence from the inference call itself"""
+    print("\nTesting word timestamps...")
+
+    import math
+    import numpy as np
+    import torch
+    from ole_asr.providers.qwen3_asr import Qwen3ASRProvider
+    from ole_asr.utils import AudioBuffer
+
+    probabilities = torch.tensor([[0.9, 0.1], [0.8, 0.2], [0.5, 0.5]])
+
+    class Paraformer(torch.nn.Module):
+        def cal_decoder_with_predictor(self, encoder_out, lengths):
+            return torch.log(probabilities).unsqueeze(0), lengths
+
+    class TimedPipeline:
+        def __init__(self, task, model, model_revision, device, **options):
+            assert options == {"output_timestamp": True}, options
+            self.model = Paraformer()
+
+        def __call__(self, audio):
+            self.model.cal_decoder_with_predictor(audio, torch.tensor([3]))
+            return [{"text": "你好吗", "timestamp": [[0, 100], [100, 250], [250, 400]]}]
+
+    class TimedProvider(Qwen3ASRProvider):
+        def _get_pipeline_class(self):
+            tasks = type("Tasks", (), {"auto_speech_recognition": "asr"})
+            return TimedPipeline, tasks
+
+    provider = TimedProvider()
+    await provider.initialize()
+    audio = np.zeros(32000, dtype=np.float32)
+    prepared = AudioBuffer(audio, 16000)
+    prepared.chunks = [(0, 16000), (16000, 32000)]
+
+    plain = await provider.transcribe_prepared(ASRRequest(audio=""), prepared)
+    expected = math.exp((math.log(0.9) + math.log(0.8) + math.log(0.5)) / 3)
+    assert plain.segments[0].words is None
+    assert abs(plain.segments[0].confidence - expected) < 1e-6
+
+    request = ASRRequest(audio="", model_params={"word_timestamps": True})
+    response = await provider.transcribe_prepared(request, prepared)
+    words = response.segments[1].words
+    assert [w.word for w in words] == ["你", "好", "吗"]
+    assert (words[0].start_time, words[2].end_time) == (1.0, 1.4)
+    assert [round(w.confidence, 6) for w in words] == [0.9, 0.8, 0.5]
+
+    await provider.close()
+    print(f"✓ Words {[(w.word, w.start_time) for w in words]}")
+
+
+async def test_segment_streaming():
+    """Test that segments stream out as their chunks are decoded"""
+    print("\nTesting segment streaming...")
+
+    import threading
+    import numpy as np
+    from ole_asr.admission import AdmissionController
+    from ole_asr.api import _encode_segment_event
+    from ole_asr.models import StreamFormat
+    from ole_asr.utils import AudioBuffer
+
+    release_last = threading.Event()
+
+    def transcribe(clip):
+        # The last chunk is held until the first segment has been received
+        if clip[0] == 2:
+            release_last.wait(5)
+        return f"chunk {int(clip[0])}"
+
+    async def prepare(request):
+        audio = AudioBuffer(np.repeat(np.arange(3, dtype=np.float32), 16000), 16000)
+        audio.chunks = [(0, 16000), (16000, 32000), (32000, 48000)]
+        return audio
+
+    chunked = _fake_provider(transcribe, max_batch_size=1)
+    chunked.prepare = prepare
+
+    admission = AdmissionController(max_active_seconds=10.0)
+    service = ASRService(admission=admission)
+    service.register_provider("chunked", chunked)
+
+    segments = service.transcribe_stream(ASRRequest(audio=""), "chunked")
+    first = await segments.__anext__()
+    assert first.text == "chunk 0" and not release_last.is_set()
+    assert admission.active_seconds == 3.0
+    release_last.set()
+    rest = [segment async for segment in segments]
+    assert [s.text for s in rest] == ["chunk 1", "chunk 2"]
+    assert rest[1].start_time == 2.0
+    assert admission.active_seconds == 0.0
+
+    # Closing a stream early frees the admission slot
+    release_last.clear()
+    segments = service.transcribe_stream(ASRRequest(audio=""), "chunked")
+    await segments.__anext__()
+    release_last.set()
+    await segments.aclose()
+    assert admission.active_seconds == 0.0
+
+    event = _encode_segment_event("segment", first.model_dump_json(), "sse")
+    assert event.startswith("event: segment\ndata: {") and event.endswith("\n\n")
+    line = _encode_segment_event("segment", "{}", StreamFormat.NDJSON)
+    assert line == "{}\n"
+
+    await service.close()
+    print(f"✓ Streamed {[first.text] + [s.text for s in rest]}")
+
+
+async def test_routing():
+    """Test least-loaded routing and failover over HTTP backends"""
+    print("\nTesting provider routing...")
+
+    from benchmarks.common import FakeHTTPBackend, encode_audio, synthetic_audio
+    from ole_asr.admission import QueueFullError
+    from ole_asr.providers.http_backend import HTTPBackendProvider
+
+    one = FakeHTTPBackend("one", real_time_factor=0.1)
+    two = FakeHTTPBackend("two", real_time_factor=0.1)
+    service = ASRService()
+    service.register_provider("one", HTTPBackendProvider(one.url))
+    service.register_provider("two", HTTPBackendProvider(two.url))
+    service.register_route("pool", ["one", "two"], retry_seconds=60)
+    assert "pool" in service.list_providers()
+
+    def request(seconds):
+        audio = encode_audio(synthetic_audio(seconds), 16000, "wav")
+        return ASRRequest.from_bytes(audio)
+
+    # Short requests avoid the replica busy with a long one
+    long = asyncio.ensure_future(service.transcribe(request(4.0), "pool"))
+    await asyncio.sleep(0.05)
+    short = await asyncio.gather(
+        *(service.transcribe(request(1.0), "pool") for _ in range(3))
+    )
+    assert (await long).text == "one"
+    assert [r.text for r in short] == ["two"] * 3, [r.text for r in short]
+    assert abs(short[0].duration - 1.0) < 0.01
+
+    # A backend that goes away is failed over and then avoided
+    one.stop()
+    results = [await service.transcribe(request(0.5), "pool") for _ in range(3)]
+    assert [r.text for r in results] == ["two"] * 3
+    routes = service.stats()["routes"]["pool"]
+    assert not routes["one"]["available"] and routes["two"]["available"]
+    health = await service.health_check()
+    assert health == {"one": False, "two": True, "pool": True}, health
+
+    # When every replica is busy or down, the client is told to retry
+    two.status = 429
+    try:
+        await service.transcribe(request(0.5), "pool")
+        raise AssertionError("expected a rejection")
+    except QueueFullError as e:
+        assert e.retry_after == 1.0
+
+    await service.close()
+    two.stop()
+    print(f"✓ Routed {one.requests} requests to one, {two.requests} to two")
+
+
+async def test_health_checks():
+    """Test concurrent, time-bounded and cached health checks and the canary"""
+    print("\nTesting health checks...")
+
+    import time
+    from ole_asr.health import HealthMonitor
+    from ole_asr.model_manager import ModelManager
+    from ole_asr.providers.qwen3_asr import Qwen3ASRProvider
+
+    class Provider:
+        def __init__(self, delay=0.0, healthy=True):
+            self.delay, self.healthy, self.checks = delay, healthy, 0
+            self.canary_error = None
+
+        async def health_check(self):
+            self.checks += 1
+            await asyncio.sleep(self.delay)
+            return self.healthy
+
+        async def transcribe_pcm(self, audio, sample_rate):
+            if self.canary_error:
+                raise RuntimeError(self.canary_error)
+            return "ok"
+
+    ok, hung, down = Provider(), Provider(delay=10), Provider(healthy=False)
+    service = ASRService(health=HealthMonitor(timeout=0.2, ttl=60))
+    service.register_provider("ok", ok)
+    service.register_provider("hung", hung)
+    service.register_provider("down", down)
+
+    started = time.perf_counter()
+    probes = await asyncio.gather(*(service.health_check() for _ in range(5)))
+    elapsed = time.perf_counter() - started
+    assert all(p == {"ok": True, "hung": False, "down": False} for p in probes)
+    assert elapsed < 1.0, elapsed
+    assert (ok.checks, hung.checks) == (1, 1)
+
+    # Cached results are served without checking again
+    assert service.health_snapshot()["ok"] is True
+    await service.health_check()
+    assert ok.checks == 1
+
+    # A failing canary marks an otherwise healthy provider unhealthy
+    ok.canary_error = "model broken"
+    await service.run_health_canary()
+    assert (await service.health_check())["ok"] is False
+    ok.canary_error = None
+    await service.run_health_canary()
+    assert (await service.health_check())["ok"] is True
+
+    # The canary holds a managed model, so eviction can't unload it mid-run
+    release = asyncio.Event()
+
+    class SlowProvider(Provider):
+        async def transcribe_pcm(self, audio, sample_rate):
+            await release.wait()
+            return "ok"
+
+        def memory_bytes(self):
+            return 100
+
+    managed = ASRService(
+        models=ModelManager(memory_budget_bytes=150), health=HealthMonitor()
+    )
+    for name in ("m1", "m2"):
+        managed.register_model(name, SlowProvider)
+    m1 = await managed.models.load("m1")
+    canary = asyncio.create_task(managed.run_health_canary())
+    await asyncio.sleep(0.01)
+    await managed.models.load("m2")
+    assert managed.models.stats()["models"]["m1"]["state"] == "loaded"
+    release.set()
+    await canary
+    assert managed.health.stats()["canary"]["m1"]["ok"]
+
+    # Once released it is evicted, and a stale canary round doesn't reload it
+    await asyncio.sleep(0.01)
+    assert managed.models.stats()["models"]["m1"]["state"] == "unloaded"
+    await managed.health.run_canary({"m1": m1}, managed._hold_loaded)
+    stats = managed.models.stats()["models"]["m1"]
+    assert stats["state"] == "unloaded" and stats["loads"] == 1, stats
+    assert "m1" not in managed.health.stats()["canary"]
+    await managed.close()
+
+    # Probing an unloaded model doesn't load it
+    provider = Qwen3ASRProvider()
+    assert await provider.health_check() is False
+    assert not provider.is_initialized
+
+    await service.close()
+    print(f"✓ 5 concurrent probes answered in {elapsed * 1000:.0f} ms")
+
+
+async def test_path_ingestion():
+    """Test transcribing files and ranges of files under the input root"""
+    print("\nTesting path ingestion...")
+
+    import io
+    import os
+    import tempfile
+    import tracemalloc
+    import numpy as np
+    import soundfile as sf
+    from ole_asr.jobs import JobManager
+    from ole_asr.models import JobRequest, JobStatus
+    from ole_asr.utils import decode_audio_bytes, map_audio_file
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "root")
+        os.mkdir(root)
+        ramp = (np.arange(16000 * 60) % 1000 / 1000).astype(np.float32)
+        sf.write(os.path.join(root, "call.wav"), ramp, 16000, subtype="PCM_16")
+        buffer = io.BytesIO()
+        sf.write(buffer, ramp[:16000], 16000, format="FLAC")
+        packed = b"\0" * 5000 + buffer.getvalue() + b"\0" * 100
+        with open(os.path.join(root, "pack.bin"), "wb") as f:
+            f.write(packed)
+        with open(os.path.join(tmp, "secret.wav"), "wb") as f:
+            f.write(b"RIFF")
+        os.symlink(os.path.join(tmp, "secret.wav"), os.path.join(root, "link.wav"))
+
+        service = ASRService(input_root=root)
+        service.register_provider(
+            "length", _fake_provider(lambda clip: str(len(clip)), max_chunk_seconds=60)
+        )
+        params = {"vad": False}
+
+        request = ASRRequest(
+            path="call.wav", start_time=2.0, end_time=5.0, model_params=params
+        )
+        response = await service.transcribe(request, "length")
+        assert response.duration == 3.0 and response.text == "48000"
+
+        request = ASRRequest(
+            path="pack.bin", offset=5000, length=len(buffer.getvalue())
+        )
+        response = await service.transcribe(request, "length")
+        assert response.duration == 1.0, response.duration
+
+        for path in ("../secret.wav", os.path.join(tmp, "secret.wav"), "link.wav"):
+            try:
+                await service.transcribe(ASRRequest(path=path), "length")
+                raise AssertionError(f"{path} was read")
+            except ValueError as e:
+                assert "outside the input root" in str(e), e
+        try:
+            await ASRService().transcribe(ASRRequest(path="call.wav"))
+            raise AssertionError("path accepted without an input root")
+        except ValueError:
+            pass
+
+        # Bulk jobs read inline path requests in place too, keeping the range
+        jobs = JobManager(service, os.path.join(tmp, "jobs.sqlite3"), input_root=root)
+        await jobs.start()
+        info = await jobs.submit(JobRequest(provider="length", requests=[request]))
+        results = [item async for item in jobs.stream(info.id)]
+        assert results[0].status == JobStatus.COMPLETED, results
+        assert results[0].result.duration == 1.0, results[0].result
+        try:
+            await jobs.submit(JobRequest(requests=[ASRRequest(path="../secret.wav")]))
+            raise AssertionError("job path outside the input root accepted")
+        except ValueError as e:
+            assert "outside the input root" in str(e), e
+        await jobs.stop()
+
+        # One second of a one-minute file allocates about one second of audio
+        view = map_audio_file(os.path.join(root, "call.wav"))
+        tracemalloc.start()
+        audio, _ = decode_audio_bytes(view, start_time=30.0, end_time=31.0)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert len(audio) == 16000 and abs(audio[0] - 0.0) < 1e-3
+        assert peak < 2 * audio.nbytes, peak
+        del audio, view
+
+        await service.close()
+    print(f"✓ Ranges decoded in place; 1s of a 60s file peaked at {peak} bytes")
+
+
+def test_audio_buffer_copies():
+    """Test that preprocessing allocates at most one array at the model's rate"""
+    print("\nTesting audio buffer copies...")
+
+    import io
+    import tracemalloc
+    import numpy as np
+    import soundfile as sf
+    from ole_asr.providers.qwen3_asr import Qwen3ASRProvider
+    from ole_asr.utils import synthetic_speech
+
+    provider = Qwen3ASRProvider()
+    speech = synthetic_speech(10.0, 48000)
+    cases = [
+        # (sample rate, channels, subtype, full-length arrays allocated)
+        (16000, 1, "FLOAT", 0),
+        (16000, 1, "PCM_16", 1),
+        (48000, 2, "PCM_16", 1),
+    ]
+    peaks = []
+    for sample_rate, channels, subtype, copies in cases:
+        samples = speech[: 10 * sample_rate]
+        samples = np.stack([samples] * channels, axis=1) if channels > 1 else samples
+        encoded = io.BytesIO()
+        sf.write(encoded, samples, sample_rate, format="WAV", subtype=subtype)
+        request = ASRRequest()
+        request._audio_buffer = encoded.getvalue()
+
+        # The first request sizes the worker's scratch buffer and resampler
+        provider._preprocess(request)
+        tracemalloc.start()
+        audio = provider._preprocess(request)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        assert audio.samples.dtype == np.float32
+        assert audio.samples.flags.c_contiguous
+        assert (audio.sample_rate, audio.duration) == (16000, 10.0)
+        assert (audio.original_sample_rate, audio.source) == (sample_rate, "wav")
+        assert audio.copies == copies, (subtype, audio.copies)
+        # Everything but the counted arrays is small (VAD frames, chunk list)
+        assert peak < (copies + 0.25) * audio.samples.nbytes, (subtype, peak)
+        peaks.append(peak / audio.samples.nbytes)
+
+    del audio
+    provider.preprocess_executor.shutdown()
+    provider.inference_executor.shutdown()
+    print(
+        "✓ Preprocessing peaks at "
+        + ", ".join(f"{peak:.2f}x" for peak in peaks)
+        + " of the output"
+    )
+
+
+async def test_split_channels():
+    """Test transcribing the channels of a stereo recording separately"""
+    print("\nTesting split channels...")
+
+    import io
+    import numpy as np
+    import soundfile as sf
+    from ole_asr.utils import decode_audio_bytes, synthetic_speech
+
+    batches = []
+
+    def speaker(clip):
+        # Each channel speaks in a different pitch; report which one we got
+        if np.abs(np.diff(np.sign(clip))).sum() < 0.3 * len(clip):
+            return "agent"
+        return "customer"
+
+    # Agent on the left at 0-2s, customer on the right at 3-5s
+    t = np.arange(6 * 48000) / 48000
+    speech = synthetic_speech(6.0, 48000)
+    left = np.where(t < 2, speech, 0)
+    right = np.where((t >= 3) & (t < 5), 0.3 * np.sin(2 * np.pi * 3000 * t), 0)
+    encoded = io.BytesIO()
+    sf.write(
+        encoded,
+        np.stack([left, right], axis=1),
+        48000,
+        format="WAV",
+        subtype="PCM_16",
+    )
+    raw = encoded.getvalue()
+
+    rows, _ = decode_audio_bytes(raw, mono=False)
+    assert rows.shape == (2, 6 * 48000) and rows[1].flags.c_contiguous
+    encoded = io.BytesIO()
+    sf.write(encoded, rows.T, 48000, format="FLAC")
+    assert decode_audio_bytes(encoded.getvalue(), mono=False)[0].shape == rows.shape
+
+    service = ASRService()
+    service.register_provider(
+        "channels",
+        _fake_provider(
+            speaker,
+            lambda clips: batches.append(len(clips)),
+            max_batch_size=4,
+            max_batch_wait_ms=50,
+        ),
+    )
+    request = ASRRequest.from_bytes(raw, model_params={"split_channels": True})
+    response = await service.transcribe(request, "channels")
+    segments = [(s.channel, s.text, round(s.start_time)) for s in response.segments]
+    assert segments == [(0, "agent", 0), (1, "customer", 3)], segments
+    assert response.duration == 6.0
+    assert batches == [2], batches
+
+    mixed = await service.transcribe(ASRRequest.from_bytes(raw), "channels")
+    assert all(segment.channel is None for segment in mixed.segments)
+
+    await service.close()
+    print(f"✓ Channels transcribed in one batch: {segments}")
+
+
+async def run_test(test) -> bool:
+    """Run one test, which either returns a bool or raises on failure"""
+    try:
+        result = test()
+        if asyncio.iscoroutine(result):
+            result = await result
+    except Exception as e:
+        print(f"✗ {test.__name__} failed: {e!r}")
+        return False
+    return result is not False
+
+
+def test_raw_upload_limits():
+    """Test raw and multipart uploads, the size cap and Content-Length checks"""
+    print("\nTesting raw upload limits...")
+
+    import os
+    import tempfile
+    from fastapi import HTTPException
+    from fastapi.testclient import TestClient
+    from starlette.requests import Request
+    from ole_asr import api
+    from ole_asr.jobs import JobManager, JobStore
+    from ole_asr.models import ASRResponse
+    from config import config
+
+    class LengthProvider:
+        async def transcribe(self, request):
+            size = len(request.audio_buffer)
+            return ASRResponse(text=str(size), segments=[], duration=0.0, model="x")
+
+        async def health_check(self):
+            return True
+
+    api.asr_service.register_provider("upload-length", LengthProvider())
+    limit = config.MAX_UPLOAD_BYTES
+    job_manager = api.job_manager
+    config.MAX_UPLOAD_BYTES = 1000
+    try:
+        client = TestClient(api.app)
+        url = "/transcribe/raw?provider=upload-length"
+        raw = client.post(url, content=b"x" * 1000)
+        assert raw.status_code == 200 and raw.json()["text"] == "1000", raw.text
+        form = client.post(url, files={"file": ("a.wav", b"x" * 700)})
+        assert form.status_code == 200 and form.json()["text"] == "700", form.text
+
+        assert client.post(url, content=b"x" * 1001).status_code == 413
+        chunked = client.post(url, content=iter([b"x" * 600, b"x" * 600]))
+        assert chunked.status_code == 413, chunked.status_code
+        assert client.post(url, content=iter([b"x" * 600])).json()["text"] == "600"
+
+        def request_with(content_length):
+            scope = {
+                "type": "http",
+                "method": "POST",
+                "headers": [(b"content-length", content_length)],
+            }
+            return Request(scope)
+
+        # Rejected from the header alone, before anything is allocated
+        for header, status in ((b"-5", 400), (b"12abc", 400), (b"10" * 20, 413)):
+            try:
+                api._declared_length(request_with(header))
+                raise AssertionError(f"Content-Length {header!r} accepted")
+            except HTTPException as e:
+                assert e.status_code == status, (header, e.status_code)
+
+        # Bulk job uploads are capped by the total of their files
+        with tempfile.TemporaryDirectory() as tmp:
+            config.MAX_UPLOAD_BYTES = 2000
+            # Opened without a worker, so items are only queued
+            manager = JobManager(api.asr_service, os.path.join(tmp, "jobs.sqlite3"))
+            manager.store = JobStore(manager.db_path)
+            manager._wakeup = asyncio.Event()
+            api.job_manager = manager
+            try:
+                files = [("files", (f"{i}.wav", b"x" * 600)) for i in range(2)]
+                accepted = client.post("/jobs/upload", files=files)
+                assert accepted.status_code == 202, accepted.text
+                assert accepted.json()["total"] == 2, accepted.json()
+
+                files = [("files", (f"{i}.wav", b"x" * 800)) for i in range(3)]
+                assert client.post("/jobs/upload", files=files).status_code == 413
+                body = b"".join(
+                    b"--b\r\nContent-Disposition: form-data; "
+                    + f'name="files"; filename="{i}.wav"\r\n\r\n'.encode()
+                    + b"x" * 800
+                    + b"\r\n"
+                    for i in range(3)
+                )
+                chunked = client.post(
+                    "/jobs/upload",
+                    content=iter([body + b"--b--\r\n"]),
+                    headers={"content-type": "multipart/form-data; boundary=b"},
+                )
+                assert chunked.status_code == 413, chunked.text
+            finally:
+                manager.store.close()
+                manager._db_executor.shutdown()
+    finally:
+        config.MAX_UPLOAD_BYTES = limit
+        api.asr_service.providers.pop("upload-length", None)
+        api.job_manager = job_manager
+
+    print("✓ Uploads and bulk job uploads capped by size")
+
+
+def test_long_audio_chunked():
+    """Test audio longer than MAX_AUDIO_DURATION is chunked, not rejected"""
+    print("\nTesting long audio through the API...")
+
+    import io
+    import soundfile as sf
+    from fastapi.testclient import TestClient
+    from ole_asr import api
+    from ole_asr.settings import provider_settings
+    from ole_asr.utils import synthetic_speech
+    from config import config
+
+    clips = []
+
+    seconds = config.MAX_AUDIO_DURATION + 10
+    wav = io.BytesIO()
+    sf.write(wav, synthetic_speech(seconds, 16000), 16000, format="WAV")
+
+    api.asr_service.register_provider(
+        "long-audio",
+        _fake_provider(
+            lambda clip: "你好",
+            lambda batch: clips.extend(len(clip) for clip in batch),
+            **dict(provider_settings(), warmup_seconds=0),
+        ),
+    )
+    try:
+        client = TestClient(api.app)
+        response = client.post(
+            "/transcribe/raw?provider=long-audio", content=wav.getvalue()
+        )
+        assert response.status_code == 200, response.text
+        assert abs(response.json()["duration"] - seconds) < 0.1, response.json()
+        # Chunks of an unspaced script are joined without separators
+        assert response.json()["text"] == "你好" * len(clips), response.json()
+        assert len(clips) > 1 and sum(clips) > seconds * 16000 * 0.9, clips
+        assert max(clips) <= config.MAX_AUDIO_DURATION * 16000, clips
+    finally:
+        api.asr_service.providers.pop("long-audio", None)
+
+    print(f"✓ {seconds:.0f}s upload transcribed as {len(clips)} chunks")
+
+
+async def test_shared_model_startup():
+    """Test run_server's shared-model setup keeps the model out of the API process"""
+    print("\nTesting shared-model startup...")
+
+    import os
+    import subprocess
+
+    # config reads INFERENCE_SOCKETS once, so this runs in a fresh interpreter
+    script = """
+import asyncio
+import numpy as np
+import run_server
+
+paths = run_server.inference_socket_paths(1)
+
+from benchmarks.common import FakeQwen3ASRProvider
+from ole_asr.inference_server import InferenceServer
+from ole_asr.providers.qwen3_asr import Qwen3ASRProvider
+
+
+def local_model(self):
+    raise AssertionError("API process loaded a local model")
+
+
+Qwen3ASRProvider._get_pipeline_class = local_model
+
+
+async def main():
+    server = InferenceServer(FakeQwen3ASRProvider(), paths[0])
+    await server.start()
+
+    import ole_asr.api as api
+    from config import config
+    from ole_asr.providers.shared_model import SharedModelProvider
+
+    await api.startup_event()
+    provider = api.asr_service.providers["qwen3-asr"]
+    assert config.INFERENCE_SOCKETS == paths, config.INFERENCE_SOCKETS
+    assert isinstance(provider, SharedModelProvider), provider
+    pcm = np.zeros(16000, dtype=np.float32)
+    print(await provider.transcribe_pcm(pcm, 16000))
+    await api.shutdown_event()
+    await server.provider.close()
+
+
+asyncio.run(main())
+"""
+    env = dict(os.environ, JOBS_ENABLED="false")
+    env.pop("INFERENCE_SOCKETS", None)
+    probe = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parent,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert probe.returncode == 0, probe.stderr
+    assert probe.stdout.strip().splitlines()[-1] == "16000 samples", probe.stdout
+
+    print("✓ API process forwarded PCM to the inference server")
+
+
 async def main():
     """Run all tests"""
     print("Running ASR Service Validation Tests...\n")
 
-    results = []
-
-    # Run tests
-    results.append(test_service_initialization())
-    results.append(test_models())
-    results.append(await test_service_async())
+    tests = [
+        test_service_initialization,
+        test_models,
+        test_service_async,
+        test_batch_scheduler,
+        test_batch_fallback,
+        test_inference_workers,
+        test_streaming_session,
+        test_speech_chunking,
+        test_result_cache,
+        test_metrics_registry,
+        test_wav_fast_path,
+        test_resampling,
+        test_admission_control,
+        test_cache_coalesced_errors,
+        test_job_queue,
+        test_offline_batch,
+        test_model_manager,
+        test_evicted_model_freed,
+        test_cold_start,
+        test_cpu_inference_provider,
+        test_inference_lanes,
+        test_word_timestamps,
+        test_segment_streaming,
+        test_routing,
+        test_health_checks,
+        test_path_ingestion,
+        test_audio_buffer_copies,
+        test_split_channels,
+        test_raw_upload_limits,
+        test_long_audio_chunked,
+        test_shared_model_startup,
+    ]
+    results = [await run_test(test) for test in tests]
 
     # Summary
     passed = sum(results)
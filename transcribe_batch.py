@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Transcribe a directory or manifest of audio files without the HTTP server"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Load the provider and transcribe every input into the output JSONL"""
+    from config import config
+    from ole_asr.settings import provider_settings
+    from ole_asr.offline import BatchRun, iter_inputs
+    from ole_asr.providers.qwen3_asr import Qwen3ASRProvider
+    from ole_asr.services import ASRService
+
+    settings = provider_settings()
+    provider = Qwen3ASRProvider(**settings)
+    await provider.initialize()
+    service = ASRService()
+    service.register_provider(provider.name, provider)
+
+    batch = BatchRun(
+        service,
+        args.output,
+        sample_rate=settings["sample_rate"],
+        language=args.language,
+        max_chunk_seconds=settings["max_chunk_seconds"],
+        use_vad=not args.no_vad,
+        decode_workers=args.decode_workers,
+        prefetch=args.prefetch,
+        concurrency=args.concurrency or config.BATCH_MAX_SIZE,
+    )
+    try:
+        return await batch.run(iter_inputs(args.source))
+    finally:
+        await service.close()
+        print_summary(batch.summary())
+
+
+def print_summary(summary: dict):
+    """Print the run's counts and throughput"""
+    print(json.dumps(summary, indent=2))
+    print(
+        f"Transcribed {summary['audio_hours']:.2f} audio-hours at "
+        f"{summary['audio_hours_per_hour']:.1f} audio-hours per wall-clock hour"
+    )
+
+
+def main():
+    """Run the offline batch transcription CLI"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "source", help="Directory to search for audio files, or a manifest file"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        required=True,
+        help="JSONL file to append results to; rerunning resumes from it",
+    )
+    parser.add_argument("--language", default="auto", help="Language code")
+    parser.add_argument(
+        "--decode-workers",
+        type=int,
+        default=os.cpu_count() or 4,
+        help="Processes decoding and resampling audio",
+    )
+    parser.add_argument(
+        "--prefetch", type=int, default=32, help="Files decoded ahead of inference"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Files transcribed at once (default: BATCH_MAX_SIZE)",
+    )
+    parser.add_argument(
+        "--no-vad", action="store_true", help="Cut fixed-length chunks instead of VAD"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("Interrupted; rerun with the same --output to resume")
+
+
+if __name__ == "__main__":
+    main()